@@ -17,6 +17,13 @@ class FinanceSettings(NamedTuple):
     chat_temperature: float = 0.7
     tool_temperature: float = 1.0  # o4-mini only supports temperature=1
     mcp_server_path: str = ""
+    mcp_pool_size: int = 2
+    mcp_health_check_interval: float = 30.0
+    tool_execution_mode: str = "mcp"  # "mcp" (stdio server) or "in_process"
+    tool_concurrency: int = 4  # Tool calls from one turn run at once
+    tool_timeout: float = 120.0  # Seconds before a single tool call is abandoned
+    tool_manifest_cache: bool = True  # Reuse tool schemas from disk while the server code is unchanged
+    tool_manifest_dir: str = ""
 
 def get_settings() -> FinanceSettings:
     """Get configuration settings from environment variables"""
@@ -42,5 +49,12 @@ def get_settings() -> FinanceSettings:
         openai_api_key=api_key,
         og_fin_endpoint=og_fin_endpoint,
         og_fin_token=og_fin_token,
-        mcp_server_path=mcp_server_path
+        mcp_server_path=mcp_server_path,
+        mcp_pool_size=int(os.getenv("MCP_POOL_SIZE", "2")),
+        mcp_health_check_interval=float(os.getenv("MCP_HEALTH_CHECK_INTERVAL", "30")),
+        tool_execution_mode=os.getenv("TOOL_EXECUTION_MODE", "mcp").lower(),
+        tool_concurrency=int(os.getenv("FINANCE_TOOL_CONCURRENCY", "4")),
+        tool_timeout=float(os.getenv("FINANCE_TOOL_TIMEOUT", "120")),
+        tool_manifest_cache=os.getenv("MCP_TOOL_MANIFEST_CACHE", "true").lower() == "true",
+        tool_manifest_dir=os.getenv("MCP_TOOL_MANIFEST_DIR", "")
     ) 
\ No newline at end of file
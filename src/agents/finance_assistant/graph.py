@@ -6,7 +6,7 @@ from langgraph.prebuilt import tools_condition
 
 # Use absolute imports for LangGraph compatibility
 from src.agents.finance_assistant.types import FinanceState
-from src.agents.finance_assistant.nodes import chatbot_node, tool_node
+from src.agents.finance_assistant.nodes import chatbot_node, index_tools, tool_node
 from src.agents.finance_assistant.tools import get_finance_tools
 
 async def create_finance_agent():
@@ -22,12 +22,15 @@ async def create_finance_agent():
     
     print(f"🛠️ DEBUG: Creating dual-model finance graph...")
     
+    # Tool lookup by name, built once for every tools turn
+    tools_by_name = index_tools(finance_tools)
+    
     # Create wrapper functions that pass tools to nodes
     async def chatbot_wrapper(state: FinanceState):
         return await chatbot_node(state, finance_tools)
     
     async def tool_wrapper(state: FinanceState):
-        return await tool_node(state, finance_tools)
+        return await tool_node(state, tools_by_name)
     
     # Create the StateGraph
     workflow = StateGraph(FinanceState)
@@ -1,6 +1,6 @@
 """Nodes module for finance assistant graph"""
 
 from .chatbot import chatbot_node
-from .tools import tool_node
+from .tools import index_tools, tool_node
 
-__all__ = ["chatbot_node", "tool_node"] 
\ No newline at end of file
+__all__ = ["chatbot_node", "index_tools", "tool_node"] 
\ No newline at end of file
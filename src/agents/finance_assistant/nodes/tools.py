@@ -1,5 +1,9 @@
 """Tools node for the finance assistant"""
 
+import asyncio
+import json
+from typing import Any, Dict, Union
+
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import SystemMessage, AIMessage, ToolMessage
 
@@ -14,65 +18,86 @@ tool_model = ChatOpenAI(
     temperature=settings.tool_temperature
 )
 
-async def tool_node(state: FinanceState, tools):
-    """Tool Node: Uses o4-mini for GraphQL queries and data retrieval"""
+def index_tools(tools) -> Dict[str, Any]:
+    """Map tool names to tools so each call is a dict lookup"""
+    return {tool.name: tool for tool in tools if hasattr(tool, 'name')}
+
+def serialize_result(result: Any) -> str:
+    """Compact JSON text for a tool result (JSON strings are re-encoded without whitespace)"""
+    if isinstance(result, list) and result and all(
+        isinstance(block, str) or (isinstance(block, dict) and block.get("type") == "text") for block in result
+    ):
+        # MCP tools return text content blocks; their joined text is the payload
+        result = "".join(block if isinstance(block, str) else block.get("text", "") for block in result)
+    if isinstance(result, str):
+        stripped = result.strip()
+        if stripped[:1] not in ("{", "["):
+            return result
+        try:
+            result = json.loads(stripped)
+        except ValueError:
+            return result
+    return json.dumps(result, separators=(",", ":"), ensure_ascii=False, default=str)
+
+async def _execute_tool_call(tool_call: Dict[str, Any], tools_by_name: Dict[str, Any],
+                             semaphore: asyncio.Semaphore, timeout: float) -> ToolMessage:
+    """Run one tool call under the shared concurrency limit and timeout"""
+    tool_name = tool_call["name"]
+    tool_args = tool_call["args"]
+    tool_call_id = tool_call["id"]
+
+    matching_tool = tools_by_name.get(tool_name)
+    if matching_tool is None:
+        print(f"🔧 DEBUG: Tool {tool_name} not found")
+        return ToolMessage(content=f"Tool {tool_name} not found", tool_call_id=tool_call_id)
+
+    async with semaphore:
+        print(f"🔧 DEBUG: Executing tool: {tool_name} with args: {tool_args}")
+        try:
+            result = await asyncio.wait_for(matching_tool.ainvoke(tool_args), timeout=timeout)
+        except asyncio.TimeoutError:
+            print(f"🔧 DEBUG: Tool {tool_name} timed out after {timeout}s")
+            return ToolMessage(
+                content=f"Error executing {tool_name}: timed out after {timeout:g} seconds",
+                tool_call_id=tool_call_id
+            )
+        except Exception as e:
+            print(f"🔧 DEBUG: Tool {tool_name} execution failed: {str(e)}")
+            return ToolMessage(content=f"Error executing {tool_name}: {str(e)}", tool_call_id=tool_call_id)
+
+    print(f"🔧 DEBUG: Tool {tool_name} executed successfully")
+    return ToolMessage(content=serialize_result(result), tool_call_id=tool_call_id)
+
+async def tool_node(state: FinanceState, tools: Union[Dict[str, Any], list]):
+    """Tool Node: Uses o4-mini for GraphQL queries and data retrieval.
+
+    Tool calls from the same turn run concurrently (at most
+    ``settings.tool_concurrency`` at once, each bounded by
+    ``settings.tool_timeout``); results keep the order of the calls.
+    ``tools`` may be a list or a prebuilt ``index_tools`` mapping.
+    """
     print(f"🔧 DEBUG: tool_node called with {len(state['messages'])} messages")
-    
+
     messages = state["messages"]
     last_message = messages[-1]
-    
+
     try:
         # Execute the tool calls if they exist
         if hasattr(last_message, 'tool_calls') and last_message.tool_calls:
-            tool_messages = []
-            
-            for tool_call in last_message.tool_calls:
-                tool_name = tool_call["name"]
-                tool_args = tool_call["args"]
-                tool_call_id = tool_call["id"]
-                
-                print(f"🔧 DEBUG: Executing tool: {tool_name} with args: {tool_args}")
-                
-                # Find the matching tool
-                matching_tool = None
-                for tool in tools:
-                    if hasattr(tool, 'name') and tool.name == tool_name:
-                        matching_tool = tool
-                        break
-                
-                if matching_tool:
-                    try:
-                        result = await matching_tool.ainvoke(tool_args)
-                        print(f"🔧 DEBUG: Tool {tool_name} executed successfully")
-                        tool_messages.append(
-                            ToolMessage(
-                                content=str(result),
-                                tool_call_id=tool_call_id
-                            )
-                        )
-                    except Exception as e:
-                        print(f"🔧 DEBUG: Tool {tool_name} execution failed: {str(e)}")
-                        tool_messages.append(
-                            ToolMessage(
-                                content=f"Error executing {tool_name}: {str(e)}",
-                                tool_call_id=tool_call_id
-                            )
-                        )
-                else:
-                    print(f"🔧 DEBUG: Tool {tool_name} not found")
-                    tool_messages.append(
-                        ToolMessage(
-                            content=f"Tool {tool_name} not found",
-                            tool_call_id=tool_call_id
-                        )
-                    )
-            
-            return {"messages": tool_messages}
+            tools_by_name = tools if isinstance(tools, dict) else index_tools(tools)
+            semaphore = asyncio.Semaphore(max(1, settings.tool_concurrency))
+
+            tool_messages = await asyncio.gather(*[
+                _execute_tool_call(tool_call, tools_by_name, semaphore, settings.tool_timeout)
+                for tool_call in last_message.tool_calls
+            ])
+
+            return {"messages": list(tool_messages)}
         else:
             print(f"🔧 DEBUG: No tool calls found in the last message")
             return {"messages": [AIMessage(content="No tool calls found in the last message.")]}
-            
+
     except Exception as e:
         print(f"🔧 DEBUG: Error in tool execution: {str(e)}")
         error_message = AIMessage(content=f"Error in tool execution: {str(e)}")
-        return {"messages": [error_message]} 
\ No newline at end of file
+        return {"messages": [error_message]}
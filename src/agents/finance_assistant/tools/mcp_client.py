@@ -1,28 +1,131 @@
 """MCP client for loading OpenGov FIN tools"""
 
+import os
+import time
 from langchain_mcp_adapters.client import MultiServerMCPClient
 
 # Use absolute imports for LangGraph compatibility
 from src.agents.finance_assistant.config import get_settings
+from src.common.mcp_pool import MCPSessionPool
+from src.common.inprocess_tools import load_inprocess_tools, load_server_module
+from src.common.tool_manifest import ToolManifestCache
 
-async def get_finance_tools():
-    """Get tools from the OpenGov FIN GraphQL MCP server"""
-    try:
+# Global cache for MCP client, session pool and tools
+_mcp_client = None
+_mcp_pool = None
+_cached_tools = None
+_client_creation_time = None
+
+def _fin_schema_hash(server_path):
+    """Hash of the schema in the FIN server's disk cache, or None when it has none"""
+    if os.getenv("OG_FIN_SCHEMA_CACHE", "true").lower() != "true":
+        return None
+    # Reuse the server's own cache module so the file location always matches
+    schema_cache = load_server_module(os.path.join(os.path.dirname(os.path.abspath(server_path)), "schema_cache.py"))
+    entry = schema_cache.SchemaDiskCache(
+        os.getenv("OG_FIN_GRAPHQL_ENDPOINT", "https://opengovdemo.fms.opengov.com/oci/graphql"),
+        cache_dir=os.getenv("OG_FIN_SCHEMA_CACHE_DIR") or None
+    ).load()
+    return entry.get("schema_hash") if entry else None
+
+def _manifest_cache(settings):
+    """Disk cache of the FIN server's tool schemas, or None when disabled"""
+    if not settings.tool_manifest_cache:
+        return None
+    # Query templates are registered as tools, so their configuration is part of the key
+    templates_enabled = os.getenv("OG_FIN_QUERY_TEMPLATES", "true")
+    templates_file = os.getenv("OG_FIN_QUERY_TEMPLATES_FILE", "")
+    templates_source = ""
+    if templates_file and os.path.exists(templates_file):
+        with open(templates_file, "r", encoding="utf-8") as f:
+            templates_source = f.read()
+    extra = [templates_enabled, templates_source]
+
+    # Only templates matching the endpoint's schema become tools, so the schema is part of it too
+    if templates_enabled.lower() == "true" and os.getenv("OG_FIN_SCHEMA_MODE", "full").lower() != "lazy":
+        digest = _fin_schema_hash(settings.mcp_server_path)
+        if digest is None:
+            # The registered templates cannot be told from here: list tools from the server
+            return None
+        extra.append(digest)
+
+    return ToolManifestCache(
+        settings.mcp_server_path,
+        cache_dir=settings.tool_manifest_dir or None,
+        extra=extra
+    )
+
+async def get_mcp_client():
+    """Get or create the MCP client (singleton pattern)"""
+    global _mcp_client, _client_creation_time
+
+    if _mcp_client is None:
+        _client_creation_time = time.time()
         settings = get_settings()
-        
+
         # Configure MCP client with OpenGov FIN server
-        client = MultiServerMCPClient({
+        _mcp_client = MultiServerMCPClient({
             "opengov_fin": {
                 "command": "python",
                 "args": [settings.mcp_server_path],
                 "transport": "stdio",
             }
         })
-        
-        # Get tools from the MCP server
-        tools = await client.get_tools()
-        print(f"✅ Loaded {len(tools)} tools from OpenGov FIN GraphQL MCP server")
-        return tools
+        print(f"🔧 DEBUG: Created FIN MCP client with ID {id(_mcp_client)}")
+
+    return _mcp_client
+
+async def get_mcp_pool():
+    """Get or create the pool of long-lived FIN MCP sessions (singleton pattern)"""
+    global _mcp_pool
+
+    if _mcp_pool is None:
+        settings = get_settings()
+        client = await get_mcp_client()
+        # Execute tools over long-lived sessions instead of a server spawn per call
+        _mcp_pool = MCPSessionPool(
+            client,
+            "opengov_fin",
+            size=settings.mcp_pool_size,
+            health_check_interval=settings.mcp_health_check_interval
+        )
+
+    return _mcp_pool
+
+async def get_finance_tools():
+    """Get tools from the OpenGov FIN GraphQL MCP server (cached)"""
+    global _cached_tools
+
+    # Return cached tools if available
+    if _cached_tools is not None:
+        print(f"🔧 DEBUG: Using cached FIN tools ({len(_cached_tools)} tools)")
+        return _cached_tools
+
+    try:
+        settings = get_settings()
+
+        if settings.tool_execution_mode == "in_process":
+            # Call the server's tool functions directly, skipping JSON-RPC over stdio
+            _cached_tools = await load_inprocess_tools(settings.mcp_server_path)
+            print(f"✅ Loaded {len(_cached_tools)} in-process tools from OpenGov FIN GraphQL MCP server")
+            return _cached_tools
+
+        pool = await get_mcp_pool()
+
+        # Tool schemas come from the manifest cache when the server code is unchanged
+        _cached_tools = await pool.get_tools(manifest=_manifest_cache(settings))
+        print(f"✅ Loaded {len(_cached_tools)} tools from OpenGov FIN GraphQL MCP server")
+        return _cached_tools
     except Exception as e:
         print(f"❌ Failed to load MCP tools: {e}")
-        return [] 
\ No newline at end of file
+        return []
+
+def clear_mcp_cache():
+    """Clear the MCP client and tools cache (useful for testing/debugging)"""
+    global _mcp_client, _mcp_pool, _cached_tools
+    if _mcp_pool is not None:
+        _mcp_pool.shutdown()
+    _mcp_client = None
+    _mcp_pool = None
+    _cached_tools = None
+    print("🔧 DEBUG: FIN MCP cache cleared")
@@ -2,20 +2,26 @@ import os
 from dotenv import load_dotenv
 from langgraph.prebuilt import create_react_agent
 from langchain.chat_models import init_chat_model
-from langchain_core.tools import Tool
-import requests
+from langchain_core.tools import StructuredTool
 import json
 from typing import Optional
 
 # Load environment variables
 load_dotenv()
 
-# Default CKAN base URL
-DEFAULT_CKAN_BASE_URL = os.environ.get('CKAN_BASE_URL', 'https://ckantesting.ogopendata.com')
+# Shared async CKAN client, loaded with the open data MCP server whose sibling module it is
+# (after load_dotenv so CKAN_BASE_URL from .env applies)
+from src.common.inprocess_tools import load_server_module
+
+_open_data_server = load_server_module(
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "mcp-servers", "opengov_open_data_mcp_server.py")
+)
+DEFAULT_CKAN_BASE_URL = _open_data_server.DEFAULT_CKAN_BASE_URL
+get_ckan_client = _open_data_server.get_ckan_client
 
 
 
-def search_ckan_datasets(
+async def search_ckan_datasets(
     query: str,
     base_url: Optional[str] = None,
     rows: int = 5,
@@ -33,52 +39,10 @@ def search_ckan_datasets(
     Returns:
         JSON string containing search results with dataset summaries
     """
-    effective_base_url = base_url or DEFAULT_CKAN_BASE_URL
-    
-    # Validate parameters
-    rows = min(max(1, rows), 100)  # Ensure rows is between 1 and 100
-    start = max(0, start)  # Ensure start is non-negative
-    
-    # Build URL
-    url = f"{effective_base_url}/api/3/action/package_search"
-    params = {
-        'q': query,
-        'rows': rows,
-        'start': start
-    }
-    
     try:
-        response = requests.get(url, params=params, timeout=30)
-        
-        if not response.ok:
-            return json.dumps({
-                'error': f"CKAN API error: {response.status_code} {response.reason}",
-                'count': 0,
-                'results': []
-            })
-        
-        data = response.json()
-        
-        if data.get('success') and data.get('result'):
-            # Create concise results
-            concise_results = []
-            for dataset in data['result']['results']:
-                result = {
-                    'id': dataset.get('id'),
-                    'title': dataset.get('title'),
-                    'notes': dataset.get('notes', 'No description available.')[:150] + ('...' if len(dataset.get('notes', '')) > 150 else ''),
-                    'organization_title': dataset.get('organization', {}).get('title') if dataset.get('organization') else None,
-                }
-                concise_results.append(result)
-            
-            result = {
-                'count': data['result']['count'],
-                'results': concise_results
-            }
-            return json.dumps(result, indent=2)
-        else:
-            return json.dumps({'count': 0, 'results': []})
-            
+        # Shared pooled client: repeated and concurrent searches reuse one request
+        result = await get_ckan_client(base_url).search_datasets(query, rows, start)
+        return json.dumps(result, indent=2)
     except Exception as e:
         return json.dumps({
             'error': f"Failed to search CKAN datasets: {str(e)}",
@@ -86,7 +50,7 @@ def search_ckan_datasets(
             'results': []
         })
 
-def get_ckan_dataset_details(
+async def get_ckan_dataset_details(
     dataset_id: str,
     base_url: Optional[str] = None
 ) -> str:
@@ -100,55 +64,9 @@ def get_ckan_dataset_details(
     Returns:
         JSON string containing detailed dataset information
     """
-    resolved_base_url = base_url or DEFAULT_CKAN_BASE_URL
-    url = f"{resolved_base_url}/api/3/action/package_show"
-    params = {'id': dataset_id}
-    
     try:
-        response = requests.get(url, params=params, timeout=30)
-        
-        if not response.ok:
-            return json.dumps({
-                'error': f"CKAN API error: {response.status_code} {response.reason}",
-                'dataset': None
-            })
-        
-        full_response = response.json()
-        
-        if not full_response.get('success') or not full_response.get('result'):
-            return json.dumps({
-                'error': 'Failed to retrieve dataset details from CKAN API',
-                'dataset': None
-            })
-        
-        data = full_response['result']
-        
-        # Create essential data summary
-        essential_data = {
-            'id': data.get('id'),
-            'title': data.get('title'),
-            'name': data.get('name'),
-            'notes': data.get('notes', 'No description provided.')[:500] + ('...' if len(data.get('notes', '')) > 500 else ''),
-            'organization_title': data.get('organization', {}).get('title') if data.get('organization') else None,
-            'num_resources': data.get('num_resources'),
-            'num_tags': data.get('num_tags'),
-            'tags': [tag.get('display_name') or tag.get('name') for tag in data.get('tags', [])][:5],
-            'resources_summary': [
-                {
-                    'name': r.get('name'),
-                    'format': r.get('format'),
-                    'url': r.get('url')
-                }
-                for r in data.get('resources', [])[:3]
-            ],
-            'license_title': data.get('license_title'),
-            'metadata_created': data.get('metadata_created'),
-            'metadata_modified': data.get('metadata_modified'),
-            'url': f"{resolved_base_url}/dataset/{data.get('name')}"
-        }
-        
+        essential_data = await get_ckan_client(base_url).dataset_details(dataset_id)
         return json.dumps(essential_data, indent=2)
-        
     except Exception as e:
         return json.dumps({
             'error': f"Failed to get dataset details: {str(e)}",
@@ -157,17 +75,17 @@ def get_ckan_dataset_details(
 
 
 
-# Create tools
-search_tool = Tool(
+# Create tools (async, so CKAN calls do not block the LangGraph server's event loop)
+search_tool = StructuredTool.from_function(
+    coroutine=search_ckan_datasets,
     name="search_ckan_datasets",
-    description="Search for datasets in CKAN open data portals. Use this to find datasets related to specific topics or keywords.",
-    func=search_ckan_datasets
+    description="Search for datasets in CKAN open data portals. Use this to find datasets related to specific topics or keywords."
 )
 
-details_tool = Tool(
-    name="get_ckan_dataset_details", 
-    description="Get detailed information about a specific CKAN dataset using its ID or name.",
-    func=get_ckan_dataset_details
+details_tool = StructuredTool.from_function(
+    coroutine=get_ckan_dataset_details,
+    name="get_ckan_dataset_details",
+    description="Get detailed information about a specific CKAN dataset using its ID or name."
 )
 
 # Check if API key is available
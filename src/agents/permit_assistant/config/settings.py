@@ -16,6 +16,10 @@ class Settings(NamedTuple):
     tool_model_name: str = "o4-mini-2025-04-16"
     temperature: float = 0.1
     mcp_server_path: str = ""
+    mcp_pool_size: int = 2
+    mcp_health_check_interval: float = 30.0
+    tool_execution_mode: str = "mcp"  # "mcp" (stdio server) or "in_process"
+    relationship_cache_ttl: float = 60.0
 
 def get_settings() -> Settings:
     """Get configuration settings from environment variables"""
@@ -45,5 +49,9 @@ def get_settings() -> Settings:
         openai_api_key=api_key,
         og_client_id=og_client_id,
         og_client_secret=og_client_secret,
-        mcp_server_path=mcp_server_path
+        mcp_server_path=mcp_server_path,
+        mcp_pool_size=int(os.getenv("MCP_POOL_SIZE", "2")),
+        mcp_health_check_interval=float(os.getenv("MCP_HEALTH_CHECK_INTERVAL", "30")),
+        tool_execution_mode=os.getenv("TOOL_EXECUTION_MODE", "mcp").lower(),
+        relationship_cache_ttl=float(os.getenv("PERMIT_RELATIONSHIP_CACHE_TTL", "60"))
     ) 
\ No newline at end of file
@@ -8,11 +8,37 @@ from langgraph.prebuilt import ToolNode
 from langgraph.graph.ui import push_ui_message
 from langchain_core.messages import AIMessage, ToolMessage
 from src.agents.permit_assistant.types import AgentState
-from src.agents.permit_assistant.utils import process_records_for_ui, get_address_info, get_applicant_name, get_owner_email, format_date, get_record_type_name
+from src.agents.permit_assistant.utils import process_records_for_ui, get_address_info, get_applicant_name, get_owner_email, format_date, get_record_type_name, JsonApiDocument
 from src.agents.permit_assistant.utils.schema_generator import generate_record_detail_schema, generate_records_table_schema
+from src.agents.permit_assistant.config import get_settings
+from src.common.memo import AsyncTTLCache, RequestMemo
+from src.common.inprocess_tools import invoke_structured, structured_result
 
-async def fetch_related_resource(tools, community: str, relationship_link: str, relationship_name: str):
-    """Fetch related resource data from a relationship link"""
+# Short-TTL cache of related resources shared across requests - initialized lazily
+_relationship_cache = None
+
+def get_relationship_cache() -> AsyncTTLCache:
+    """Get or create the cross-request cache of fetched related resources"""
+    global _relationship_cache
+    if _relationship_cache is None:
+        settings = get_settings()
+        _relationship_cache = AsyncTTLCache(ttl_seconds=settings.relationship_cache_ttl)
+    return _relationship_cache
+
+def relationship_memo_key(community: str, tool_name: str, call_args: Dict[str, Any], linkage: Any = None):
+    """Key a related resource by its JSON:API identity when known, else by the tool call"""
+    if isinstance(linkage, dict) and linkage.get("type") and linkage.get("id") is not None:
+        return (community, "resource", str(linkage["type"]), str(linkage["id"]))
+    return (community, tool_name, tuple(sorted((k, str(v)) for k, v in call_args.items() if k != "community")))
+
+async def fetch_related_resource(tools, community: str, relationship_link: str, relationship_name: str,
+                                 memo: RequestMemo = None, linkage: Any = None, fallback_type_id: str = None):
+    """Fetch related resource data from a relationship link
+    
+    When a memo is given, each distinct related resource is fetched once per request
+    (and reused from the short-TTL cache across requests) no matter how many records
+    point at it.
+    """
     try:
         print(f"🔗 DEBUG: Fetching related resource for {relationship_name}: {relationship_link}")
         
@@ -63,6 +89,10 @@ async def fetch_related_resource(tools, community: str, relationship_link: str,
             print(f"🔗 DEBUG: Tool {tool_name} not found in available tools")
             return None
             
+        # Record type links may point at the record; fall back to the record's typeID
+        if tool_name == 'get_record_type' and not type_id and fallback_type_id:
+            type_id = str(fallback_type_id)
+        
         # Check if we have the required ID for the tool
         if tool_name == 'get_record_type' and not type_id:
             print(f"🔗 DEBUG: Could not extract type_id from link for {tool_name}: {relationship_link}")
@@ -73,23 +103,24 @@ async def fetch_related_resource(tools, community: str, relationship_link: str,
             
         # Call the tool with appropriate parameters using the existing tool instance
         if tool_name == 'get_record_type':
-            print(f"🔗 DEBUG: Calling {tool_name} with community={community}, record_type_id={type_id}")
-            result = await target_tool.ainvoke({"community": community, "record_type_id": type_id})
+            call_args = {"community": community, "record_type_id": type_id}
         else:
-            print(f"🔗 DEBUG: Calling {tool_name} with community={community}, record_id={record_id}")
-            result = await target_tool.ainvoke({"community": community, "record_id": record_id})
+            call_args = {"community": community, "record_id": record_id}
         
-        print(f"🔗 DEBUG: Tool {tool_name} returned: {type(result)}")
+        async def load_related_resource():
+            print(f"🔗 DEBUG: Calling {tool_name} with {call_args}")
+            # Structured payload comes straight from the tool artifact when available
+            result = await invoke_structured(target_tool, call_args)
+            print(f"🔗 DEBUG: Tool {tool_name} returned: {type(result)}")
+            return result
         
-        # Parse the result if it's a string
-        if isinstance(result, str):
-            try:
-                result = json.loads(result)
-                print(f"🔗 DEBUG: Parsed tool result as JSON")
-            except json.JSONDecodeError:
-                print(f"🔗 DEBUG: Tool result is not JSON, using as-is")
+        if memo is None:
+            return await load_related_resource()
         
-        return result
+        return await memo.get_or_load(
+            relationship_memo_key(community, tool_name, call_args, linkage),
+            load_related_resource
+        )
         
     except Exception as e:
         print(f"🔗 ERROR: Failed to fetch related resource {relationship_name}: {e}")
@@ -109,6 +140,10 @@ async def enhance_records_with_relationships(records, tools, community: str):
     enhanced_records = []
     total_api_calls = 0
     
+    # Records on one page usually share record types, applicants and locations,
+    # so fetch each distinct related resource once per request
+    memo = RequestMemo(shared=get_relationship_cache())
+    
     # Process all records concurrently
     async def enhance_single_record(record, record_index):
         nonlocal total_api_calls
@@ -143,7 +178,12 @@ async def enhance_records_with_relationships(records, tools, community: str):
                 # Add to concurrent fetch tasks
                 if related_link and related_link != "/path/to/resource":
                     print(f"🔗 DEBUG: Queuing {rel_name} relationship for record {record_index+1}")
-                    fetch_tasks.append(fetch_related_resource(tools, community, related_link, rel_name))
+                    fetch_tasks.append(fetch_related_resource(
+                        tools, community, related_link, rel_name,
+                        memo=memo,
+                        linkage=rel_data.get("data"),
+                        fallback_type_id=record.get("attributes", {}).get("typeID")
+                    ))
                     relationship_names.append((rel_name, rel_data))
                 else:
                     enhanced_relationships[rel_name] = rel_data
@@ -253,8 +293,10 @@ async def enhance_records_with_relationships(records, tools, community: str):
         enhanced_records.extend(remaining_records)
         print(f"🔗 DEBUG: Added {len(remaining_records)} unprocessed records")
     
+    memo_stats = memo.stats()
     print(f"🔗 DEBUG: Enhanced {len(enhanced_records)} records with applicant, address, and record type data")
-    print(f"🔗 DEBUG: Total API calls made: {total_api_calls}")
+    print(f"🔗 DEBUG: Relationship fetches requested: {total_api_calls}, tool calls made: {memo_stats['fetched']}")
+    print(f"🔗 DEBUG: Relationship dedupe stats: {memo_stats}, shared cache: {get_relationship_cache().stats()}")
     return enhanced_records
 
 async def tools_with_ui_node(state: AgentState, tools, model=None):
@@ -304,18 +346,12 @@ async def tools_with_ui_node(state: AgentState, tools, model=None):
                             print(f"🔧 DEBUG: Processing tool response content type: {type(tool_response.content)}")
                             print(f"🔧 DEBUG: Tool response content preview: {str(tool_response.content)[:200]}...")
                             
-                            # Parse the tool response to extract records
-                            result = tool_response.content
-                            if isinstance(result, str):
-                                try:
-                                    parsed_result = json.loads(result)
-                                    print(f"🔧 DEBUG: Parsed JSON result with keys: {list(parsed_result.keys()) if isinstance(parsed_result, dict) else 'not a dict'}")
-                                except json.JSONDecodeError as e:
-                                    print(f"🔧 DEBUG: JSON decode error: {e}")
-                                    continue
-                            else:
-                                parsed_result = result
-                                print(f"🔧 DEBUG: Result is not string, type: {type(parsed_result)}")
+                            # Use the structured tool artifact when present, parsing the text content otherwise
+                            parsed_result = structured_result(tool_response)
+                            if isinstance(parsed_result, str):
+                                print(f"🔧 DEBUG: Tool result is not JSON, skipping UI emission")
+                                continue
+                            print(f"🔧 DEBUG: Structured result with keys: {list(parsed_result.keys()) if isinstance(parsed_result, dict) else 'not a dict'}")
                             
                             # Extract records and included data from the result
                             records = []
@@ -376,6 +412,10 @@ async def tools_with_ui_node(state: AgentState, tools, model=None):
                                         print(f"🔧 DEBUG: First record attributes keys: {list(attributes.keys())}")
                                         print(f"🔧 DEBUG: First record attributes sample: {dict(list(attributes.items())[:5])}")
                                 
+                                # Index included resources once so per-record lookups are O(1)
+                                included_document = JsonApiDocument(included=included_data, data=records)
+                                print(f"🔧 DEBUG: Indexed {len(included_document)} resources for relationship lookups")
+                                
                                 # Get community from tool call args
                                 community = tool_call.get('args', {}).get('community', 'Unknown')
                                 
@@ -482,12 +522,12 @@ async def tools_with_ui_node(state: AgentState, tools, model=None):
                                             "dateSubmitted": format_date(attributes.get("submittedAt")),
                                             
                                             # Owner Email - use enhanced relationship data if available
-                                            "ownerEmail": get_owner_email(record, included_data),
+                                            "ownerEmail": get_owner_email(record, included_document),
                                             
                                             # Address - use enhanced relationship data if available
                                             "address": (
                                                 relationships.get("primaryLocation", {}).get("resolved_address") or
-                                                get_address_info(record, included_data)
+                                                get_address_info(record, included_document)
                                             )
                                         }
                                         
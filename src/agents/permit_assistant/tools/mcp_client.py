@@ -4,9 +4,12 @@ import os
 import time
 from langchain_mcp_adapters.client import MultiServerMCPClient
 from src.agents.permit_assistant.config import get_settings
+from src.common.mcp_pool import MCPSessionPool
+from src.common.inprocess_tools import load_inprocess_tools
 
-# Global cache for MCP client and tools
+# Global cache for MCP client, session pool and tools
 _mcp_client = None
+_mcp_pool = None
 _cached_tools = None
 _client_creation_time = None
 
@@ -33,6 +36,27 @@ async def get_mcp_client():
     
     return _mcp_client
 
+async def get_mcp_pool():
+    """Get or create the pool of long-lived MCP sessions (singleton pattern)
+    
+    Tools execute over pooled, pre-initialized server processes instead of
+    spawning a fresh stdio server (and fetching a new OAuth token) per call.
+    """
+    global _mcp_pool
+    
+    if _mcp_pool is None:
+        settings = get_settings()
+        client = await get_mcp_client()
+        _mcp_pool = MCPSessionPool(
+            client,
+            "opengov_plc",
+            size=settings.mcp_pool_size,
+            health_check_interval=settings.mcp_health_check_interval
+        )
+        print(f"🔧 DEBUG: Created MCP session pool with {settings.mcp_pool_size} session(s)")
+    
+    return _mcp_pool
+
 async def get_permit_tools():
     """Get tools from the OpenGov Permitting & Licensing MCP server (cached)"""
     global _cached_tools
@@ -43,11 +67,19 @@ async def get_permit_tools():
         return _cached_tools
     
     try:
+        settings = get_settings()
+        if settings.tool_execution_mode == "in_process":
+            # Call the server's tool functions directly, skipping JSON-RPC over stdio
+            print("🔧 DEBUG: Loading tools in-process from the MCP server module...")
+            _cached_tools = await load_inprocess_tools(settings.mcp_server_path)
+            print(f"✅ Loaded {len(_cached_tools)} in-process tools from OpenGov PLC MCP server")
+            return _cached_tools
+        
         print("🔧 DEBUG: Loading tools from MCP server for the first time...")
-        client = await get_mcp_client()
+        pool = await get_mcp_pool()
         
-        # Get tools from the MCP server
-        _cached_tools = await client.get_tools()
+        # Get tools from the MCP server, bound to the session pool
+        _cached_tools = await pool.get_tools()
         print(f"✅ Loaded {len(_cached_tools)} tools from OpenGov PLC MCP server")
         return _cached_tools
     except Exception as e:
@@ -56,7 +88,10 @@ async def get_permit_tools():
 
 def clear_mcp_cache():
     """Clear the MCP client and tools cache (useful for testing/debugging)"""
-    global _mcp_client, _cached_tools
+    global _mcp_client, _mcp_pool, _cached_tools
+    if _mcp_pool is not None:
+        _mcp_pool.shutdown()
     _mcp_client = None
+    _mcp_pool = None
     _cached_tools = None
     print("🔧 DEBUG: MCP cache cleared") 
\ No newline at end of file
@@ -8,6 +8,7 @@ from .formatters import (
     get_owner_email
 )
 from .data_processors import process_records_for_ui
+from src.common.jsonapi import JsonApiDocument
 
 __all__ = [
     "format_date",
@@ -15,5 +16,6 @@ __all__ = [
     "get_address_info",
     "get_applicant_name",
     "get_owner_email",
-    "process_records_for_ui"
+    "process_records_for_ui",
+    "JsonApiDocument"
 ] 
\ No newline at end of file
@@ -1,12 +1,16 @@
 """Data processing utilities for UI components"""
 
 from typing import List, Dict, Any
-from .formatters import format_date, get_record_type_name, get_address_info, get_applicant_name, get_owner_email
+from src.common.jsonapi import as_document
+from .formatters import IncludedData, format_date, get_record_type_name, get_address_info, get_applicant_name, get_owner_email
 
-def process_records_for_ui(records: List[Dict[str, Any]], included_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def process_records_for_ui(records: List[Dict[str, Any]], included_data: IncludedData) -> List[Dict[str, Any]]:
     """Process records to ensure proper field mapping for UI components"""
     processed_records = []
     
+    # Index included resources once for all records
+    included_data = as_document(included_data)
+    
     for record in records:
         # Flatten the nested structure - extract attributes
         attributes = record.get("attributes", {})
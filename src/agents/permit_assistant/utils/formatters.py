@@ -1,7 +1,10 @@
 """Formatting utilities for permit data"""
 
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Union
+from src.common.jsonapi import JsonApiDocument, as_document
+
+IncludedData = Union[JsonApiDocument, List[Dict[str, Any]]]
 
 def format_date(date_string: Optional[str]) -> Optional[str]:
     """Format date from UTC to local date string"""
@@ -43,7 +46,7 @@ def get_record_type_name(type_id: Optional[str], type_description: Optional[str]
     
     return "Unknown Type"
 
-def get_address_info(record_data: Dict[str, Any], included_data: List[Dict[str, Any]]) -> Optional[str]:
+def get_address_info(record_data: Dict[str, Any], included_data: IncludedData) -> Optional[str]:
     """Extract address info from included data or relationships"""
     try:
         # First check if we have locationDetails from MCP server enhancement
@@ -103,35 +106,34 @@ def get_address_info(record_data: Dict[str, Any], included_data: List[Dict[str,
                     print(f"🔧 DEBUG: Looking for location: id={location_id}, type={location_type}")
                     
                     # Find the location in included data
-                    for included_item in included_data:
-                        if (included_item.get("type") == location_type and 
-                            included_item.get("id") == location_id):
-                            location_attrs = included_item.get("attributes", {})
-                            print(f"🔧 DEBUG: Found location data: {list(location_attrs.keys())}")
-                            
-                            # Build address from available location attributes
-                            address_parts = []
-                            if location_attrs.get("streetNumber"):
-                                address_parts.append(str(location_attrs["streetNumber"]))
-                            if location_attrs.get("streetName"):
-                                address_parts.append(location_attrs["streetName"])
-                            if location_attrs.get("city"):
-                                address_parts.append(location_attrs["city"])
-                            if location_attrs.get("state"):
-                                address_parts.append(location_attrs["state"])
-                            if location_attrs.get("zipCode"):
-                                address_parts.append(location_attrs["zipCode"])
-                            
-                            # Also try other common address fields
-                            if not address_parts:
-                                for addr_field in ["address", "fullAddress", "streetAddress"]:
-                                    if location_attrs.get(addr_field):
-                                        return location_attrs[addr_field]
-                            
-                            if address_parts:
-                                return ", ".join(address_parts)
-                            
-                            return f"Location {location_id}"
+                    included_item = as_document(included_data).get(location_type, location_id)
+                    if included_item is not None:
+                        location_attrs = included_item.get("attributes", {})
+                        print(f"🔧 DEBUG: Found location data: {list(location_attrs.keys())}")
+                    
+                        # Build address from available location attributes
+                        address_parts = []
+                        if location_attrs.get("streetNumber"):
+                            address_parts.append(str(location_attrs["streetNumber"]))
+                        if location_attrs.get("streetName"):
+                            address_parts.append(location_attrs["streetName"])
+                        if location_attrs.get("city"):
+                            address_parts.append(location_attrs["city"])
+                        if location_attrs.get("state"):
+                            address_parts.append(location_attrs["state"])
+                        if location_attrs.get("zipCode"):
+                            address_parts.append(location_attrs["zipCode"])
+                    
+                        # Also try other common address fields
+                        if not address_parts:
+                            for addr_field in ["address", "fullAddress", "streetAddress"]:
+                                if location_attrs.get(addr_field):
+                                    return location_attrs[addr_field]
+                    
+                        if address_parts:
+                            return ", ".join(address_parts)
+                    
+                        return f"Location {location_id}"
                     
                     # If relationship exists but no included data found
                     return f"Location ID: {location_id}"
@@ -177,7 +179,7 @@ def get_address_info(record_data: Dict[str, Any], included_data: List[Dict[str,
         print(f"🔧 DEBUG: Error getting address info: {e}")
         return None
 
-def get_owner_email(record_data: Dict[str, Any], included_data: List[Dict[str, Any]]) -> Optional[str]:
+def get_owner_email(record_data: Dict[str, Any], included_data: IncludedData) -> Optional[str]:
     """Get owner email from locationDetails or other sources"""
     try:
         # First check if we have locationDetails from MCP server enhancement
@@ -198,7 +200,7 @@ def get_owner_email(record_data: Dict[str, Any], included_data: List[Dict[str, A
         print(f"🔧 DEBUG: Error getting owner email: {e}")
         return None
 
-def get_applicant_name(record_data: Dict[str, Any], included_data: List[Dict[str, Any]]) -> Optional[str]:
+def get_applicant_name(record_data: Dict[str, Any], included_data: IncludedData) -> Optional[str]:
     """Get applicant name from included data or relationships"""
     try:
         relationships = record_data.get("relationships", {})
@@ -233,28 +235,27 @@ def get_applicant_name(record_data: Dict[str, Any], included_data: List[Dict[str
                     print(f"🔧 DEBUG: Looking for applicant: id={applicant_id}, type={applicant_type}")
                     
                     # Find the applicant in included data
-                    for included_item in included_data:
-                        if (included_item.get("type") == applicant_type and 
-                            included_item.get("id") == applicant_id):
-                            applicant_attrs = included_item.get("attributes", {})
-                            print(f"🔧 DEBUG: Found applicant data: {list(applicant_attrs.keys())}")
-                            
-                            # Build name from available attributes
-                            name_parts = []
-                            if applicant_attrs.get("firstName"):
-                                name_parts.append(applicant_attrs["firstName"])
-                            if applicant_attrs.get("lastName"):
-                                name_parts.append(applicant_attrs["lastName"])
-                            
-                            if name_parts:
-                                return " ".join(name_parts)
-                            
-                            # Fallback to other name fields
-                            for name_field in ["name", "displayName", "fullName", "email"]:
-                                if applicant_attrs.get(name_field):
-                                    return applicant_attrs[name_field]
-                            
-                            return f"User {applicant_id}"
+                    included_item = as_document(included_data).get(applicant_type, applicant_id)
+                    if included_item is not None:
+                        applicant_attrs = included_item.get("attributes", {})
+                        print(f"🔧 DEBUG: Found applicant data: {list(applicant_attrs.keys())}")
+                    
+                        # Build name from available attributes
+                        name_parts = []
+                        if applicant_attrs.get("firstName"):
+                            name_parts.append(applicant_attrs["firstName"])
+                        if applicant_attrs.get("lastName"):
+                            name_parts.append(applicant_attrs["lastName"])
+                    
+                        if name_parts:
+                            return " ".join(name_parts)
+                    
+                        # Fallback to other name fields
+                        for name_field in ["name", "displayName", "fullName", "email"]:
+                            if applicant_attrs.get(name_field):
+                                return applicant_attrs[name_field]
+                    
+                        return f"User {applicant_id}"
                     
                     # If relationship exists but no included data found
                     return f"Applicant ID: {applicant_id}"
@@ -0,0 +1,9 @@
+"""
+Shared utilities
+
+Helpers used by more than one agent and by the MCP servers.
+"""
+
+from .jsonapi import JsonApiDocument, as_document
+
+__all__ = ["JsonApiDocument", "as_document"]
@@ -0,0 +1,119 @@
+"""In-process execution of MCP server tools as LangChain tools"""
+
+import importlib.util
+import inspect
+import json
+import os
+import sys
+import uuid
+from typing import Any, Dict, List
+
+from langchain_core.tools import BaseTool, StructuredTool
+
+def load_server_module(server_path: str):
+    """Import an MCP server script by path (once per process)"""
+    server_path = os.path.abspath(server_path)
+    module_name = f"inprocess_{os.path.splitext(os.path.basename(server_path))[0]}"
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+
+    # Server scripts import their sibling helper modules by plain name
+    server_dir = os.path.dirname(server_path)
+    if server_dir not in sys.path:
+        sys.path.insert(0, server_dir)
+
+    spec = importlib.util.spec_from_file_location(module_name, server_path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    try:
+        spec.loader.exec_module(module)
+    except Exception:
+        del sys.modules[module_name]
+        raise
+    return module
+
+async def _list_server_tools(server) -> List[Any]:
+    """List registered tools (with their Python callables) from a FastMCP server"""
+    if hasattr(server, "_tool_manager"):
+        # mcp.server.fastmcp.FastMCP
+        return list(server._tool_manager.list_tools())
+    if hasattr(server, "get_tools"):
+        # fastmcp 2.x returns a name -> tool mapping
+        tools = await server.get_tools()
+        return list(tools.values()) if isinstance(tools, dict) else list(tools)
+    # fastmcp 3.x
+    return list(await server.list_tools())
+
+def _make_direct_call(fn):
+    async def call_tool(**arguments) -> tuple:
+        result = fn(**arguments)
+        if inspect.isawaitable(result):
+            result = await result
+        content = result if isinstance(result, str) else json.dumps(result, default=str)
+        # The artifact mirrors the MCP adapter's shape so consumers read both the same way
+        return content, {"structured_content": result}
+    return call_tool
+
+async def load_inprocess_tools(server_path: str) -> List[BaseTool]:
+    """Expose an MCP server's tools as LangChain tools that call the functions directly.
+
+    Results skip JSON-RPC and stdio entirely; the structured Python object is
+    attached to the ToolMessage artifact so nodes do not re-parse the text the
+    model sees.
+    """
+    module = load_server_module(server_path)
+    # Servers may register tools that depend on their backend (e.g. schema-validated templates)
+    prepare_tools = getattr(module, "prepare_tools", None)
+    if prepare_tools is not None:
+        try:
+            await prepare_tools()
+        except Exception as e:
+            print(f"⚠️ Could not prepare tools for {os.path.basename(server_path)}: {e}")
+    tools = []
+    for server_tool in await _list_server_tools(module.mcp):
+        tools.append(StructuredTool(
+            name=server_tool.name,
+            description=server_tool.description or "",
+            args_schema=server_tool.parameters,
+            coroutine=_make_direct_call(server_tool.fn),
+            response_format="content_and_artifact",
+            metadata={"execution": "in_process"}
+        ))
+    return tools
+
+def structured_result(message: Any) -> Any:
+    """Get the structured payload of a tool result without re-parsing when possible.
+
+    Prefers the artifact's structured content (in-process tools, or MCP tools
+    whose server returned structured content) and falls back to parsing the
+    text content as JSON.
+    """
+    artifact = getattr(message, "artifact", None)
+    if isinstance(artifact, dict) and artifact.get("structured_content") is not None:
+        return artifact["structured_content"]
+
+    content = getattr(message, "content", message)
+    if isinstance(content, list):
+        text_blocks = [
+            block.get("text", "") if isinstance(block, dict) else str(block)
+            for block in content
+            if not isinstance(block, dict) or block.get("type") == "text"
+        ]
+        if len(text_blocks) == len(content):
+            content = "".join(text_blocks)
+    if isinstance(content, str):
+        try:
+            return json.loads(content)
+        except json.JSONDecodeError:
+            return content
+    return content
+
+async def invoke_structured(tool: BaseTool, args: Dict[str, Any]) -> Any:
+    """Invoke a tool and return its structured payload"""
+    message = await tool.ainvoke({
+        "name": tool.name,
+        "args": args,
+        "id": f"call_{uuid.uuid4().hex}",
+        "type": "tool_call"
+    })
+    return structured_result(message)
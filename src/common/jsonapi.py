@@ -0,0 +1,76 @@
+"""JSON:API document resolver with an identity map over included resources"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+ResourceKey = Tuple[str, str]
+
+class JsonApiDocument:
+    """Index a JSON:API response once and resolve resource identifiers in O(1).
+
+    OpenGov PLC responses carry related resources in ``included`` and refer to
+    them from ``relationships`` by ``{"type", "id"}`` identifiers. Instead of
+    scanning ``included`` for every record and relationship key, the document
+    builds a ``(type, id)`` identity map up front and answers lookups from it.
+    """
+
+    def __init__(self, included: Optional[Iterable[Dict[str, Any]]] = None,
+                 data: Optional[Union[Dict[str, Any], List[Dict[str, Any]]]] = None):
+        self._index: Dict[ResourceKey, Dict[str, Any]] = {}
+        self.records: List[Dict[str, Any]] = []
+
+        if isinstance(data, list):
+            self.records = [item for item in data if isinstance(item, dict)]
+        elif isinstance(data, dict):
+            self.records = [data]
+
+        # Primary resources can be the target of relationships too
+        for resource in self.records:
+            self.add(resource)
+        for resource in included or []:
+            self.add(resource)
+
+    @classmethod
+    def from_response(cls, response: Dict[str, Any]) -> "JsonApiDocument":
+        """Build a document from a full JSON:API response body"""
+        if not isinstance(response, dict):
+            return cls()
+        return cls(included=response.get("included"), data=response.get("data"))
+
+    @staticmethod
+    def key(resource_type: Any, resource_id: Any) -> ResourceKey:
+        """Normalize a (type, id) pair so string and numeric ids compare equal"""
+        return (str(resource_type), str(resource_id))
+
+    def add(self, resource: Dict[str, Any]) -> None:
+        """Add a resource object to the identity map"""
+        if not isinstance(resource, dict):
+            return
+        resource_type = resource.get("type")
+        resource_id = resource.get("id")
+        if resource_type is None or resource_id is None:
+            return
+        self._index[self.key(resource_type, resource_id)] = resource
+
+    def get(self, resource_type: Any, resource_id: Any) -> Optional[Dict[str, Any]]:
+        """Look up a resource by type and id"""
+        if resource_type is None or resource_id is None:
+            return None
+        return self._index.get(self.key(resource_type, resource_id))
+
+    def resolve(self, identifier: Optional[Dict[str, Any]], default_type: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Resolve a resource identifier object (``{"type", "id"}``) to its resource"""
+        if not isinstance(identifier, dict) or "id" not in identifier:
+            return None
+        return self.get(identifier.get("type", default_type), identifier["id"])
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, key: ResourceKey) -> bool:
+        return self.key(*key) in self._index
+
+def as_document(included: Union[JsonApiDocument, Iterable[Dict[str, Any]], None]) -> JsonApiDocument:
+    """Return ``included`` as a JsonApiDocument, indexing a plain list if needed"""
+    if isinstance(included, JsonApiDocument):
+        return included
+    return JsonApiDocument(included=included)
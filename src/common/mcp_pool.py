@@ -0,0 +1,241 @@
+"""Pool of long-lived, pre-initialized MCP client sessions"""
+
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+
+from langchain_core.tools import BaseTool
+from langchain_mcp_adapters.client import MultiServerMCPClient
+from langchain_mcp_adapters.tools import convert_mcp_tool_to_langchain_tool
+
+from src.common.tool_manifest import ToolManifestCache
+
+class _PooledSession:
+    """One MCP server process with an initialized session, owned by a worker task.
+
+    The session context is entered and exited inside the same worker task, as
+    the MCP transports require, while tool calls from any task on the same
+    event loop are multiplexed over it.
+    """
+
+    def __init__(self, client: MultiServerMCPClient, server_name: str, index: int):
+        self.client = client
+        self.server_name = server_name
+        self.index = index
+        self.session = None
+        self.in_flight = 0
+        self.calls = 0
+        self.restarts = 0
+        self.last_error: Optional[str] = None
+        self.last_health_check = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self._ready: Optional[asyncio.Event] = None
+        self._stop: Optional[asyncio.Event] = None
+
+    @property
+    def alive(self) -> bool:
+        return self.session is not None and self._task is not None and not self._task.done()
+
+    async def start(self, timeout: float) -> None:
+        """Spawn the server process and wait for the session to initialize"""
+        self._ready = asyncio.Event()
+        self._stop = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name=f"mcp-pool-{self.server_name}-{self.index}")
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            self.last_error = f"session did not initialize within {timeout}s"
+            self.shutdown()
+        if self.session is None:
+            raise RuntimeError(f"Failed to start MCP session for {self.server_name}: {self.last_error}")
+        self.last_health_check = time.monotonic()
+
+    async def _run(self) -> None:
+        try:
+            async with self.client.session(self.server_name) as session:
+                self.session = session
+                self._ready.set()
+                await self._stop.wait()
+        except Exception as e:
+            self.last_error = str(e)
+        finally:
+            self.session = None
+            self._ready.set()
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        """Close the session and wait for the server process to exit"""
+        task = self._task
+        self.shutdown()
+        if task is not None and not task.done():
+            try:
+                await asyncio.wait_for(asyncio.shield(task), timeout=timeout)
+            except (asyncio.TimeoutError, Exception):
+                task.cancel()
+
+    def shutdown(self) -> None:
+        """Signal the worker to close the session without waiting"""
+        self.session = None
+        if self._stop is not None:
+            self._stop.set()
+
+    async def restart(self, timeout: float) -> None:
+        await self.stop()
+        self.restarts += 1
+        await self.start(timeout)
+
+    async def ping(self, timeout: float) -> bool:
+        """Health check the session with an MCP ping"""
+        self.last_health_check = time.monotonic()
+        try:
+            await asyncio.wait_for(self.session.send_ping(), timeout=timeout)
+            return True
+        except Exception as e:
+            self.last_error = f"health check failed: {e}"
+            return False
+
+class MCPSessionPool:
+    """Keep ``size`` pre-initialized sessions to one MCP server and route tool calls over them.
+
+    Without a session, every LangChain MCP tool invocation spawns a fresh stdio
+    server (interpreter start, imports, dotenv and a new OAuth token). The pool
+    starts its sessions lazily on the event loop that first uses them, sends
+    calls to the least busy live session, pings idle sessions before reuse and
+    restarts any whose server process crashed.
+    """
+
+    def __init__(self, client: MultiServerMCPClient, server_name: str, size: int = 2,
+                 health_check_interval: float = 30.0, startup_timeout: float = 30.0,
+                 ping_timeout: float = 5.0):
+        self.client = client
+        self.server_name = server_name
+        self.size = max(1, size)
+        self.health_check_interval = health_check_interval
+        self.startup_timeout = startup_timeout
+        self.ping_timeout = ping_timeout
+        self._slots: List[_PooledSession] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self.failures = 0
+
+    async def _ensure_started(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Sessions belong to the loop that created them (graph construction
+            # may run on a throwaway loop), so start fresh on a new loop
+            for slot in self._slots:
+                slot.shutdown()
+            self._slots = [_PooledSession(self.client, self.server_name, i) for i in range(self.size)]
+            self._loop = loop
+            self._lock = asyncio.Lock()
+
+        if all(slot.alive for slot in self._slots):
+            return
+
+        async with self._lock:
+            dead = [slot for slot in self._slots if not slot.alive]
+            if not dead:
+                return
+            print(f"🔌 DEBUG: Starting {len(dead)} pooled MCP session(s) for {self.server_name}")
+            results = await asyncio.gather(
+                *[slot.restart(self.startup_timeout) if slot._task else slot.start(self.startup_timeout) for slot in dead],
+                return_exceptions=True
+            )
+            errors = [r for r in results if isinstance(r, Exception)]
+            if len(errors) == len(self._slots):
+                raise errors[0]
+            for error in errors:
+                print(f"🔌 ERROR: {error}")
+
+    async def _acquire(self) -> _PooledSession:
+        await self._ensure_started()
+        live = [slot for slot in self._slots if slot.alive]
+        if not live:
+            raise RuntimeError(f"No live MCP sessions for {self.server_name}")
+        slot = min(live, key=lambda s: s.in_flight)
+
+        # Health check sessions that have been idle for a while before reusing them
+        if slot.in_flight == 0 and time.monotonic() - slot.last_health_check > self.health_check_interval:
+            if not await slot.ping(self.ping_timeout):
+                print(f"🔌 DEBUG: Restarting unhealthy MCP session {self.server_name}#{slot.index}: {slot.last_error}")
+                await slot.restart(self.startup_timeout)
+        return slot
+
+    async def call_tool(self, name: str, arguments: Optional[Dict[str, Any]] = None, **kwargs) -> Any:
+        """Call a tool on a pooled session (same signature as ``ClientSession.call_tool``)"""
+        slot = await self._acquire()
+        slot.in_flight += 1
+        slot.calls += 1
+        try:
+            return await slot.session.call_tool(name, arguments, **kwargs)
+        except Exception as e:
+            # Tool errors come back as results; exceptions mean the transport broke
+            self.failures += 1
+            slot.last_error = str(e)
+            if slot.alive and not await slot.ping(self.ping_timeout):
+                slot.shutdown()
+            raise
+        finally:
+            slot.in_flight -= 1
+
+    async def list_tools(self) -> List[Any]:
+        """List the server's MCP tools over a short-lived session.
+
+        The pool itself only starts on the loop that actually serves tool calls.
+        """
+        mcp_tools = []
+        async with self.client.session(self.server_name) as session:
+            cursor = None
+            while True:
+                page = await session.list_tools(cursor=cursor)
+                mcp_tools.extend(page.tools)
+                cursor = page.nextCursor
+                if not cursor:
+                    break
+        return mcp_tools
+
+    async def get_tools(self, manifest: Optional[ToolManifestCache] = None) -> List[BaseTool]:
+        """Load the server's tools as LangChain tools that execute over the pool.
+
+        With a ``manifest`` cache the tool list is read from disk while the
+        server code is unchanged, so no server is started until a tool runs.
+        """
+        mcp_tools = manifest.load() if manifest is not None else None
+        if mcp_tools is None:
+            mcp_tools = await self.list_tools()
+            if manifest is not None:
+                manifest.save(mcp_tools)
+        else:
+            print(f"🔌 DEBUG: Loaded {len(mcp_tools)} {self.server_name} tool schemas from {manifest.path}")
+        return [
+            convert_mcp_tool_to_langchain_tool(self, tool, server_name=self.server_name)
+            for tool in mcp_tools
+        ]
+
+    async def close(self) -> None:
+        """Close every pooled session"""
+        await asyncio.gather(*[slot.stop() for slot in self._slots], return_exceptions=True)
+
+    def shutdown(self) -> None:
+        """Signal every pooled session to close without waiting"""
+        for slot in self._slots:
+            slot.shutdown()
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool health and usage for debug output"""
+        return {
+            "server": self.server_name,
+            "size": self.size,
+            "alive": sum(1 for slot in self._slots if slot.alive),
+            "failures": self.failures,
+            "sessions": [
+                {
+                    "index": slot.index,
+                    "alive": slot.alive,
+                    "in_flight": slot.in_flight,
+                    "calls": slot.calls,
+                    "restarts": slot.restarts,
+                    "last_error": slot.last_error
+                }
+                for slot in self._slots
+            ]
+        }
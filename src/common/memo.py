@@ -0,0 +1,138 @@
+"""Async memoization helpers: short-TTL shared cache and request-scoped memo"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+Loader = Callable[[], Awaitable[Any]]
+
+class AsyncTTLCache:
+    """Bounded cache of loaded values with a short TTL and single-flight loading.
+
+    Concurrent ``get_or_load`` calls for the same key share one in-flight load.
+    ``None`` results and exceptions are never cached so transient failures are
+    retried by the next caller.
+    """
+
+    def __init__(self, ttl_seconds: float = 60.0, max_entries: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.joined = 0
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """Return ``(found, value)`` for a fresh entry without loading"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """Store a value, evicting the least recently used entries when full"""
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        if ttl <= 0 or value is None:
+            return
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get_or_load(self, key: Hashable, loader: Loader) -> Any:
+        """Return the cached value for ``key`` or load it once for all callers"""
+        found, value = self.get(key)
+        if found:
+            self.hits += 1
+            return value
+
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            self.joined += 1
+            return await asyncio.shield(in_flight)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            value = await loader()
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so an exception nobody else awaited is not logged
+            future.exception()
+            raise
+        else:
+            self.set(key, value)
+            future.set_result(value)
+            return value
+        finally:
+            self._in_flight.pop(key, None)
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drop one entry, or every entry when no key is given"""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for debug output and stats tools"""
+        lookups = self.hits + self.misses + self.joined
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "joined_in_flight": self.joined,
+            "hit_rate": round((self.hits + self.joined) / lookups, 3) if lookups else 0.0,
+            "ttl_seconds": self.ttl_seconds
+        }
+
+class RequestMemo:
+    """Memo scoped to a single request, optionally backed by a shared TTL cache.
+
+    Every distinct key is loaded at most once per request no matter how many
+    callers ask for it; loads that miss the request memo fall through to the
+    shared cache so recently fetched values are reused across requests.
+    """
+
+    def __init__(self, shared: Optional[AsyncTTLCache] = None):
+        self.shared = shared
+        self._tasks: Dict[Hashable, asyncio.Future] = {}
+        self.requests = 0
+        self.shared_hits = 0
+
+    async def get_or_load(self, key: Hashable, loader: Loader) -> Any:
+        """Return the value for ``key``, loading it at most once per request"""
+        self.requests += 1
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._load(key, loader))
+            self._tasks[key] = task
+        return await asyncio.shield(task)
+
+    async def _load(self, key: Hashable, loader: Loader) -> Any:
+        if self.shared is None:
+            return await loader()
+        found, value = self.shared.get(key)
+        if found:
+            self.shared_hits += 1
+            return value
+        return await self.shared.get_or_load(key, loader)
+
+    def stats(self) -> Dict[str, Any]:
+        """Dedupe statistics for this request"""
+        distinct = len(self._tasks)
+        return {
+            "requested": self.requests,
+            "distinct": distinct,
+            "deduplicated": self.requests - distinct,
+            "shared_cache_hits": self.shared_hits,
+            "fetched": distinct - self.shared_hits
+        }
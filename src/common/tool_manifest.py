@@ -0,0 +1,105 @@
+"""
+Persistent cache of MCP tool manifests
+
+Listing tools needs a live MCP session: spawn the server, import it,
+initialize and page through ``tools/list``. Tool schemas only change when
+the server code does, so the listed tools are stored in one JSON file per
+server, keyed on a hash of the server's source files. Graph construction
+reads the file and only talks to the server when the code has changed.
+"""
+
+import glob
+import hashlib
+import json
+import os
+import tempfile
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from mcp.types import Tool
+
+# Bump when the file layout changes so old files are ignored instead of misread
+MANIFEST_FORMAT_VERSION = 1
+
+DEFAULT_MANIFEST_DIR = os.path.join(os.path.expanduser("~"), ".cache", "opengov-mcp", "tool-manifests")
+
+def server_source_hash(server_path: str, extra: Iterable[str] = ()) -> str:
+    """Hash of the server file, the Python modules next to it and any ``extra`` strings"""
+    digest = hashlib.sha256()
+    server_path = os.path.abspath(server_path)
+    sources = [server_path] + sorted(
+        path for path in glob.glob(os.path.join(os.path.dirname(server_path), "*.py")) if path != server_path
+    )
+    for path in sources:
+        digest.update(os.path.basename(path).encode("utf-8"))
+        with open(path, "rb") as f:
+            digest.update(hashlib.sha256(f.read()).digest())
+    for value in extra:
+        digest.update(b"\0" + (value or "").encode("utf-8"))
+    return digest.hexdigest()
+
+class ToolManifestCache:
+    """Tool list of one MCP server stored on disk, valid while the server's source hash matches"""
+
+    def __init__(self, server_path: str, cache_dir: Optional[str] = None, extra: Iterable[str] = ()):
+        self.server_path = os.path.abspath(server_path)
+        self.cache_dir = os.path.expanduser(cache_dir) if cache_dir else DEFAULT_MANIFEST_DIR
+        self.extra = list(extra)
+        server_key = hashlib.sha256(self.server_path.encode("utf-8")).hexdigest()[:16]
+        name = os.path.splitext(os.path.basename(self.server_path))[0]
+        self.path = os.path.join(self.cache_dir, f"{name}_{server_key}.json")
+        self.hits = 0
+        self.misses = 0
+
+    def source_hash(self) -> Optional[str]:
+        try:
+            return server_source_hash(self.server_path, self.extra)
+        except OSError as e:
+            print(f"⚠️ Could not hash MCP server source {self.server_path}: {e}")
+            return None
+
+    def load(self) -> Optional[List[Tool]]:
+        """Cached tools, or None when missing, unreadable or written for other server code"""
+        digest = self.source_hash()
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            if (digest is None or entry.get("version") != MANIFEST_FORMAT_VERSION
+                    or entry.get("source_hash") != digest):
+                raise ValueError("stale manifest")
+            tools = [Tool.model_validate(tool) for tool in entry["tools"]]
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return tools
+
+    def save(self, tools: List[Tool]) -> bool:
+        """Write the tool list atomically (False when the write failed)"""
+        digest = self.source_hash()
+        if digest is None:
+            return False
+        entry = {
+            "version": MANIFEST_FORMAT_VERSION,
+            "server_path": self.server_path,
+            "source_hash": digest,
+            "listed_at": time.time(),
+            "tools": [tool.model_dump(mode="json", exclude_none=True) for tool in tools]
+        }
+        tmp_path = None
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Write to a temp file first so concurrent readers never see a partial file
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=".manifest-", suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+        except (OSError, TypeError, ValueError) as e:
+            print(f"⚠️ Could not write tool manifest {self.path}: {e}")
+            if tmp_path and os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            return False
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {"path": self.path, "hits": self.hits, "misses": self.misses}
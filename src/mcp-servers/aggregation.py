@@ -0,0 +1,111 @@
+"""
+Group-by aggregation over query result rows
+
+Rows are grouped in one pass, then each metric is computed for all groups at
+once with NumPy (``bincount`` for sums and counts, ``ufunc.at`` for min/max),
+so only the small aggregate table has to go back to the model.
+"""
+
+import importlib.util
+import json
+import math
+from typing import Any, Dict, List, Optional, Tuple
+
+# NumPy is imported on first aggregation to keep server start-up light
+NUMPY_AVAILABLE = importlib.util.find_spec("numpy") is not None
+
+METRIC_OPERATIONS = ("count", "sum", "mean", "min", "max")
+
+def parse_metrics(specs: Optional[List[str]]) -> Tuple[List[Tuple[str, Optional[str], str]], Optional[str]]:
+    """Parse ``["count", "sum:amount", "mean:amount"]`` into ``(operation, column, output name)``"""
+    metrics = []
+    for spec in specs or ["count"]:
+        operation, _, column = spec.partition(":")
+        operation, column = operation.strip().lower(), column.strip() or None
+        if operation not in METRIC_OPERATIONS:
+            return [], f"Unknown metric '{spec}'; use count, or sum/mean/min/max/count with ':column'"
+        if column is None and operation != "count":
+            return [], f"Metric '{spec}' needs a column, e.g. '{operation}:amount'"
+        metrics.append((operation, column, f"{operation}_{column}" if column else "count"))
+    return metrics, None
+
+def _numeric(value: Any) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return math.nan
+    return float(value)
+
+def _group_value(value: Any) -> Any:
+    """Hashable form of a group-by value (list and object values compare as JSON text)"""
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, sort_keys=True, default=str)
+    return value
+
+def aggregate_rows(rows: List[Dict[str, Any]], group_by: Optional[List[str]], metrics: List[Tuple[str, Optional[str], str]],
+                   sort_by: Optional[str] = None, top_k: int = 20, descending: bool = True) -> Dict[str, Any]:
+    """Aggregate flat rows into one row per group, sorted and cut to the top ``top_k`` groups"""
+    import numpy as np
+    group_by = group_by or []
+
+    # One pass assigns each row a group id; each group keeps its first row's values
+    group_ids = {}
+    group_values = []
+    row_groups = np.empty(len(rows), dtype=np.int64)
+    for index, row in enumerate(rows):
+        values = tuple(row.get(column) for column in group_by)
+        key = tuple(_group_value(value) for value in values)
+        group = group_ids.get(key)
+        if group is None:
+            group = group_ids[key] = len(group_values)
+            group_values.append(values)
+        row_groups[index] = group
+    group_count = len(group_ids)
+
+    results = {}
+    for operation, column, name in metrics:
+        if column is None:
+            results[name] = np.bincount(row_groups, minlength=group_count).astype(float)
+            continue
+        values = np.fromiter((_numeric(row.get(column)) for row in rows), dtype=float, count=len(rows))
+        present = ~np.isnan(values)
+        counts = np.bincount(row_groups[present], minlength=group_count).astype(float)
+        if operation == "count":
+            results[name] = counts
+        elif operation in ("sum", "mean"):
+            sums = np.bincount(row_groups[present], weights=values[present], minlength=group_count)
+            results[name] = sums if operation == "sum" else np.divide(sums, counts, out=np.full(group_count, np.nan), where=counts > 0)
+        else:
+            ufunc, start = (np.minimum, np.inf) if operation == "min" else (np.maximum, -np.inf)
+            extremes = np.full(group_count, start)
+            ufunc.at(extremes, row_groups[present], values[present])
+            extremes[counts == 0] = np.nan
+            results[name] = extremes
+
+    sort_name = sort_by or metrics[0][2]
+    order = np.arange(group_count)
+    if sort_name in results:
+        # NaN groups sort last either way
+        keys = results[sort_name]
+        keys = np.where(np.isnan(keys), -np.inf if descending else np.inf, keys)
+        order = np.argsort(-keys if descending else keys, kind="stable")
+    top = order[:max(top_k, 1)]
+
+    groups = []
+    for group in top:
+        entry = dict(zip(group_by, group_values[group]))
+        for _, _, name in metrics:
+            value = results[name][group]
+            if math.isnan(value):
+                entry[name] = None
+            elif name == "count" or name.startswith("count_"):
+                entry[name] = int(value)
+            else:
+                entry[name] = round(float(value), 6)
+        groups.append(entry)
+
+    return {
+        "groups": groups,
+        "group_count": group_count,
+        "groups_returned": len(groups),
+        "rows_aggregated": len(rows),
+        "sorted_by": sort_name if sort_name in results else None
+    }
@@ -0,0 +1,243 @@
+"""Async CKAN API client with a pooled session, TTL cache and single-flight loading
+
+Shared by the open data MCP server and the open data agent. Searches are
+cached by normalized query and paging, dataset details by dataset id, and
+concurrent identical requests share one HTTP call. With ``CKAN_INDEX=true``
+keyword searches are answered from a local full-text index of the whole
+catalog once its background sync has completed.
+"""
+
+import asyncio
+import os
+import re
+import sqlite3
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+import aiohttp
+
+# Optional local catalog index (sibling module when run as a script)
+try:
+    from .ckan_index import CKANCatalogIndex, index_path, is_fielded_query
+except ImportError:
+    from ckan_index import CKANCatalogIndex, index_path, is_fielded_query
+
+DEFAULT_CKAN_BASE_URL = os.environ.get('CKAN_BASE_URL', 'https://ckantesting.ogopendata.com')
+
+class CKANError(Exception):
+    """A CKAN API request failed or returned ``success: false``"""
+
+def normalize_query(query: Optional[str]) -> str:
+    """Cache key form of a search query: trimmed and single-spaced.
+
+    Case is kept: Solr field values (``tags:Parks``) and ``AND``/``OR`` are case-sensitive.
+    """
+    return re.sub(r"\s+", " ", (query or "").strip())
+
+class ResponseCache:
+    """Bounded TTL cache of API results where concurrent loads of one key share a request"""
+
+    def __init__(self, ttl_seconds: float = 300.0, max_entries: int = 512):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.joined = 0
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Cached value for ``key``, loaded once for all concurrent callers on a miss.
+
+        Failures and ``None`` results are not cached, so the next caller retries.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] >= time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            del self._entries[key]
+
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            self.joined += 1
+            return await asyncio.shield(in_flight)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            value = await loader()
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so an exception nobody else awaited is not logged
+            future.exception()
+            raise
+        else:
+            if value is not None and self.ttl_seconds > 0:
+                self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            future.set_result(value)
+            return value
+        finally:
+            del self._in_flight[key]
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses + self.joined
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "joined_in_flight": self.joined,
+            "hit_rate": round((self.hits + self.joined) / lookups, 3) if lookups else 0.0,
+            "ttl_seconds": self.ttl_seconds
+        }
+
+def summarize_search(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Concise ``package_search`` result: the total count and a short summary per dataset"""
+    concise_results = []
+    for dataset in result.get('results', []):
+        notes = dataset.get('notes') or 'No description available.'
+        concise_results.append({
+            'id': dataset.get('id'),
+            'title': dataset.get('title'),
+            'notes': notes[:150] + ('...' if len(notes) > 150 else ''),
+            'organization_title': dataset.get('organization', {}).get('title') if dataset.get('organization') else None,
+        })
+    return {'count': result.get('count', 0), 'results': concise_results}
+
+def summarize_dataset(data: Dict[str, Any], base_url: str) -> Dict[str, Any]:
+    """Essential fields of a ``package_show`` result"""
+    notes = data.get('notes') or 'No description provided.'
+    return {
+        'id': data.get('id'),
+        'title': data.get('title'),
+        'name': data.get('name'),
+        'notes': notes[:500] + ('...' if len(notes) > 500 else ''),
+        'organization_title': data.get('organization', {}).get('title') if data.get('organization') else None,
+        'num_resources': data.get('num_resources'),
+        'num_tags': data.get('num_tags'),
+        'tags': [tag.get('display_name') or tag.get('name') for tag in data.get('tags', [])][:5],
+        'resources_summary': [
+            {
+                'name': r.get('name'),
+                'format': r.get('format'),
+                'url': r.get('url')
+            }
+            for r in data.get('resources', [])[:3]
+        ],
+        'license_title': data.get('license_title'),
+        'metadata_created': data.get('metadata_created'),
+        'metadata_modified': data.get('metadata_modified'),
+        'url': f"{base_url}/dataset/{data.get('name')}"
+    }
+
+class CKANClient:
+    """CKAN action API client for one portal, reusing a keep-alive session across calls"""
+
+    def __init__(self, base_url: str, cache_ttl: float = 300.0, max_entries: int = 512,
+                 timeout_seconds: float = 30.0, max_connections: int = 10):
+        self.base_url = base_url.rstrip('/')
+        self.cache = ResponseCache(ttl_seconds=cache_ttl, max_entries=max_entries)
+        self.timeout = aiohttp.ClientTimeout(total=timeout_seconds)
+        self.max_connections = max_connections
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop = None
+        self.requests = 0
+        self.index: Optional[CKANCatalogIndex] = None
+
+    def _ensure_session(self) -> aiohttp.ClientSession:
+        """The shared session, recreated if it was closed or belongs to another event loop"""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_connections),
+                timeout=self.timeout
+            )
+            self._loop = loop
+        return self._session
+
+    async def action(self, name: str, params: Dict[str, Any]) -> Any:
+        """Call ``/api/3/action/<name>`` and return its ``result`` (uncached)"""
+        session = self._ensure_session()
+        self.requests += 1
+        url = f"{self.base_url}/api/3/action/{name}"
+        async with session.get(url, params=params) as response:
+            if not response.ok:
+                error_text = await response.text()
+                raise CKANError(f"CKAN API error: {response.status} {response.reason} - {error_text}")
+            payload = await response.json(content_type=None)
+        if not payload.get('success'):
+            raise CKANError(f"CKAN {name} failed: {payload.get('error')}")
+        return payload.get('result')
+
+    async def package_search(self, query: str, rows: int = 5, start: int = 0) -> Dict[str, Any]:
+        """Raw ``package_search`` result (shared with other callers; do not modify)"""
+        params = {'q': query, 'rows': rows, 'start': start}
+        key = ('package_search', normalize_query(query), rows, start)
+        return await self.cache.get_or_load(key, lambda: self.action('package_search', params))
+
+    async def package_show(self, dataset_id: str) -> Dict[str, Any]:
+        """Raw ``package_show`` result (shared with other callers; do not modify)"""
+        dataset_id = dataset_id.strip()
+        result = await self.cache.get_or_load(
+            ('package_show', dataset_id),
+            lambda: self.action('package_show', {'id': dataset_id})
+        )
+        if not result:
+            raise CKANError('Failed to retrieve dataset details from CKAN API')
+        return result
+
+    async def search_datasets(self, query: str, rows: int = 5, start: int = 0) -> Dict[str, Any]:
+        """Concise search results, with ``rows`` clamped to 1-100 and ``start`` to 0 or more"""
+        rows = min(max(1, rows), 100)
+        start = max(0, start)
+        if self.index is not None:
+            self.index.ensure_background_sync(self)
+            # Fielded Solr queries (tags:parks) keep their portal semantics
+            if self.index.ready and not is_fielded_query(query):
+                try:
+                    return await asyncio.to_thread(self.index.search, query, rows, start)
+                except sqlite3.Error as e:
+                    print(f"⚠️ CKAN index search failed, querying the portal: {e}", file=sys.stderr)
+        return summarize_search(await self.package_search(query, rows, start) or {})
+
+    async def dataset_details(self, dataset_id: str) -> Dict[str, Any]:
+        """Essential details of one dataset"""
+        return summarize_dataset(await self.package_show(dataset_id), self.base_url)
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def stats(self) -> Dict[str, Any]:
+        stats = {"base_url": self.base_url, "requests": self.requests, "cache": self.cache.stats()}
+        if self.index is not None:
+            stats["index"] = self.index.stats()
+        return stats
+
+_clients: Dict[str, CKANClient] = {}
+
+def get_ckan_client(base_url: Optional[str] = None) -> CKANClient:
+    """Shared client for a CKAN portal (the default portal when no URL is given)"""
+    resolved = (base_url or DEFAULT_CKAN_BASE_URL).rstrip('/')
+    client = _clients.get(resolved)
+    if client is None:
+        client = _clients[resolved] = CKANClient(
+            resolved,
+            cache_ttl=float(os.environ.get('CKAN_CACHE_TTL', '300')),
+            timeout_seconds=float(os.environ.get('CKAN_TIMEOUT', '30'))
+        )
+        # Optional local full-text index of the catalog, kept fresh by a background sync
+        if os.environ.get('CKAN_INDEX', 'false').lower() == 'true':
+            client.index = CKANCatalogIndex(
+                index_path(resolved, os.environ.get('CKAN_INDEX_DIR') or None),
+                sync_interval=float(os.environ.get('CKAN_INDEX_SYNC_INTERVAL', '900')),
+                full_sync_interval=float(os.environ.get('CKAN_INDEX_FULL_SYNC_INTERVAL', '86400'))
+            )
+    return client
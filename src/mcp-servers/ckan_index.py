@@ -0,0 +1,262 @@
+"""Local SQLite FTS5 index of a CKAN catalog
+
+A background task pages through the portal's whole catalog with
+``package_search`` and stores each dataset's title, description, tags,
+organization and resource formats in an FTS5 table. Later syncs only fetch
+datasets whose ``metadata_modified`` is at or after the newest one already
+indexed; a periodic full sync also drops datasets removed from the portal.
+Searches are answered locally with BM25 ranking instead of a live
+``package_search`` round trip capped at 100 rows.
+"""
+
+import asyncio
+import hashlib
+import os
+import re
+import sqlite3
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+DEFAULT_INDEX_DIR = os.path.join(os.path.expanduser("~"), ".cache", "opengov-mcp")
+
+# Datasets requested per package_search page while syncing
+SYNC_PAGE_SIZE = 1000
+
+# BM25 column weights: title, notes, tags, organization, formats
+BM25_WEIGHTS = (10.0, 1.0, 5.0, 3.0, 2.0)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS datasets (
+    pk INTEGER PRIMARY KEY,
+    id TEXT UNIQUE NOT NULL,
+    name TEXT,
+    title TEXT,
+    notes TEXT,
+    organization_title TEXT,
+    metadata_modified TEXT
+);
+-- Rows share their rowid with the datasets table (pk, stable across VACUUM)
+CREATE VIRTUAL TABLE IF NOT EXISTS datasets_fts USING fts5(
+    title, notes, tags, organization, formats, tokenize = 'porter unicode61'
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+def index_path(base_url: str, index_dir: Optional[str] = None) -> str:
+    """Index file for one CKAN portal"""
+    key = hashlib.sha256(base_url.rstrip("/").encode("utf-8")).hexdigest()[:16]
+    return os.path.join(os.path.expanduser(index_dir) if index_dir else DEFAULT_INDEX_DIR, f"ckan_index_{key}.sqlite3")
+
+def _solr_date(metadata_modified: str) -> str:
+    """``metadata_modified`` as a Solr date, truncated to seconds (syncs are idempotent)"""
+    return metadata_modified[:19] + "Z"
+
+def is_fielded_query(query: Optional[str]) -> bool:
+    """Whether ``query`` uses Solr field syntax (``tags:parks``), which only the portal can answer"""
+    return ":" in (query or "").replace("*:*", "")
+
+def _match_expression(query: str, operator: str) -> Optional[str]:
+    """FTS5 query of the words in ``query`` (quoted, so user text cannot inject FTS syntax)"""
+    words = re.findall(r"\w+", query or "")
+    if not words:
+        return None
+    return f" {operator} ".join(f'"{word}"' for word in words)
+
+class CKANCatalogIndex:
+    """FTS5 index of one CKAN portal's datasets, synced incrementally by ``metadata_modified``"""
+
+    def __init__(self, path: str, sync_interval: float = 900.0, full_sync_interval: float = 86400.0):
+        self.path = path
+        self.sync_interval = sync_interval
+        self.full_sync_interval = full_sync_interval
+        self.syncs = 0
+        self._ready = False
+        self.last_error: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._connect() as connection:
+            connection.executescript(SCHEMA)
+            # Checked once here and set by each sync, so searches never wait on SQLite for it
+            self._ready = self._state(connection, "last_sync") is not None
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """A connection per call (syncs run in worker threads), committed and closed on exit"""
+        connection = sqlite3.connect(self.path, timeout=30)
+        try:
+            # Readers are not blocked while a sync writes
+            connection.execute("PRAGMA journal_mode=WAL")
+            yield connection
+            connection.commit()
+        finally:
+            connection.close()
+
+    def _state(self, connection: sqlite3.Connection, key: str) -> Optional[str]:
+        row = connection.execute("SELECT value FROM sync_state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    @property
+    def ready(self) -> bool:
+        """Whether a sync has completed, so searches can be answered locally"""
+        return self._ready
+
+    def upsert(self, datasets: List[Dict[str, Any]]) -> None:
+        """Add or replace datasets from ``package_search`` results"""
+        with self._connect() as connection:
+            for dataset in datasets:
+                dataset_id = dataset.get("id")
+                if not dataset_id:
+                    continue
+                organization = (dataset.get("organization") or {}).get("title")
+                # Upsert keeps the dataset's rowid, which keys its full-text row
+                connection.execute(
+                    "INSERT INTO datasets (id, name, title, notes, organization_title, metadata_modified) "
+                    "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT(id) DO UPDATE SET name = excluded.name, "
+                    "title = excluded.title, notes = excluded.notes, "
+                    "organization_title = excluded.organization_title, metadata_modified = excluded.metadata_modified",
+                    (dataset_id, dataset.get("name"), dataset.get("title"), dataset.get("notes"),
+                     organization, dataset.get("metadata_modified"))
+                )
+                rowid = connection.execute("SELECT rowid FROM datasets WHERE id = ?", (dataset_id,)).fetchone()[0]
+                connection.execute("DELETE FROM datasets_fts WHERE rowid = ?", (rowid,))
+                connection.execute(
+                    "INSERT INTO datasets_fts (rowid, title, notes, tags, organization, formats) VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        rowid,
+                        dataset.get("title") or "",
+                        dataset.get("notes") or "",
+                        " ".join(tag.get("display_name") or tag.get("name") or "" for tag in dataset.get("tags") or []),
+                        organization or "",
+                        " ".join({(r.get("format") or "").lower() for r in dataset.get("resources") or []})
+                    )
+                )
+
+    def remove_missing(self, seen_ids: set) -> int:
+        """Drop datasets a full sync did not see (deleted or made private on the portal)"""
+        with self._connect() as connection:
+            stale = [rowid for rowid, dataset_id in connection.execute("SELECT rowid, id FROM datasets")
+                     if dataset_id not in seen_ids]
+            for rowid in stale:
+                connection.execute("DELETE FROM datasets WHERE rowid = ?", (rowid,))
+                connection.execute("DELETE FROM datasets_fts WHERE rowid = ?", (rowid,))
+        return len(stale)
+
+    def _sync_plan(self) -> Dict[str, Any]:
+        with self._connect() as connection:
+            watermark = connection.execute("SELECT MAX(metadata_modified) FROM datasets").fetchone()[0]
+            last_full = float(self._state(connection, "last_full_sync") or 0)
+        full = watermark is None or time.time() - last_full > self.full_sync_interval
+        return {"full": full, "watermark": None if full else watermark}
+
+    def _finish_sync(self, full: bool) -> None:
+        with self._connect() as connection:
+            now = str(time.time())
+            connection.execute("INSERT OR REPLACE INTO sync_state VALUES ('last_sync', ?)", (now,))
+            if full:
+                connection.execute("INSERT OR REPLACE INTO sync_state VALUES ('last_full_sync', ?)", (now,))
+        self._ready = True
+
+    async def sync(self, client, full: Optional[bool] = None) -> Dict[str, Any]:
+        """Page ``package_search`` into the index; incremental unless a full sync is due or forced"""
+        started = time.monotonic()
+        plan = await asyncio.to_thread(self._sync_plan)
+        if full is not None:
+            plan = {"full": full, "watermark": None if full else plan["watermark"]}
+
+        params = {"q": "*:*", "sort": "metadata_modified asc", "rows": SYNC_PAGE_SIZE}
+        if plan["watermark"]:
+            params["fq"] = f"metadata_modified:[{_solr_date(plan['watermark'])} TO *]"
+
+        seen_ids = set()
+        start = 0
+        while True:
+            result = await client.action("package_search", dict(params, start=start))
+            datasets = result.get("results") or []
+            await asyncio.to_thread(self.upsert, datasets)
+            seen_ids.update(dataset.get("id") for dataset in datasets)
+            start += len(datasets)
+            if not datasets or start >= result.get("count", 0):
+                break
+
+        removed = await asyncio.to_thread(self.remove_missing, seen_ids) if plan["full"] else 0
+        await asyncio.to_thread(self._finish_sync, plan["full"])
+        self.syncs += 1
+        return {
+            "full": plan["full"],
+            "fetched": start,
+            "removed": removed,
+            "elapsed_seconds": round(time.monotonic() - started, 3)
+        }
+
+    def ensure_background_sync(self, client) -> None:
+        """Start the periodic sync task on the running loop if it is not already running"""
+        if self._task is not None and not self._task.done() and self._task.get_loop() is asyncio.get_running_loop():
+            return
+        self._task = asyncio.get_running_loop().create_task(self._sync_forever(client))
+
+    async def _sync_forever(self, client) -> None:
+        while True:
+            try:
+                summary = await self.sync(client)
+                self.last_error = None
+                print(f"🔍 CKAN index sync ({'full' if summary['full'] else 'incremental'}): "
+                      f"{summary['fetched']} datasets in {summary['elapsed_seconds']}s", file=sys.stderr)
+            except Exception as e:
+                self.last_error = str(e)
+                print(f"⚠️ CKAN index sync failed: {e}", file=sys.stderr)
+            await asyncio.sleep(self.sync_interval)
+
+    def search(self, query: str, rows: int = 5, start: int = 0) -> Dict[str, Any]:
+        """BM25-ranked matches in ``summarize_search`` form: all words first, any word as a fallback"""
+        with self._connect() as connection:
+            for operator in ("AND", "OR"):
+                expression = _match_expression(query, operator)
+                if expression is None:
+                    # No words (e.g. "*:*"): list everything, most recently modified first
+                    count = connection.execute("SELECT COUNT(*) FROM datasets").fetchone()[0]
+                    found = connection.execute(
+                        "SELECT id, title, notes, organization_title FROM datasets "
+                        "ORDER BY metadata_modified DESC LIMIT ? OFFSET ?", (rows, start)
+                    ).fetchall()
+                    break
+                count = connection.execute(
+                    "SELECT COUNT(*) FROM datasets_fts WHERE datasets_fts MATCH ?", (expression,)
+                ).fetchone()[0]
+                if count:
+                    found = connection.execute(
+                        "SELECT d.id, d.title, d.notes, d.organization_title FROM datasets_fts "
+                        "JOIN datasets d ON d.rowid = datasets_fts.rowid WHERE datasets_fts MATCH ? "
+                        f"ORDER BY bm25(datasets_fts, {', '.join(map(str, BM25_WEIGHTS))}) LIMIT ? OFFSET ?",
+                        (expression, rows, start)
+                    ).fetchall()
+                    break
+            else:
+                count, found = 0, []
+
+        results = []
+        for dataset_id, title, notes, organization_title in found:
+            notes = notes or "No description available."
+            results.append({
+                "id": dataset_id,
+                "title": title,
+                "notes": notes[:150] + ("..." if len(notes) > 150 else ""),
+                "organization_title": organization_title
+            })
+        return {"count": count, "results": results, "source": "local_index"}
+
+    def stats(self) -> Dict[str, Any]:
+        with self._connect() as connection:
+            datasets = connection.execute("SELECT COUNT(*) FROM datasets").fetchone()[0]
+            last_sync = self._state(connection, "last_sync")
+        return {
+            "path": self.path,
+            "datasets": datasets,
+            "last_sync": float(last_sync) if last_sync else None,
+            "syncs": self.syncs,
+            "last_error": self.last_error
+        }
@@ -0,0 +1,160 @@
+"""
+Pooled HTTP transport for GraphQL requests
+
+One keep-alive ``aiohttp`` session is shared by every request instead of a
+new session (and TCP/TLS handshake) per query. A limiter caps the requests
+in flight; callers beyond it wait in a bounded queue, and once the queue is
+full new requests are turned away at once so the endpoint is not hammered
+by a burst of parallel tool calls. Requests time out individually, and
+transient failures (502/503/504, 429, connection errors, timeouts) are
+retried with exponential backoff when the request is safe to repeat.
+"""
+
+import asyncio
+import random
+import time
+from typing import Any, Dict, Optional
+
+import aiohttp
+
+RETRY_STATUSES = (429, 502, 503, 504)
+
+class PooledGraphQLTransport:
+    """Shared keep-alive session with a max-in-flight limiter, timeouts and retries"""
+
+    def __init__(self, max_connections: int = 10, max_in_flight: int = 8, max_queue: int = 100,
+                 timeout_seconds: float = 60.0, connect_timeout_seconds: float = 10.0,
+                 max_retries: int = 2, backoff_seconds: float = 0.5, keepalive_seconds: float = 30.0):
+        self.max_connections = max_connections
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_queue = max_queue
+        self.timeout = aiohttp.ClientTimeout(total=timeout_seconds, connect=connect_timeout_seconds)
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.keepalive_seconds = keepalive_seconds
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop = None
+        self.in_flight = 0
+        self.queued = 0
+        self.max_queued = 0
+        self.requests = 0
+        self.rejected = 0
+        self.retries = 0
+        self.timeouts = 0
+        self.failures = 0
+        self.sessions_created = 0
+        self._wait_seconds = 0.0
+        self._request_seconds = 0.0
+
+    def _ensure_session(self) -> aiohttp.ClientSession:
+        """The shared session, recreated if it was closed or belongs to another event loop"""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            connector = aiohttp.TCPConnector(limit=self.max_connections, keepalive_timeout=self.keepalive_seconds)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+            self._loop = loop
+            self.sessions_created += 1
+        return self._session
+
+    def _backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), 30.0)
+        return self.backoff_seconds * (2 ** attempt) * (0.5 + random.random())
+
+    async def post_json(self, url: str, payload: Dict[str, Any], headers: Dict[str, str],
+                        retry: bool = True) -> Dict:
+        """POST ``payload`` and return the decoded JSON body, or a dict with an ``error`` key.
+
+        With ``retry=False`` (mutations) a request is sent at most once.
+        """
+        session = self._ensure_session()
+        if self.queued >= self.max_queue and self._semaphore.locked():
+            self.rejected += 1
+            return {
+                "error": "Too many concurrent FIN requests; try again shortly",
+                "queued_requests": self.queued,
+                "endpoint": url
+            }
+
+        self.queued += 1
+        self.max_queued = max(self.max_queued, self.queued)
+        queued_at = time.monotonic()
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.queued -= 1
+        self._wait_seconds += time.monotonic() - queued_at
+
+        self.in_flight += 1
+        started = time.monotonic()
+        try:
+            return await self._post_with_retries(session, url, payload, headers, retry)
+        finally:
+            self.in_flight -= 1
+            self._request_seconds += time.monotonic() - started
+            self.requests += 1
+            self._semaphore.release()
+
+    async def _post_with_retries(self, session: aiohttp.ClientSession, url: str, payload: Dict[str, Any],
+                                 headers: Dict[str, str], retry: bool) -> Dict:
+        attempts = self.max_retries + 1 if retry else 1
+        for attempt in range(attempts):
+            last_attempt = attempt == attempts - 1
+            try:
+                async with session.post(url, headers=headers, json=payload) as response:
+                    if response.status in RETRY_STATUSES and not last_attempt:
+                        self.retries += 1
+                        delay = self._backoff(attempt, response.headers.get("Retry-After"))
+                    elif response.status >= 400:
+                        self.failures += 1
+                        return {
+                            "error": f"GraphQL request failed with status {response.status}",
+                            "status": response.status,
+                            "details": await response.text(),
+                            "endpoint": url
+                        }
+                    else:
+                        return await response.json(content_type=None)
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                if last_attempt:
+                    self.failures += 1
+                    return {"error": f"GraphQL request timed out after {self.timeout.total}s", "endpoint": url}
+                self.retries += 1
+                delay = self._backoff(attempt)
+            except aiohttp.ClientConnectionError as e:
+                if last_attempt:
+                    self.failures += 1
+                    return {"error": f"GraphQL request failed: {e}", "endpoint": url}
+                self.retries += 1
+                delay = self._backoff(attempt)
+            await asyncio.sleep(delay)
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool, queue and retry counters for the stats tool"""
+        connector = self._session.connector if self._session is not None and not self._session.closed else None
+        return {
+            "max_connections": self.max_connections,
+            "max_in_flight": self.max_in_flight,
+            "max_queue": self.max_queue,
+            "timeout_seconds": self.timeout.total,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "max_queued": self.max_queued,
+            "requests": self.requests,
+            "rejected": self.rejected,
+            "retries": self.retries,
+            "timeouts": self.timeouts,
+            "failures": self.failures,
+            "sessions_created": self.sessions_created,
+            "session_open": connector is not None,
+            "avg_queue_wait_ms": round(self._wait_seconds / self.requests * 1000, 2) if self.requests else 0.0,
+            "avg_request_ms": round(self._request_seconds / self.requests * 1000, 2) if self.requests else 0.0
+        }
@@ -0,0 +1,137 @@
+"""
+Production HTTP serving for the OpenGov MCP servers
+
+Runs a server's streamable HTTP app under uvicorn with multiple worker
+processes, an optional uvloop event loop, tuned keep-alive and request limits
+and a graceful drain on shutdown. The app is stateless (no MCP session
+affinity), so any worker can answer any request from any LangGraph thread.
+Every worker imports the server module itself and warms its own clients and
+caches before it starts accepting requests.
+"""
+
+import importlib.util
+import os
+from typing import Any, Awaitable, Callable, NamedTuple, Optional
+
+Warmup = Callable[[], Awaitable[Any]]
+
+class HTTPServingConfig(NamedTuple):
+    """uvicorn settings for the production HTTP mode"""
+    host: str = "127.0.0.1"
+    port: int = 8000
+    workers: int = 1
+    loop: str = "auto"
+    timeout_keep_alive: int = 30
+    limit_concurrency: Optional[int] = None
+    limit_max_requests: Optional[int] = None
+    timeout_graceful_shutdown: int = 30
+    backlog: int = 2048
+    log_level: str = "info"
+    access_log: bool = False
+
+def _optional_int(name: str) -> Optional[int]:
+    value = os.getenv(name)
+    return int(value) if value else None
+
+def get_http_config() -> HTTPServingConfig:
+    """Read the HTTP serving configuration from environment variables"""
+    return HTTPServingConfig(
+        host=os.getenv("MCP_HTTP_HOST", "127.0.0.1"),
+        port=int(os.getenv("MCP_HTTP_PORT", "8000")),
+        workers=int(os.getenv("MCP_HTTP_WORKERS", str(min(os.cpu_count() or 1, 4)))),
+        loop=os.getenv("MCP_HTTP_LOOP", "auto").lower(),
+        timeout_keep_alive=int(os.getenv("MCP_HTTP_KEEP_ALIVE", "30")),
+        limit_concurrency=_optional_int("MCP_HTTP_LIMIT_CONCURRENCY"),
+        limit_max_requests=_optional_int("MCP_HTTP_LIMIT_MAX_REQUESTS"),
+        timeout_graceful_shutdown=int(os.getenv("MCP_HTTP_GRACEFUL_TIMEOUT", "30")),
+        backlog=int(os.getenv("MCP_HTTP_BACKLOG", "2048")),
+        log_level=os.getenv("MCP_HTTP_LOG_LEVEL", "info").lower(),
+        access_log=os.getenv("MCP_HTTP_ACCESS_LOG", "false").lower() == "true"
+    )
+
+def _resolve_loop(loop: str) -> str:
+    """Use uvloop when requested and installed, otherwise the asyncio loop"""
+    if loop == "uvloop" and importlib.util.find_spec("uvloop") is None:
+        print("⚠️ uvloop is not installed, falling back to the asyncio event loop")
+        return "asyncio"
+    return loop
+
+class _WarmupLifespan:
+    """ASGI wrapper that runs a warm-up coroutine once the app's own startup completed.
+
+    The worker only reports startup complete (and starts accepting requests)
+    after the warm-up finished. Warm-up failures are logged and do not stop
+    the worker; the first request simply pays the cold start instead.
+    """
+
+    def __init__(self, app, warmup: Warmup):
+        self.app = app
+        self.warmup = warmup
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "lifespan":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_after_warmup(message):
+            if message["type"] == "lifespan.startup.complete":
+                try:
+                    await self.warmup()
+                    print(f"🔥 Worker {os.getpid()} warmed up")
+                except Exception as e:
+                    print(f"⚠️ Worker {os.getpid()} warm-up failed: {e}")
+            await send(message)
+
+        await self.app(scope, receive, send_after_warmup)
+
+def build_http_app(mcp, warmup: Optional[Warmup] = None):
+    """Build a stateless streamable HTTP ASGI app for a FastMCP server.
+
+    Supports both the standalone ``fastmcp`` package and ``mcp.server.fastmcp``.
+    """
+    if hasattr(mcp, "http_app"):
+        app = mcp.http_app(stateless_http=True)
+    else:
+        mcp.settings.stateless_http = True
+        app = mcp.streamable_http_app()
+
+    if warmup is None:
+        return app
+    return _WarmupLifespan(app, warmup)
+
+def serve(server_file: str, factory_name: str = "create_http_app",
+          config: Optional[HTTPServingConfig] = None) -> None:
+    """Serve the app built by ``factory_name`` in ``server_file`` with uvicorn.
+
+    Multiple workers need an import string rather than an app object, so each
+    worker imports the server module from its own directory and calls the
+    factory to build (and warm) its own app.
+    """
+    import uvicorn
+
+    config = config or get_http_config()
+    server_dir, server_name = os.path.split(os.path.abspath(server_file))
+    module_name = os.path.splitext(server_name)[0]
+    loop = _resolve_loop(config.loop)
+
+    print(f"Starting {module_name} on http://{config.host}:{config.port}/mcp "
+          f"({config.workers} worker(s), loop={loop}, keep-alive={config.timeout_keep_alive}s)")
+
+    uvicorn.run(
+        f"{module_name}:{factory_name}",
+        factory=True,
+        app_dir=server_dir,
+        host=config.host,
+        port=config.port,
+        workers=config.workers,
+        loop=loop,
+        http="auto",
+        lifespan="on",
+        timeout_keep_alive=config.timeout_keep_alive,
+        limit_concurrency=config.limit_concurrency,
+        limit_max_requests=config.limit_max_requests,
+        timeout_graceful_shutdown=config.timeout_graceful_shutdown,
+        backlog=config.backlog,
+        log_level=config.log_level,
+        access_log=config.access_log
+    )
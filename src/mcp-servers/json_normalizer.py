@@ -5,16 +5,208 @@ JSON Normalizer for GraphQL Responses
 This module provides utilities to normalize and truncate large JSON responses
 from GraphQL queries to prevent context length overflow while preserving
 important information.
+
+Sizes are estimated incrementally and stop counting once the limit is passed.
+Data responses are flattened in a single pass: the first rows feed the sample
+and column types, while every row feeds compact per-column profiles (nulls,
+distinct values, numeric min/max/sum/mean, top values), so quantitative
+questions about a truncated result can still be answered from the summary.
+Rows are split into per-column value lists in Python; numeric statistics are
+then computed with NumPy when it is installed. Profiles are shrunk (top values
+dropped, then fewer columns) or left out so the summary stays within
+``max_response_size``.
 """
 
 import json
-from typing import Dict, Any, List, Optional, Union
-import pandas as pd
+from collections import Counter
+from typing import Dict, Any, Iterator, List, Optional, Union
+
+def _json_size_chunks(value: Any) -> Iterator[int]:
+    """Yield the serialized length of ``value`` piece by piece, in document order"""
+    if isinstance(value, str):
+        yield len(value) + 2
+    elif value is None or value is True:
+        yield 4
+    elif value is False:
+        yield 5
+    elif isinstance(value, (int, float)):
+        yield len(repr(value))
+    elif isinstance(value, dict):
+        # Braces, then '"key": value' with a ", " separator before all but the first
+        yield 2
+        for index, (key, item) in enumerate(value.items()):
+            yield len(str(key)) + 4 + (2 if index else 0)
+            yield from _json_size_chunks(item)
+    elif isinstance(value, (list, tuple)):
+        yield 2
+        for index, item in enumerate(value):
+            if index:
+                yield 2
+            yield from _json_size_chunks(item)
+    else:
+        yield len(str(value)) + 2
+
+def estimate_json_size(value: Any, limit: Optional[int] = None) -> int:
+    """
+    Approximate ``len(json.dumps(value, default=str))`` without building the string.
+    
+    With ``limit`` set, counting stops as soon as the size exceeds it, so checking
+    a huge response against a small limit only walks the first few kilobytes.
+    """
+    size = 0
+    for chunk in _json_size_chunks(value):
+        size += chunk
+        if limit is not None and size > limit:
+            break
+    return size
+
+def flatten_record(record: Dict[str, Any], max_level: Optional[int] = None,
+                   prefix: str = "", level: int = 0) -> Dict[str, Any]:
+    """Flatten nested objects into dotted keys (``vendor.name``), like pandas.json_normalize"""
+    flat = {}
+    for key, value in record.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict) and value and (max_level is None or level < max_level):
+            flat.update(flatten_record(value, max_level, f"{name}.", level + 1))
+        else:
+            flat[name] = value
+    return flat
+
+# Nesting depth flattened into dotted column names for result rows
+ROW_FLATTEN_LEVEL = 2
+
+def flatten_row(row: Any) -> Dict[str, Any]:
+    """One result row as flat columns; scalar rows become a single ``value`` column"""
+    return flatten_record(row, max_level=ROW_FLATTEN_LEVEL) if isinstance(row, dict) else {"value": row}
+
+def extract_rows(data: Dict[str, Any]) -> List[Any]:
+    """
+    The records of a GraphQL ``data`` object.
+    
+    A single root field holding a list or a connection (``edges``/``nodes``)
+    yields its items; anything else is treated as one record.
+    """
+    if len(data) == 1:
+        value = next(iter(data.values()))
+        if isinstance(value, list):
+            return value
+        if isinstance(value, dict):
+            if isinstance(value.get("edges"), list):
+                return [edge.get("node", edge) if isinstance(edge, dict) else edge for edge in value["edges"]]
+            if isinstance(value.get("nodes"), list):
+                return value["nodes"]
+    return [data]
+
+def _column_type(types: set) -> str:
+    """Column type name in pandas' dtype vocabulary"""
+    present = types - {type(None)}
+    if present == {bool} and type(None) not in types:
+        return "bool"
+    if present == {int} and type(None) not in types:
+        return "int64"
+    if present and present <= {int, float}:
+        return "float64"
+    if present == {str}:
+        return "str"
+    return "object"
+
+# Columns profiled per response and most frequent values listed per column
+PROFILE_MAX_COLUMNS = 40
+PROFILE_TOP_VALUES = 3
+
+def _numpy():
+    """NumPy if installed (imported on first use to keep server start-up light)"""
+    try:
+        import numpy
+        return numpy
+    except ImportError:
+        return None
+
+def _round(value: float) -> Union[int, float]:
+    return int(value) if float(value).is_integer() and abs(value) < 2 ** 53 else round(float(value), 4)
+
+def _numeric_profile(values: List[Union[int, float]]) -> Dict[str, Any]:
+    np = _numpy()
+    if np is None:
+        total = sum(values)
+        return {"distinct": len(set(values)), "min": _round(min(values)), "max": _round(max(values)),
+                "sum": _round(total), "mean": _round(total / len(values))}
+    array = np.asarray(values, dtype=np.float64)
+    finite = array[np.isfinite(array)]
+    if not finite.size:
+        return {"distinct": int(np.unique(array).size)}
+    total = finite.sum()
+    return {
+        "distinct": int(np.unique(array).size),
+        "min": _round(finite.min()),
+        "max": _round(finite.max()),
+        "sum": _round(total),
+        "mean": _round(total / finite.size)
+    }
+
+def _top_values(values: List[Any], distinct: int) -> List[List[Any]]:
+    """Most frequent values as ``[value, count]`` pairs (omitted when every value is unique)"""
+    if distinct >= len(values):
+        return []
+    return [[value[:40] if isinstance(value, str) else value, count]
+            for value, count in Counter(values).most_common(PROFILE_TOP_VALUES)]
+
+def profile_columns(rows: List[Dict[str, Any]], max_columns: int = PROFILE_MAX_COLUMNS,
+                    omitted: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Compact profile of each flat column over all ``rows``.
+    
+    Every column gets its ``type`` and ``nulls`` count; numeric columns add
+    ``distinct``, ``min``, ``max``, ``sum`` and ``mean``; text and boolean
+    columns add ``distinct`` and their ``top`` values. Nested values are only
+    counted. At most ``max_columns`` columns are profiled; the names of the
+    others are appended to ``omitted`` when a list is given.
+    """
+    present: Dict[str, List[Any]] = {}
+    skipped: Dict[str, None] = {}
+    for row in rows:
+        for column, value in row.items():
+            values = present.get(column)
+            if values is None:
+                if len(present) >= max_columns:
+                    skipped[column] = None
+                    continue
+                values = present[column] = []
+            if value is not None:
+                values.append(value)
+    if omitted is not None:
+        omitted.extend(skipped)
+    
+    profiles = {}
+    total = len(rows)
+    for column, values in present.items():
+        types = {type(value) for value in values}
+        if not values:
+            kind = "null"
+        elif types <= {int, float}:
+            kind = "number"
+        elif types <= {str, bool}:
+            kind = "boolean" if types == {bool} else "string"
+        else:
+            kind = "object"
+        
+        profile: Dict[str, Any] = {"type": kind, "nulls": total - len(values)}
+        if kind == "number":
+            profile.update(_numeric_profile(values))
+        elif kind in ("string", "boolean"):
+            profile["distinct"] = len(set(values))
+        # Top values for text and for numbers with only a few distinct values (codes, years)
+        if kind in ("string", "boolean") or (kind == "number" and profile["distinct"] <= PROFILE_TOP_VALUES * 2):
+            top = _top_values(values, profile["distinct"])
+            if top:
+                profile["top"] = top
+        profiles[column] = profile
+    return profiles
 
 class GraphQLResponseNormalizer:
     """
-    Normalizes GraphQL responses using pandas.json_normalize to manage context length
-    and improve readability of complex nested structures.
+    Normalizes GraphQL responses by flattening nested records and capping list
+    sizes to manage context length and improve readability of complex nested structures.
     """
     
     def __init__(self, max_response_size: int = 10000, max_items: int = 100):
@@ -40,9 +232,8 @@ class GraphQLResponseNormalizer:
             Dict: Normalized response with manageable size
         """
         try:
-            # Check if response is already small enough
-            response_str = json.dumps(response, default=str)
-            if len(response_str) <= self.max_response_size:
+            # Check if response is already small enough (stops counting past the limit)
+            if estimate_json_size(response, self.max_response_size) <= self.max_response_size:
                 return response
             
             # Handle different types of GraphQL responses
@@ -70,25 +261,42 @@ class GraphQLResponseNormalizer:
         }
         
         data = response.get("data", {})
+        profiles: Dict[str, Dict[str, Any]] = {}
+        unprofiled: List[str] = []
         
-        # Use pandas.json_normalize to flatten the data structure
+        # Flatten the records in one pass, stopping at the item cap
         try:
             if isinstance(data, dict) and data:
-                # Normalize the data structure
-                df = pd.json_normalize(data, max_level=2)
+                rows = extract_rows(data)
+                total = len(rows)
+                columns: Dict[str, set] = {}
+                sample_data = []
                 
-                # Limit the number of rows
-                if len(df) > self.max_items:
-                    df = df.head(self.max_items)
-                    normalized["truncation_note"] = f"Showing first {self.max_items} items of {len(pd.json_normalize(data, max_level=2))} total"
+                flat_rows = [flatten_row(row) for row in rows]
+                for index, flat in enumerate(flat_rows[:self.max_items]):
+                    if index < 10:
+                        sample_data.append(flat)
+                    for column in columns:
+                        if column not in flat:
+                            columns[column].add(type(None))
+                    for column, value in flat.items():
+                        if column not in columns:
+                            # Rows before this one lacked the column
+                            columns[column] = {type(None)} if index else set()
+                        columns[column].add(type(value))
+                
+                if total > self.max_items:
+                    normalized["truncation_note"] = f"Showing first {self.max_items} items of {total} total"
                 
-                # Convert back to dict format but flattened
                 normalized["data_summary"] = {
-                    "columns": list(df.columns),
-                    "row_count": len(df),
-                    "sample_data": df.head(10).to_dict('records') if len(df) > 0 else [],
-                    "data_types": df.dtypes.astype(str).to_dict() if len(df) > 0 else {}
+                    "columns": list(columns),
+                    "row_count": min(total, self.max_items),
+                    "sample_data": sample_data,
+                    "data_types": {column: _column_type(types) for column, types in columns.items()},
+                    # Profiles cover every row, including those beyond the sample and item cap
+                    "profiled_rows": total
                 }
+                profiles = profile_columns(flat_rows, omitted=unprofiled)
                 
                 # Add original keys for reference
                 normalized["original_keys"] = list(data.keys())
@@ -107,25 +315,57 @@ class GraphQLResponseNormalizer:
             normalized["errors"] = response["errors"]
         if "query_info" in response:
             normalized["query_info"] = response["query_info"]
-            
+        if "query_cost" in response:
+            normalized["query_cost"] = response["query_cost"]
+        
+        if profiles:
+            self._fit_profiles(normalized["data_summary"], normalized, profiles, unprofiled)
         return normalized
     
+    def _fit_profiles(self, summary: Dict[str, Any], normalized: Dict[str, Any],
+                      profiles: Dict[str, Dict[str, Any]], unprofiled: List[str]) -> None:
+        """Add the largest form of the column profiles that keeps ``normalized`` within the size limit.
+        
+        Tries every profile as computed, then without ``top`` values, then the
+        first half, quarter, ... of the columns; columns left out are listed in
+        ``unprofiled_columns``.
+        """
+        limit = self.max_response_size
+        without_top = {column: {key: value for key, value in profile.items() if key != "top"}
+                       for column, profile in profiles.items()}
+        candidates = [profiles, without_top]
+        count = len(profiles) // 2
+        while count:
+            candidates.append(dict(list(without_top.items())[:count]))
+            count //= 2
+        
+        for candidate in candidates:
+            summary["column_profiles"] = candidate
+            left_out = unprofiled + [column for column in profiles if column not in candidate]
+            if left_out:
+                summary["unprofiled_columns"] = left_out
+            if estimate_json_size(normalized, limit) <= limit:
+                if candidate is not profiles:
+                    summary["profile_note"] = "Column profiles were shortened to fit the response size limit"
+                return
+        
+        del summary["column_profiles"]
+        summary["unprofiled_columns"] = unprofiled + list(profiles)
+        summary["profile_note"] = "Column profiles were left out to fit the response size limit"
+    
     def _normalize_types_response(self, response: Dict[str, Any], context: str) -> Dict[str, Any]:
         """Normalize GraphQL schema types responses."""
         types = response.get("types", [])
         
-        # Use pandas to analyze the types
         if types:
-            df = pd.json_normalize(types)
-            
             # Group by kind for better organization
             type_summary = {}
-            if 'kind' in df.columns:
-                type_counts = df['kind'].value_counts().to_dict()
+            if any(isinstance(t, dict) and "kind" in t for t in types):
+                type_counts = Counter(t.get("kind") for t in types if isinstance(t, dict) and "kind" in t)
                 type_summary = {
-                    "total_types": len(df),
-                    "types_by_kind": type_counts,
-                    "sample_types": df.head(20).to_dict('records')
+                    "total_types": len(types),
+                    "types_by_kind": dict(type_counts.most_common()),
+                    "sample_types": [flatten_record(t) for t in types[:20]]
                 }
             else:
                 type_summary = {
@@ -152,9 +392,6 @@ class GraphQLResponseNormalizer:
         operations = response.get("query_operations", [])
         
         if operations:
-            # Use pandas to analyze operations
-            df = pd.json_normalize(operations)
-            
             # Limit operations shown
             if len(operations) > self.max_items:
                 operations = operations[:self.max_items]
@@ -208,16 +445,15 @@ class GraphQLResponseNormalizer:
     def _generic_normalize(self, response: Dict[str, Any], context: str) -> Dict[str, Any]:
         """Generic normalization for unknown response types."""
         try:
-            # Use pandas.json_normalize for general flattening
-            df = pd.json_normalize(response, max_level=1)
+            flattened = flatten_record(response, max_level=1)
             
             return {
                 "context": f"Generic response (normalized)",
                 "summary": {
                     "original_keys": list(response.keys()),
-                    "flattened_columns": list(df.columns) if len(df) > 0 else [],
-                    "data_preview": df.head(5).to_dict('records') if len(df) > 0 else {},
-                    "size_info": f"Original: ~{len(json.dumps(response, default=str))} chars"
+                    "flattened_columns": list(flattened),
+                    "data_preview": [flattened] if flattened else {},
+                    "size_info": f"Original: ~{estimate_json_size(response)} chars"
                 },
                 "truncation_applied": True
             }
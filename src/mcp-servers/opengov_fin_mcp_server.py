@@ -8,16 +8,99 @@ Based on the mcp-graphql approach: https://github.com/blurrah/mcp-graphql
 """
 
 import os
+import re
+import sys
 import json
 import asyncio
-import aiohttp
 from typing import Dict, List, Any, Optional, Union
 from mcp.server import FastMCP
+from mcp.server.fastmcp import Context
 from dotenv import load_dotenv
 
+# Production HTTP serving helpers (sibling module when run as a script)
+try:
+    from .http_serving import build_http_app, serve
+except ImportError:
+    from http_serving import build_http_app, serve
+
+# Pooled keep-alive transport with a concurrency limit (sibling module when run as a script)
+try:
+    from .http_pool import PooledGraphQLTransport
+except ImportError:
+    from http_pool import PooledGraphQLTransport
+
+# Persistent introspection cache (sibling module when run as a script)
+try:
+    from .schema_cache import SchemaDiskCache, schema_hash
+except ImportError:
+    from schema_cache import SchemaDiskCache, schema_hash
+
+# Compiled schema index (sibling module when run as a script)
+try:
+    from .schema_index import SchemaIndex, format_type_ref, is_introspection_result
+except ImportError:
+    from schema_index import SchemaIndex, format_type_ref, is_introspection_result
+
+# Local query validation with graphql-core (sibling module when run as a script)
+try:
+    from .query_validator import QueryValidator
+except ImportError:
+    from query_validator import QueryValidator
+
+# Read-only query result cache (sibling module when run as a script)
+try:
+    from .query_cache import QueryResultCache, parse_field_ttls
+except ImportError:
+    from query_cache import QueryResultCache, parse_field_ttls
+
+# Alias-merging batcher for concurrent queries (sibling module when run as a script)
+try:
+    from .query_batcher import QueryBatcher
+except ImportError:
+    from query_batcher import QueryBatcher
+
+# Import static query cost estimation
+try:
+    from .query_cost import QueryCostAnalyzer
+except ImportError:
+    from query_cost import QueryCostAnalyzer
+
+# Import parameterized finance query templates
+try:
+    from .query_templates import GRAPHQL_CORE_AVAILABLE as TEMPLATES_AVAILABLE, TemplateLibrary, load_templates
+except ImportError:
+    from query_templates import GRAPHQL_CORE_AVAILABLE as TEMPLATES_AVAILABLE, TemplateLibrary, load_templates
+
+# Import streaming CSV/Parquet export
+try:
+    from .result_export import DEFAULT_EXPORT_DIR, EXPORT_FORMATS, PYARROW_AVAILABLE, ExportSink, export_path
+except ImportError:
+    from result_export import DEFAULT_EXPORT_DIR, EXPORT_FORMATS, PYARROW_AVAILABLE, ExportSink, export_path
+
+# Import automatic pagination for list and connection fields
+try:
+    from .pagination import PagingProgress, build_paged_document, fetch_all_pages, iter_pages, plan_pagination
+except ImportError:
+    from pagination import PagingProgress, build_paged_document, fetch_all_pages, iter_pages, plan_pagination
+
+# Import server-side storage for results too large to return in full
+try:
+    from .result_store import ResultStore, filter_rows, project_row, validate_filters
+except ImportError:
+    from result_store import ResultStore, filter_rows, project_row, validate_filters
+
+# Import NumPy-backed group-by aggregation over result rows
+try:
+    from .aggregation import NUMPY_AVAILABLE, aggregate_rows, parse_metrics
+except ImportError:
+    from aggregation import NUMPY_AVAILABLE, aggregate_rows, parse_metrics
+
 # Import JSON normalizer for handling large responses
 try:
-    from .json_normalizer import normalize_graphql_response
+    try:
+        from .json_normalizer import extract_rows, flatten_row, normalize_graphql_response
+    except ImportError:
+        from json_normalizer import extract_rows, flatten_row, normalize_graphql_response
     NORMALIZER_AVAILABLE = True
 except ImportError:
     # Fallback if normalizer not available
@@ -31,6 +114,135 @@ load_dotenv()
 # Initialize MCP server
 mcp = FastMCP("OpenGov FIN GraphQL")
 
+# Query templates are parsed once here and registered as typed tools below
+template_library = None
+if TEMPLATES_AVAILABLE and os.getenv("OG_FIN_QUERY_TEMPLATES", "true").lower() == "true":
+    template_library = TemplateLibrary(load_templates(os.getenv("OG_FIN_QUERY_TEMPLATES_FILE")))
+
+# Type fragments shared by the full introspection query and single-type lookups
+TYPE_FRAGMENTS = """
+fragment FullType on __Type {
+  kind
+  name
+  description
+  fields(includeDeprecated: true) {
+    name
+    description
+    args {
+      ...InputValue
+    }
+    type {
+      ...TypeRef
+    }
+    isDeprecated
+    deprecationReason
+  }
+  inputFields {
+    ...InputValue
+  }
+  interfaces {
+    ...TypeRef
+  }
+  enumValues(includeDeprecated: true) {
+    name
+    description
+    isDeprecated
+    deprecationReason
+  }
+  possibleTypes {
+    ...TypeRef
+  }
+}
+
+fragment InputValue on __InputValue {
+  name
+  description
+  type { ...TypeRef }
+  defaultValue
+}
+
+fragment TypeRef on __Type {
+  kind
+  name
+  ofType {
+    kind
+    name
+    ofType {
+      kind
+      name
+      ofType {
+        kind
+        name
+        ofType {
+          kind
+          name
+          ofType {
+            kind
+            name
+            ofType {
+              kind
+              name
+              ofType {
+                kind
+                name
+              }
+            }
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+INTROSPECTION_QUERY = """
+query IntrospectionQuery {
+  __schema {
+    queryType { name }
+    mutationType { name }
+    subscriptionType { name }
+    types {
+      ...FullType
+    }
+    directives {
+      name
+      description
+      locations
+      args {
+        ...InputValue
+      }
+    }
+  }
+}
+""" + TYPE_FRAGMENTS
+
+# Lazy mode: root operation types plus names and kinds of every type
+SCHEMA_ROOTS_QUERY = """
+query SchemaRoots {
+  __schema {
+    queryType { name }
+    mutationType { name }
+    subscriptionType { name }
+    types {
+      kind
+      name
+      description
+    }
+  }
+}
+"""
+
+TYPE_QUERY = """
+query TypeDetails($name: String!) {
+  __type(name: $name) {
+    ...FullType
+  }
+}
+""" + TYPE_FRAGMENTS
+
+# A document whose first operation is a mutation (leading comments allowed)
+MUTATION_PATTERN = re.compile(r"\s*(?:#[^\n]*\n\s*)*mutation\b")
+
 class OpenGovFINGraphQLClient:
     """Client for OpenGov FIN GraphQL API"""
     
@@ -39,6 +251,86 @@ class OpenGovFINGraphQLClient:
         self.bearer_token = os.getenv("OG_FIN_BEARER_TOKEN")
         self.allow_mutations = os.getenv("OG_FIN_ALLOW_MUTATIONS", "false").lower() == "true"
         self.cached_schema = None
+        self.schema_hash = None
+        self.schema_source = None
+        self.schema_index = None
+        self._type_requests = {}
+        
+        # One keep-alive session for all requests, with a cap on requests in flight and queued
+        self.transport = PooledGraphQLTransport(
+            max_connections=int(os.getenv("OG_FIN_HTTP_MAX_CONNECTIONS", "10")),
+            max_in_flight=int(os.getenv("OG_FIN_HTTP_MAX_IN_FLIGHT", "8")),
+            max_queue=int(os.getenv("OG_FIN_HTTP_MAX_QUEUE", "100")),
+            timeout_seconds=float(os.getenv("OG_FIN_HTTP_TIMEOUT", "60")),
+            connect_timeout_seconds=float(os.getenv("OG_FIN_HTTP_CONNECT_TIMEOUT", "10")),
+            max_retries=int(os.getenv("OG_FIN_HTTP_MAX_RETRIES", "2")),
+            backoff_seconds=float(os.getenv("OG_FIN_HTTP_RETRY_BACKOFF", "0.5"))
+        )
+        
+        # Validate queries locally before sending them; disable with OG_FIN_VALIDATE_QUERIES=false
+        self.query_validator = QueryValidator()
+        self.validate_queries = os.getenv("OG_FIN_VALIDATE_QUERIES", "true").lower() == "true" and self.query_validator.available
+        
+        # Reject or add page limits to queries estimated to return too much ("off" disables)
+        self.query_cost = QueryCostAnalyzer(
+            max_cost=int(os.getenv("OG_FIN_MAX_QUERY_COST", "50000")),
+            max_depth=int(os.getenv("OG_FIN_MAX_QUERY_DEPTH", "10")),
+            default_page_limit=int(os.getenv("OG_FIN_DEFAULT_PAGE_LIMIT", "100")),
+            mode=os.getenv("OG_FIN_QUERY_COST_MODE", "rewrite").lower()
+        )
+        
+        # Merge read-only queries issued within a few milliseconds into one request (0 disables)
+        self.query_batcher = None
+        batch_window_ms = float(os.getenv("OG_FIN_BATCH_WINDOW_MS", "10"))
+        if batch_window_ms > 0 and self.validate_queries:
+            self.query_batcher = QueryBatcher(
+                self.make_graphql_request,
+                window_seconds=batch_window_ms / 1000,
+                max_queries=int(os.getenv("OG_FIN_BATCH_MAX_QUERIES", "10"))
+            )
+        
+        # Cache read-only query results; mutations clear it. Disable with OG_FIN_QUERY_CACHE=false
+        self.query_cache = None
+        if os.getenv("OG_FIN_QUERY_CACHE", "true").lower() == "true":
+            self.query_cache = QueryResultCache(
+                default_ttl=float(os.getenv("OG_FIN_QUERY_CACHE_TTL", "300")),
+                field_ttls=parse_field_ttls(os.getenv("OG_FIN_QUERY_CACHE_FIELD_TTLS")),
+                max_entries=int(os.getenv("OG_FIN_QUERY_CACHE_MAX_ENTRIES", "256"))
+            )
+        
+        # Keep large results server-side for paging and filtering; disable with OG_FIN_RESULT_STORE=false
+        self.result_store = None
+        if os.getenv("OG_FIN_RESULT_STORE", "true").lower() == "true":
+            self.result_store = ResultStore(
+                max_entries=int(os.getenv("OG_FIN_RESULT_STORE_SIZE", "16")),
+                max_total_rows=int(os.getenv("OG_FIN_RESULT_STORE_MAX_ROWS", "200000"))
+            )
+        
+        # query_graphql_all limits: hard cap on rows per call and offset pages requested at once
+        self.paginate_max_items = int(os.getenv("OG_FIN_PAGINATE_MAX_ITEMS", "5000"))
+        self.paginate_concurrency = int(os.getenv("OG_FIN_PAGINATE_CONCURRENCY", "4"))
+        
+        # aggregate_result pages list queries the same way before grouping the rows
+        self.aggregate_page_size = int(os.getenv("OG_FIN_AGGREGATE_PAGE_SIZE", "500"))
+        self.aggregate_max_seconds = float(os.getenv("OG_FIN_AGGREGATE_MAX_SECONDS", "60"))
+        
+        # export_query_results writes files here, up to this many rows per export
+        self.export_dir = os.path.expanduser(os.getenv("OG_FIN_EXPORT_DIR") or DEFAULT_EXPORT_DIR)
+        self.export_max_rows = int(os.getenv("OG_FIN_EXPORT_MAX_ROWS", "1000000"))
+        
+        # "full" introspects everything up front; "lazy" fetches root types and resolves others on demand
+        self.schema_mode = os.getenv("OG_FIN_SCHEMA_MODE", "full").lower()
+        self._schema_lock = None
+        self._revalidation_task = None
+        
+        # Introspection results persist across processes; disable with OG_FIN_SCHEMA_CACHE=false
+        self.schema_cache = None
+        if os.getenv("OG_FIN_SCHEMA_CACHE", "true").lower() == "true":
+            self.schema_cache = SchemaDiskCache(
+                self.endpoint,
+                cache_dir=os.getenv("OG_FIN_SCHEMA_CACHE_DIR") or None,
+                ttl_seconds=float(os.getenv("OG_FIN_SCHEMA_CACHE_TTL", "86400"))
+            )
         
         if not self.bearer_token:
             raise ValueError("OG_FIN_BEARER_TOKEN environment variable is required")
@@ -58,252 +350,171 @@ class OpenGovFINGraphQLClient:
         if variables:
             payload["variables"] = variables
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(self.endpoint, headers=headers, json=payload) as response:
-                if response.status >= 400:
-                    error_text = await response.text()
-                    return {
-                        "error": f"GraphQL request failed with status {response.status}",
-                        "status": response.status,
-                        "details": error_text,
-                        "endpoint": self.endpoint
-                    }
-                
-                result = await response.json()
-                return result
+        # Mutations are not retried: a timed-out attempt may still have been applied
+        retry = not MUTATION_PATTERN.match(query)
+        return await self.transport.post_json(self.endpoint, payload, headers, retry=retry)
+    
+    async def execute_query(self, query: str, variables: Optional[Dict] = None, document: Any = None) -> Dict:
+        """Execute a read-only query, batched with concurrent queries when a parsed document is given"""
+        if self.query_batcher and document is not None:
+            return await self.query_batcher.submit(query, variables, document)
+        return await self.make_graphql_request(query, variables)
     
     async def introspect_schema(self) -> Dict:
-        """Introspect the GraphQL schema"""
-        if self.cached_schema:
-            return self.cached_schema
+        """Introspect the GraphQL schema.
         
-        introspection_query = """
-        query IntrospectionQuery {
-          __schema {
-            queryType { name }
-            mutationType { name }
-            subscriptionType { name }
-            types {
-              ...FullType
-            }
-            directives {
-              name
-              description
-              locations
-              args {
-                ...InputValue
-              }
-            }
-          }
-        }
-
-        fragment FullType on __Type {
-          kind
-          name
-          description
-          fields(includeDeprecated: true) {
-            name
-            description
-            args {
-              ...InputValue
-            }
-            type {
-              ...TypeRef
-            }
-            isDeprecated
-            deprecationReason
-          }
-          inputFields {
-            ...InputValue
-          }
-          interfaces {
-            ...TypeRef
-          }
-          enumValues(includeDeprecated: true) {
-            name
-            description
-            isDeprecated
-            deprecationReason
-          }
-          possibleTypes {
-            ...TypeRef
-          }
-        }
-
-        fragment InputValue on __InputValue {
-          name
-          description
-          type { ...TypeRef }
-          defaultValue
-        }
-
-        fragment TypeRef on __Type {
-          kind
-          name
-          ofType {
-            kind
-            name
-            ofType {
-              kind
-              name
-              ofType {
-                kind
-                name
-                ofType {
-                  kind
-                  name
-                  ofType {
-                    kind
-                    name
-                    ofType {
-                      kind
-                      name
-                      ofType {
-                        kind
-                        name
-                      }
-                    }
-                  }
-                }
-              }
-            }
-          }
-        }
+        Served from memory, then from the on-disk cache (revalidated in the
+        background once past its TTL), and only fetched from the endpoint when
+        neither has it. In lazy mode only the root types are fetched and the
+        result lists the remaining types by name and kind.
         """
+        if self.cached_schema:
+            return self.cached_schema
         
-        result = await self.make_graphql_request(introspection_query)
-        if "error" not in result:
-            self.cached_schema = result
-        
-        return result
-    
-    def format_schema_as_sdl(self, schema_data: Dict) -> str:
-        """Convert introspection result to SDL format for better readability"""
-        if "error" in schema_data:
-            return f"Error retrieving schema: {schema_data['error']}"
-        
-        if "data" not in schema_data or "__schema" not in schema_data["data"]:
-            return "Invalid schema data received"
-        
-        schema = schema_data["data"]["__schema"]
-        sdl_parts = []
-        
-        # Add schema definition
-        schema_def_parts = []
-        if schema.get("queryType"):
-            schema_def_parts.append(f"query: {schema['queryType']['name']}")
-        if schema.get("mutationType"):
-            schema_def_parts.append(f"mutation: {schema['mutationType']['name']}")
-        if schema.get("subscriptionType"):
-            schema_def_parts.append(f"subscription: {schema['subscriptionType']['name']}")
-        
-        if schema_def_parts:
-            sdl_parts.append(f"schema {{\n  {chr(10).join(schema_def_parts)}\n}}")
+        if self._schema_lock is None:
+            self._schema_lock = asyncio.Lock()
         
-        # Process types
-        for type_info in schema.get("types", []):
-            if type_info["name"].startswith("__"):
-                continue  # Skip introspection types
+        async with self._schema_lock:
+            if self.cached_schema:
+                return self.cached_schema
             
-            type_sdl = self._format_type_as_sdl(type_info)
-            if type_sdl:
-                sdl_parts.append(type_sdl)
-        
-        return "\n\n".join(sdl_parts)
-    
-    def _format_type_as_sdl(self, type_info: Dict) -> str:
-        """Format a single type as SDL"""
-        kind = type_info["kind"]
-        name = type_info["name"]
-        description = type_info.get("description")
-        
-        sdl = ""
-        if description:
-            sdl += f'"""{description}"""\n'
-        
-        if kind == "OBJECT":
-            interfaces = type_info.get("interfaces", [])
-            implements = ""
-            if interfaces:
-                interface_names = [iface["name"] for iface in interfaces]
-                implements = f" implements {' & '.join(interface_names)}"
+            if self.schema_mode == "lazy":
+                result = await self._fetch_schema_roots()
+                if "error" not in result:
+                    self.cached_schema = result
+                    self.schema_source = "lazy"
+                return result
             
-            sdl += f"type {name}{implements} {{\n"
-            for field in type_info.get("fields", []):
-                field_sdl = self._format_field_as_sdl(field)
-                sdl += f"  {field_sdl}\n"
-            sdl += "}"
-        
-        elif kind == "INPUT_OBJECT":
-            sdl += f"input {name} {{\n"
-            for field in type_info.get("inputFields", []):
-                field_sdl = self._format_input_field_as_sdl(field)
-                sdl += f"  {field_sdl}\n"
-            sdl += "}"
+            if self.schema_cache:
+                entry = self.schema_cache.load()
+                if entry:
+                    self.cached_schema = entry["schema"]
+                    self.schema_hash = entry.get("schema_hash")
+                    self.schema_source = "disk"
+                    if not self.schema_cache.is_fresh(entry):
+                        self._schedule_schema_revalidation()
+                    return self.cached_schema
+            
+            result = await self._fetch_schema()
+            if "error" not in result:
+                self._store_schema(result, "network")
+            
+            return result
+    
+    def _store_schema(self, schema: Dict, source: str) -> None:
+        """Keep a fetched schema in memory and persist it to the disk cache"""
+        self.cached_schema = schema
+        self.schema_hash = schema_hash(schema)
+        self.schema_source = source
+        if self.schema_cache:
+            self.schema_cache.save(schema, self.schema_hash)
+    
+    def _schedule_schema_revalidation(self) -> None:
+        """Refetch the schema in the background while the stale copy keeps serving"""
+        if self._revalidation_task and not self._revalidation_task.done():
+            return
+        self._revalidation_task = asyncio.create_task(self._revalidate_schema())
+    
+    async def _revalidate_schema(self) -> None:
+        try:
+            result = await self._fetch_schema()
+        except Exception as e:
+            print(f"⚠️ Schema revalidation failed, keeping cached schema: {e}", file=sys.stderr)
+            return
+        if "error" in result:
+            print(f"⚠️ Schema revalidation failed, keeping cached schema: {result['error']}", file=sys.stderr)
+            return
         
-        elif kind == "ENUM":
-            sdl += f"enum {name} {{\n"
-            for value in type_info.get("enumValues", []):
-                value_sdl = value["name"]
-                if value.get("description"):
-                    sdl += f'  """{value["description"]}"""\n'
-                sdl += f"  {value_sdl}\n"
-            sdl += "}"
+        previous_hash = self.schema_hash
+        self._store_schema(result, "revalidated")
+        if previous_hash != self.schema_hash:
+            print(f"🔄 GraphQL schema changed ({previous_hash[:12] if previous_hash else 'none'} -> {self.schema_hash[:12]})", file=sys.stderr)
+    
+    def schema_cache_info(self) -> Dict:
+        """Where the current schema came from, for tool responses"""
+        return {
+            "mode": self.schema_mode,
+            "schema_hash": self.schema_hash[:12] if self.schema_hash else None,
+            "source": self.schema_source,
+            "revalidating": bool(self._revalidation_task and not self._revalidation_task.done())
+        }
+    
+    async def _fetch_schema(self) -> Dict:
+        """Run the full introspection query against the endpoint"""
+        return await self.make_graphql_request(INTROSPECTION_QUERY)
+    
+    async def _fetch_schema_roots(self) -> Dict:
+        """Fetch type names and kinds plus the full root operation types (lazy mode)"""
+        result = await self.make_graphql_request(SCHEMA_ROOTS_QUERY)
+        if "error" in result or not is_introspection_result(result):
+            return result
         
-        elif kind == "INTERFACE":
-            sdl += f"interface {name} {{\n"
-            for field in type_info.get("fields", []):
-                field_sdl = self._format_field_as_sdl(field)
-                sdl += f"  {field_sdl}\n"
-            sdl += "}"
+        schema = result["data"]["__schema"]
+        root_names = [
+            (schema.get(root) or {}).get("name")
+            for root in ("queryType", "mutationType")
+        ]
+        root_types = await asyncio.gather(*[self._fetch_type(name) for name in root_names if name])
+        resolved = {type_info["name"]: type_info for type_info in root_types if "error" not in type_info}
+        schema["types"] = [resolved.get(type_info["name"], type_info) for type_info in schema.get("types", [])]
+        return result
+    
+    async def _fetch_type(self, name: str) -> Dict:
+        """Fetch the full definition of one type with ``__type(name:)``"""
+        result = await self.make_graphql_request(TYPE_QUERY, {"name": name})
+        if "error" in result:
+            return result
+        type_info = (result.get("data") or {}).get("__type")
+        if not type_info:
+            return {"error": f"Type '{name}' not found in schema", "graphql_errors": result.get("errors")}
+        return type_info
+    
+    async def resolve_type(self, name: str) -> Dict:
+        """Full definition of a type, fetched on demand and cached in lazy mode"""
+        schema_data = await self.introspect_schema()
+        if "error" in schema_data:
+            return schema_data
+        if not is_introspection_result(schema_data):
+            return {"error": "Invalid schema data"}
         
-        elif kind == "UNION":
-            possible_types = type_info.get("possibleTypes", [])
-            if possible_types:
-                type_names = [t["name"] for t in possible_types]
-                sdl += f"union {name} = {' | '.join(type_names)}"
+        index = self.get_schema_index(schema_data)
+        if index.is_resolved(name):
+            return index.get_type(name)
+        if self.schema_mode != "lazy":
+            return {"error": f"Type '{name}' not found in schema"}
         
-        elif kind == "SCALAR":
-            sdl += f"scalar {name}"
+        # Concurrent lookups of the same type share one request
+        request = self._type_requests.get(name)
+        if request is None:
+            request = asyncio.ensure_future(self._fetch_type(name))
+            self._type_requests[name] = request
+            request.add_done_callback(lambda _: self._type_requests.pop(name, None))
+        type_info = await asyncio.shield(request)
         
-        return sdl
+        if "error" not in type_info:
+            index.add_type(type_info)
+        return type_info
     
-    def _format_field_as_sdl(self, field: Dict) -> str:
-        """Format a field as SDL"""
-        name = field["name"]
-        type_str = self._format_type_ref(field["type"])
-        args = field.get("args", [])
-        
-        if args:
-            arg_strs = []
-            for arg in args:
-                arg_str = f"{arg['name']}: {self._format_type_ref(arg['type'])}"
-                if arg.get("defaultValue"):
-                    arg_str += f" = {arg['defaultValue']}"
-                arg_strs.append(arg_str)
-            return f"{name}({', '.join(arg_strs)}): {type_str}"
-        else:
-            return f"{name}: {type_str}"
+    def get_schema_index(self, schema_data: Dict) -> SchemaIndex:
+        """Compiled index for ``schema_data``, built once per schema version"""
+        if self.schema_index is None or self.schema_index.schema_data is not schema_data:
+            digest = self.schema_hash if schema_data is self.cached_schema else None
+            self.schema_index = SchemaIndex(schema_data, digest)
+        return self.schema_index
     
-    def _format_input_field_as_sdl(self, field: Dict) -> str:
-        """Format an input field as SDL"""
-        name = field["name"]
-        type_str = self._format_type_ref(field["type"])
+    def format_schema_as_sdl(self, schema_data: Dict) -> str:
+        """Convert introspection result to SDL format for better readability"""
+        if "error" in schema_data:
+            return f"Error retrieving schema: {schema_data['error']}"
         
-        result = f"{name}: {type_str}"
-        if field.get("defaultValue"):
-            result += f" = {field['defaultValue']}"
+        if not is_introspection_result(schema_data):
+            return "Invalid schema data received"
         
-        return result
+        return self.get_schema_index(schema_data).full_sdl()
     
     def _format_type_ref(self, type_ref: Dict) -> str:
         """Format a type reference as SDL"""
-        if type_ref["kind"] == "NON_NULL":
-            return f"{self._format_type_ref(type_ref['ofType'])}!"
-        elif type_ref["kind"] == "LIST":
-            return f"[{self._format_type_ref(type_ref['ofType'])}]"
-        else:
-            return type_ref["name"]
+        return format_type_ref(type_ref)
 
 # Global client instance - initialized lazily
 client = None
@@ -333,57 +544,28 @@ async def introspect_schema(include_full_sdl: bool = False) -> Dict:
         return schema_data
     
     # Create a summary instead of returning the full schema
-    if "data" in schema_data and "__schema" in schema_data["data"]:
-        schema = schema_data["data"]["__schema"]
-        
-        # Count types by kind
-        type_counts = {}
-        custom_types = []
-        for type_info in schema.get("types", []):
-            if not type_info["name"].startswith("__"):
-                kind = type_info["kind"]
-                type_counts[kind] = type_counts.get(kind, 0) + 1
-                custom_types.append({
-                    "name": type_info["name"],
-                    "kind": kind,
-                    "description": (type_info.get("description", "")[:100] + "...") if type_info.get("description") and len(type_info.get("description", "")) > 100 else type_info.get("description", "No description")
-                })
-        
-        # Get query operations count
-        query_type = schema.get("queryType")
-        query_ops_count = 0
-        if query_type:
-            for type_info in schema["types"]:
-                if type_info["name"] == query_type["name"]:
-                    query_ops_count = len(type_info.get("fields", []))
-                    break
-        
-        # Get mutation operations count
-        mutation_type = schema.get("mutationType")
-        mutation_ops_count = 0
-        if mutation_type:
-            for type_info in schema["types"]:
-                if type_info["name"] == mutation_type["name"]:
-                    mutation_ops_count = len(type_info.get("fields", []))
-                    break
+    if is_introspection_result(schema_data):
+        index = client.get_schema_index(schema_data)
         
         result = {
             "schema_summary": {
-                "total_custom_types": len(custom_types),
-                "type_counts_by_kind": type_counts,
-                "query_operations_count": query_ops_count,
-                "mutation_operations_count": mutation_ops_count,
-                "mutations_allowed": client.allow_mutations
+                "total_custom_types": len(index.types),
+                "type_counts_by_kind": index.type_counts,
+                "query_operations_count": index.operation_count("query"),
+                "mutation_operations_count": index.operation_count("mutation"),
+                "mutations_allowed": client.allow_mutations,
+                "schema_cache": client.schema_cache_info()
             },
-            "sample_types": custom_types[:20],  # Show first 20 types as examples
+            "sample_types": index.sample_types(20),  # Show first 20 types as examples
             "endpoint": client.endpoint
         }
         
         # Only include full SDL if explicitly requested
         if include_full_sdl:
-            sdl_schema = client.format_schema_as_sdl(schema_data)
-            result["schema_sdl"] = sdl_schema
+            result["schema_sdl"] = index.full_sdl()
             result["warning"] = "Full SDL included - this may consume significant context space"
+            if client.schema_mode == "lazy":
+                result["note"] = "Lazy schema mode: SDL covers only the types resolved so far; use get_type_details for others"
         
         # Apply normalization to prevent context overflow
         if NORMALIZER_AVAILABLE:
@@ -396,40 +578,284 @@ async def introspect_schema(include_full_sdl: bool = False) -> Dict:
         "endpoint": client.endpoint
     }
 
+async def _validate_query(client: OpenGovFINGraphQLClient, query: str) -> Dict:
+    """Parse and validate locally so bad queries never reach the endpoint.
+    
+    Lazy schema mode has no full schema, so only the syntax is checked there.
+    """
+    schema_data = None
+    if client.schema_mode != "lazy":
+        schema_data = await client.introspect_schema()
+        if not is_introspection_result(schema_data):
+            schema_data = None
+    return client.query_validator.validate(query, schema_data)
+
+def _normalize_query_result(client: OpenGovFINGraphQLClient, result: Dict, query: str) -> Dict:
+    """Normalize a query result, keeping the full rows server-side when they were truncated"""
+    if not NORMALIZER_AVAILABLE:
+        return result
+    normalized = normalize_graphql_response(result, "query_execution")
+    if (normalized is not result and client.result_store and isinstance(result.get("data"), dict)
+            and "columns" in normalized.get("data_summary", {})):
+        handle = client.result_store.put(extract_rows(result["data"]), {"query": query[:500]})
+        if handle:
+            normalized["result_handle"] = handle
+            normalized["result_usage"] = "Pass result_handle to get_result_page or filter_result to read more rows without re-running the query"
+    return normalized
+
 @mcp.tool()
-async def query_graphql(query: str, variables: Optional[Dict] = None) -> Dict:
+async def query_graphql(query: str, variables: Optional[Dict] = None, use_cache: bool = True) -> Dict:
     """
     Execute a GraphQL query against the OpenGov FIN GraphQL endpoint.
     
+    The query is validated against the schema first; invalid queries return
+    `validation_errors` with line/column locations and are not sent.
+    Read-only results are cached for a few minutes.
+    
     Args:
         query (str): The GraphQL query string to execute
         variables (Optional[Dict]): Variables to pass to the GraphQL query
+        use_cache (bool): Set to false to bypass cached results and fetch fresh data
     
     Returns:
         Dict: The GraphQL query result including data and any errors
     """
     client = get_client()
+    result = await _run_query(client, query, variables, use_cache)
     
+    # Apply normalization to prevent context overflow
+    return _normalize_query_result(client, result, query)
+
+async def _run_query(client: OpenGovFINGraphQLClient, query: str, variables: Optional[Dict] = None,
+                     use_cache: bool = True, read_only: bool = False) -> Dict:
+    """Validate and execute a query through the cache and batcher, returning the raw result"""
     # Input validation
     if not query or not query.strip():
         return {"error": "Empty query provided"}
     
-    # Check if this is a mutation and if mutations are allowed
-    query_stripped = query.strip().lower()
-    if query_stripped.startswith("mutation") and not client.allow_mutations:
-        return {"error": "Mutations are disabled"}
+    cost_note = None
+    if client.validate_queries:
+        validation = await _validate_query(client, query)
+        is_mutation = "mutation" in validation["operation_types"]
+        if is_mutation and read_only:
+            return {"error": "Only read-only queries are supported here"}
+        if is_mutation and not client.allow_mutations:
+            return {"error": "Mutations are disabled"}
+        if not validation["valid"]:
+            return {
+                "error": "GraphQL validation failed",
+                "validation_errors": validation["errors"],
+                "validated_against_schema": validation["schema_validated"]
+            }
+        cache_document, root_fields = validation["document"], validation["root_fields"]
+        parsed_document = validation["parsed_document"]
+        
+        # Estimate the cost from the schema before anything is sent
+        if not is_mutation and client.query_cost.enabled and validation["schema_validated"]:
+            schema = client.query_validator.get_schema(await client.introspect_schema())
+            decision = client.query_cost.check(parsed_document, schema, variables)
+            if decision["action"] == "reject":
+                return {
+                    "error": "Query rejected as too expensive",
+                    "reasons": decision["reasons"],
+                    "query_cost": decision["cost"],
+                    "suggestion": "Add first:/limit: arguments to list fields, select fewer nested lists, or use query_graphql_all to page through results"
+                }
+            if decision["action"] == "rewrite":
+                query = cache_document = decision["query"]
+                parsed_document = decision["document"]
+                cost_note = {"rewritten": True, "reasons": decision["reasons"], "estimated_nodes": decision["cost"]["estimated_nodes"]}
+    else:
+        # Check if this is a mutation and if mutations are allowed
+        query_stripped = query.strip().lower()
+        is_mutation = query_stripped.startswith("mutation")
+        if is_mutation and read_only:
+            return {"error": "Only read-only queries are supported here"}
+        if is_mutation and not client.allow_mutations:
+            return {"error": "Mutations are disabled"}
+        
+        # Basic syntax validation
+        if not any(keyword in query_stripped for keyword in ['query', 'mutation', '{']):
+            return {"error": "Invalid GraphQL syntax"}
+        cache_document, root_fields = " ".join(query.split()), []
+        parsed_document = None
     
-    # Basic syntax validation
-    if not any(keyword in query_stripped for keyword in ['query', 'mutation', '{']):
-        return {"error": "Invalid GraphQL syntax"}
+    if is_mutation:
+        result = await client.make_graphql_request(query, variables)
+        # Any executed mutation may change data behind cached reads
+        if client.query_cache:
+            client.query_cache.invalidate()
+    elif client.query_cache and use_cache:
+        result = await client.query_cache.get_or_execute(
+            cache_document, variables, root_fields,
+            lambda: client.execute_query(query, variables, parsed_document)
+        )
+    else:
+        result = await client.execute_query(query, variables, parsed_document)
     
-    result = await client.make_graphql_request(query, variables)
+    if cost_note:
+        result = dict(result, query_cost=cost_note)
+    return result
+
+async def _prepare_paged_query(client: OpenGovFINGraphQLClient, query: str) -> Dict:
+    """Validate a read-only query and rewrite it for automatic pagination.
     
-    # Apply normalization to prevent context overflow
-    if NORMALIZER_AVAILABLE:
-        result = normalize_graphql_response(result, "query_execution")
+    Returns the pagination ``plan``, the rewritten ``document`` and its ``query`` text,
+    or an error (flagged ``unpaginated`` when the query is valid but cannot be paged).
+    """
+    validation = await _validate_query(client, query)
+    if not validation["valid"]:
+        return {
+            "error": "GraphQL validation failed",
+            "validation_errors": validation["errors"],
+            "validated_against_schema": validation["schema_validated"]
+        }
+    if validation["operation_types"] != ["query"]:
+        return {"error": "Only read-only queries can be paginated"}
     
-    return result
+    schema_data = await client.introspect_schema()
+    if not is_introspection_result(schema_data):
+        return {"error": "Schema unavailable, cannot detect pagination arguments"}
+    query_type_name = client.get_schema_index(schema_data).query_type_name
+    
+    plan = await plan_pagination(validation["parsed_document"], query_type_name, client.resolve_type)
+    if "error" in plan:
+        return dict(plan, unpaginated=True)
+    document, paged_query = build_paged_document(validation["parsed_document"], plan)
+    return {"plan": plan, "document": document, "query": paged_query}
+
+def _single_request_info(result: Dict, truncated: bool = False) -> Dict:
+    """Paging summary for rows taken from one unpaged request.
+    
+    A query rewritten under the cost limit only returned its first page of each
+    list, so it is reported as truncated just like rows cut to a row budget.
+    """
+    truncated = truncated or bool((result.get("query_cost") or {}).get("rewritten"))
+    return {"pagination": "none", "pages_fetched": 1, "complete": not truncated, "truncated": truncated}
+
+@mcp.tool()
+async def query_graphql_all(query: str, variables: Optional[Dict] = None, max_items: int = 1000,
+                            page_size: int = 100, max_seconds: float = 30) -> Dict:
+    """
+    Execute a read-only GraphQL query and follow its pagination to collect every row.
+    
+    The query must select exactly one root field. Relay connections (first/after
+    with pageInfo) are followed cursor by cursor; fields taking offset/skip and
+    limit arguments are fetched several pages at a time. Any paging arguments in
+    the query are replaced.
+    
+    Args:
+        query (str): GraphQL query with a single list or connection root field
+        variables (Optional[Dict]): Variables to pass to the GraphQL query
+        max_items (int): Stop after this many rows
+        page_size (int): Rows requested per page
+        max_seconds (float): Stop paging after this many seconds and return what was fetched
+    
+    Returns:
+        Dict: All rows under the root field, with pages fetched and why paging stopped in query_info
+    """
+    client = get_client()
+    
+    if not query or not query.strip():
+        return {"error": "Empty query provided"}
+    if not client.validate_queries:
+        return {"error": "Automatic pagination requires local query validation (graphql-core)"}
+    if page_size < 1 or max_items < 1 or max_seconds <= 0:
+        return {"error": "page_size, max_items and max_seconds must be positive"}
+    max_items = min(max_items, client.paginate_max_items)
+    
+    paged = await _prepare_paged_query(client, query)
+    if "error" in paged:
+        paged.pop("unpaginated", None)
+        return paged
+    plan, document, paged_query = paged["plan"], paged["document"], paged["query"]
+    
+    result = await fetch_all_pages(
+        client.execute_query, plan, document, paged_query, variables,
+        max_items=max_items,
+        page_size=page_size,
+        max_seconds=max_seconds,
+        concurrency=client.paginate_concurrency
+    )
+    
+    # Normalize all pages together rather than page by page
+    return _normalize_query_result(client, result, query)
+
+@mcp.tool()
+async def export_query_results(query: str, variables: Optional[Dict] = None, format: str = "csv",
+                               filename: Optional[str] = None, page_size: int = 500, max_rows: int = 100000,
+                               max_seconds: float = 600, ctx: Optional[Context] = None) -> Dict:
+    """
+    Export the full result of a read-only GraphQL query to a local CSV or Parquet file.
+    
+    Use this when the user wants a complete extract rather than an answer: rows are
+    paged from the FIN API and streamed to disk, and only the file path, row count and
+    column summary come back. List and connection fields are paged automatically
+    (see query_graphql_all); other queries are exported from a single request.
+    
+    Args:
+        query (str): GraphQL query selecting one list or connection root field
+        variables (Optional[Dict]): Variables to pass to the GraphQL query
+        format (str): "csv" or "parquet"
+        filename (Optional[str]): File name inside the export directory (default: timestamped)
+        page_size (int): Rows requested per page
+        max_rows (int): Stop after this many rows
+        max_seconds (float): Stop paging after this many seconds
+    
+    Returns:
+        Dict: Path, format, row count, file size and column types of the written file
+    """
+    client = get_client()
+    
+    export_format = (format or "csv").lower()
+    if export_format not in EXPORT_FORMATS:
+        return {"error": f"Unsupported export format '{format}'; use one of {list(EXPORT_FORMATS)}"}
+    if export_format == "parquet" and not PYARROW_AVAILABLE:
+        return {"error": "Parquet export requires pyarrow; use format='csv'"}
+    if not query or not query.strip():
+        return {"error": "Empty query provided"}
+    if not client.validate_queries:
+        return {"error": "Export requires local query validation (graphql-core)"}
+    if page_size < 1 or max_rows < 1 or max_seconds <= 0:
+        return {"error": "page_size, max_rows and max_seconds must be positive"}
+    max_rows = min(max_rows, client.export_max_rows)
+    
+    paged = await _prepare_paged_query(client, query)
+    if "error" in paged and not paged.get("unpaginated"):
+        return paged
+    if "error" in paged:
+        # Not a pageable list: export the rows of a single request
+        result = await _run_query(client, query, variables, read_only=True)
+        if "error" in result or result.get("errors") or not isinstance(result.get("data"), dict):
+            return result
+    
+    sink = ExportSink(export_path(client.export_dir, filename, export_format), export_format)
+    try:
+        if "error" in paged:
+            rows = extract_rows(result["data"])
+            await asyncio.to_thread(sink.write_page, rows[:max_rows])
+            export_info = _single_request_info(result, truncated=len(rows) > max_rows)
+            errors = None
+        else:
+            progress = PagingProgress(paged["plan"]["strategy"])
+            async for page in iter_pages(client.execute_query, paged["plan"], paged["document"], paged["query"],
+                                         variables, max_rows, page_size, max_seconds,
+                                         client.paginate_concurrency, progress):
+                # Only the current page is held in memory; writing happens off the event loop
+                await asyncio.to_thread(sink.write_page, page)
+                if ctx is not None:
+                    await ctx.report_progress(progress.items, max_rows, f"Exported {progress.items} rows ({progress.pages} pages)")
+            export_info = progress.summary()
+            errors = progress.errors
+    finally:
+        summary = await asyncio.to_thread(sink.close)
+    
+    summary["query_info"] = export_info
+    if errors:
+        summary["errors"] = errors
+    if "error" in paged and result.get("query_cost"):
+        summary["query_cost"] = result["query_cost"]
+    return summary
 
 @mcp.tool()
 async def get_schema_types(limit: int = 50, category: str = None) -> Dict:
@@ -449,35 +875,14 @@ async def get_schema_types(limit: int = 50, category: str = None) -> Dict:
     if "error" in schema_data:
         return schema_data
     
-    if "data" not in schema_data or "__schema" not in schema_data["data"]:
+    if not is_introspection_result(schema_data):
         return {"error": "Invalid schema data"}
     
     # Validate and constrain limit
     limit = min(max(1, limit), 200)
     
-    types_info = []
-    for type_info in schema_data["data"]["__schema"]["types"]:
-        if type_info["name"].startswith("__"):
-            continue  # Skip introspection types
-        
-        # Filter by category if specified
-        if category and type_info["kind"] != category.upper():
-            continue
-        
-        # Truncate description to prevent context overflow
-        description = type_info.get("description", "No description available")
-        if description and len(description) > 150:
-            description = description[:150] + "..."
-        
-        types_info.append({
-            "name": type_info["name"],
-            "kind": type_info["kind"],
-            "description": description,
-            "fields_count": len(type_info.get("fields", [])) if type_info.get("fields") else 0
-        })
-    
-    # Sort by kind then name
-    types_info.sort(key=lambda x: (x["kind"], x["name"]))
+    # Precomputed listing, already sorted by kind then name
+    types_info = client.get_schema_index(schema_data).type_listing(category)
     
     # Apply limit
     total_available = len(types_info)
@@ -511,44 +916,17 @@ async def get_query_operations() -> Dict:
     if "error" in schema_data:
         return schema_data
     
-    if "data" not in schema_data or "__schema" not in schema_data["data"]:
+    if not is_introspection_result(schema_data):
         return {"error": "Invalid schema data"}
     
-    schema = schema_data["data"]["__schema"]
-    query_type = schema.get("queryType")
-    
-    if not query_type:
+    index = client.get_schema_index(schema_data)
+    if not index.query_type_name:
         return {"error": "No query type found in schema"}
     
-    # Find the Query type definition
-    query_type_def = None
-    for type_info in schema["types"]:
-        if type_info["name"] == query_type["name"]:
-            query_type_def = type_info
-            break
-    
-    if not query_type_def:
+    operations = index.operations("query")
+    if operations is None:
         return {"error": "Query type definition not found"}
     
-    operations = []
-    for field in query_type_def.get("fields", []):
-        operation = {
-            "name": field["name"],
-            "description": field.get("description"),
-            "return_type": client._format_type_ref(field["type"]),
-            "arguments": []
-        }
-        
-        for arg in field.get("args", []):
-            operation["arguments"].append({
-                "name": arg["name"],
-                "type": client._format_type_ref(arg["type"]),
-                "description": arg.get("description"),
-                "default_value": arg.get("defaultValue")
-            })
-        
-        operations.append(operation)
-    
     return {
         "query_operations": operations,
         "total_operations": len(operations),
@@ -569,13 +947,11 @@ async def get_mutation_operations() -> Dict:
     if "error" in schema_data:
         return schema_data
     
-    if "data" not in schema_data or "__schema" not in schema_data["data"]:
+    if not is_introspection_result(schema_data):
         return {"error": "Invalid schema data"}
     
-    schema = schema_data["data"]["__schema"]
-    mutation_type = schema.get("mutationType")
-    
-    if not mutation_type:
+    index = client.get_schema_index(schema_data)
+    if not index.mutation_type_name:
         return {
             "mutation_operations": [],
             "total_operations": 0,
@@ -583,35 +959,10 @@ async def get_mutation_operations() -> Dict:
             "mutations_allowed": client.allow_mutations
         }
     
-    # Find the Mutation type definition
-    mutation_type_def = None
-    for type_info in schema["types"]:
-        if type_info["name"] == mutation_type["name"]:
-            mutation_type_def = type_info
-            break
-    
-    if not mutation_type_def:
+    operations = index.operations("mutation")
+    if operations is None:
         return {"error": "Mutation type definition not found"}
     
-    operations = []
-    for field in mutation_type_def.get("fields", []):
-        operation = {
-            "name": field["name"],
-            "description": field.get("description"),
-            "return_type": client._format_type_ref(field["type"]),
-            "arguments": []
-        }
-        
-        for arg in field.get("args", []):
-            operation["arguments"].append({
-                "name": arg["name"],
-                "type": client._format_type_ref(arg["type"]),
-                "description": arg.get("description"),
-                "default_value": arg.get("defaultValue")
-            })
-        
-        operations.append(operation)
-    
     return {
         "mutation_operations": operations,
         "total_operations": len(operations),
@@ -619,5 +970,445 @@ async def get_mutation_operations() -> Dict:
         "endpoint": client.endpoint
     }
 
+@mcp.tool()
+async def get_type_details(type_name: str, include_sdl: bool = True) -> Dict:
+    """
+    Get the full definition of a single GraphQL type (fields, arguments, input fields or enum values).
+    
+    Args:
+        type_name (str): Exact name of the type, e.g. a return type from get_query_operations
+        include_sdl (bool): Whether to include the type's SDL
+    
+    Returns:
+        Dict: The type's fields with their types and arguments, plus its SDL
+    """
+    client = get_client()
+    type_info = await client.resolve_type(type_name)
+    
+    if "error" in type_info:
+        return type_info
+    
+    result = {
+        "name": type_info["name"],
+        "kind": type_info["kind"],
+        "description": type_info.get("description")
+    }
+    
+    if type_info.get("fields"):
+        result["fields"] = [
+            {
+                "name": field["name"],
+                "type": format_type_ref(field["type"]),
+                "description": field.get("description"),
+                "arguments": [
+                    {"name": arg["name"], "type": format_type_ref(arg["type"]), "default_value": arg.get("defaultValue")}
+                    for arg in field.get("args", [])
+                ],
+                "deprecated": field.get("isDeprecated", False)
+            }
+            for field in type_info["fields"]
+        ]
+    if type_info.get("inputFields"):
+        result["input_fields"] = [
+            {
+                "name": field["name"],
+                "type": format_type_ref(field["type"]),
+                "description": field.get("description"),
+                "default_value": field.get("defaultValue")
+            }
+            for field in type_info["inputFields"]
+        ]
+    if type_info.get("enumValues"):
+        result["enum_values"] = [value["name"] for value in type_info["enumValues"]]
+    if type_info.get("interfaces"):
+        result["interfaces"] = [iface["name"] for iface in type_info["interfaces"]]
+    if type_info.get("possibleTypes"):
+        result["possible_types"] = [possible["name"] for possible in type_info["possibleTypes"]]
+    
+    if include_sdl:
+        result["sdl"] = client.schema_index.type_sdl(type_name)
+    result["schema_mode"] = client.schema_mode
+    
+    # Apply normalization to prevent context overflow
+    if NORMALIZER_AVAILABLE:
+        result = normalize_graphql_response(result, "type_details")
+    
+    return result
+
+@mcp.tool()
+async def search_schema(query: str, limit: int = 10, kind: Optional[str] = None) -> Dict:
+    """
+    Search the schema for types, fields and operations matching keywords.
+    
+    Matches type, field and argument names (camelCase words are split, so
+    "vendor payment" finds vendorPayments) and descriptions, ranked by relevance.
+    
+    Args:
+        query (str): Keywords, e.g. "budget actuals by fund"
+        limit (int): Maximum number of matches to return (default: 10, max: 50)
+        kind (str): Only return one kind of match: "query", "mutation", "type" or "field"
+    
+    Returns:
+        Dict: Ranked matches with their signatures and descriptions
+    """
+    if kind and kind not in ("query", "mutation", "type", "field"):
+        return {"error": f"Unknown kind '{kind}'; use query, mutation, type or field"}
+    
+    client = get_client()
+    schema_data = await client.introspect_schema()
+    
+    if "error" in schema_data:
+        return schema_data
+    
+    if not is_introspection_result(schema_data):
+        return {"error": "Invalid schema data"}
+    
+    limit = min(max(1, limit), 50)
+    matches = client.get_schema_index(schema_data).search(query, limit, kind)
+    
+    result = {
+        "query": query,
+        "matches": matches,
+        "matches_returned": len(matches),
+        "kind_filter": kind
+    }
+    if client.schema_mode == "lazy":
+        result["note"] = "Lazy schema mode: only root operations and types already resolved with get_type_details are searched in depth"
+    return result
+
+@mcp.tool()
+async def get_result_page(result_handle: str, offset: int = 0, limit: int = 20, fields: Optional[List[str]] = None) -> Dict:
+    """
+    Read rows from a stored query result without re-running the query.
+    
+    Large query_graphql results return a `result_handle` alongside their summary;
+    the full rows stay on the server for a while.
+    
+    Args:
+        result_handle (str): Handle returned by query_graphql or query_graphql_all
+        offset (int): Index of the first row to return
+        limit (int): Number of rows to return (at most 200)
+        fields (Optional[List[str]]): Columns to include, using the dotted names from `columns`
+    
+    Returns:
+        Dict: The requested rows, the total row count and whether more rows follow
+    """
+    client = get_client()
+    stored = client.result_store.get(result_handle) if client.result_store else None
+    if stored is None:
+        return {"error": f"Unknown or expired result handle '{result_handle}'; run the query again"}
+    
+    offset, limit = max(offset, 0), min(max(limit, 1), 200)
+    rows = [project_row(row, fields) for row in stored.flat_rows(offset, offset + limit)]
+    return {
+        "result_handle": result_handle,
+        "rows": rows,
+        "offset": offset,
+        "returned": len(rows),
+        "total_rows": len(stored.rows),
+        "has_more": offset + len(rows) < len(stored.rows)
+    }
+
+@mcp.tool()
+async def filter_result(result_handle: str, filters: Optional[Dict[str, Any]] = None, fields: Optional[List[str]] = None,
+                        offset: int = 0, limit: int = 20) -> Dict:
+    """
+    Filter and project the rows of a stored query result without re-running the query.
+    
+    Filters map a column to a value (equality) or to operators, e.g.
+    `{"status": "OPEN", "amount": {"gte": 1000, "lt": 5000}, "vendor.name": {"contains": "acme"}}`.
+    Operators: eq, ne, gt, gte, lt, lte, contains (case-insensitive), in (list of values).
+    
+    Args:
+        result_handle (str): Handle returned by query_graphql or query_graphql_all
+        filters (Optional[Dict[str, Any]]): Conditions every returned row must meet
+        fields (Optional[List[str]]): Columns to include, using the dotted names from `columns`
+        offset (int): Index of the first matching row to return
+        limit (int): Number of matching rows to return (at most 200)
+    
+    Returns:
+        Dict: Matching rows with the total number of matches
+    """
+    client = get_client()
+    stored = client.result_store.get(result_handle) if client.result_store else None
+    if stored is None:
+        return {"error": f"Unknown or expired result handle '{result_handle}'; run the query again"}
+    
+    error = validate_filters(filters)
+    if error:
+        return {"error": error, "columns": stored.columns}
+    unknown = [column for column in list(filters or {}) + list(fields or []) if column not in stored.columns]
+    if unknown:
+        return {"error": f"Unknown column(s) {unknown}", "columns": stored.columns}
+    
+    offset, limit = max(offset, 0), min(max(limit, 1), 200)
+    rows = []
+    matches = 0
+    for row in filter_rows(stored.flat_rows(), filters):
+        if offset <= matches < offset + limit:
+            rows.append(project_row(row, fields))
+        matches += 1
+    return {
+        "result_handle": result_handle,
+        "rows": rows,
+        "offset": offset,
+        "returned": len(rows),
+        "total_matches": matches,
+        "total_rows": len(stored.rows),
+        "has_more": offset + len(rows) < matches
+    }
+
+@mcp.tool()
+async def aggregate_result(group_by: Optional[List[str]] = None, metrics: Optional[List[str]] = None,
+                           result_handle: Optional[str] = None, query: Optional[str] = None,
+                           variables: Optional[Dict] = None, filters: Optional[Dict[str, Any]] = None,
+                           sort_by: Optional[str] = None, top_k: int = 20, descending: bool = True) -> Dict:
+    """
+    Group and aggregate the rows of a stored result or a fresh read-only query on the server.
+    
+    Use this for totals, averages and rankings instead of reading sample rows.
+    Columns use the dotted names from `columns`, e.g. `department.name`.
+    
+    Args:
+        group_by (Optional[List[str]]): Columns to group by; omit to aggregate all rows into one group
+        metrics (Optional[List[str]]): Aggregates such as "count", "sum:amount", "mean:amount",
+            "min:amount", "max:amount" or "count:amount" (non-null values); defaults to ["count"]
+        result_handle (Optional[str]): Handle returned by query_graphql or query_graphql_all
+        query (Optional[str]): Read-only GraphQL query to run when no result_handle is given
+        variables (Optional[Dict]): Variables for the query
+        filters (Optional[Dict[str, Any]]): Row filters applied first, in the filter_result format
+        sort_by (Optional[str]): Metric to rank groups by, e.g. "sum_amount" (defaults to the first metric)
+        top_k (int): Number of groups to return
+        descending (bool): Rank largest values first
+    
+    Returns:
+        Dict: One row per returned group with its aggregates, plus the total number of groups
+    """
+    client = get_client()
+    if not NUMPY_AVAILABLE:
+        return {"error": "Aggregation requires numpy"}
+    
+    parsed_metrics, error = parse_metrics(metrics)
+    if error:
+        return {"error": error}
+    error = validate_filters(filters)
+    if error:
+        return {"error": error}
+    
+    query_info = None
+    if result_handle:
+        stored = client.result_store.get(result_handle) if client.result_store else None
+        if stored is None:
+            return {"error": f"Unknown or expired result handle '{result_handle}'; run the query again"}
+        rows, columns = stored.flat_rows(), stored.columns
+    elif query:
+        # Page list fields to the end so totals cover every row, not just the first page
+        paged = await _prepare_paged_query(client, query) if client.validate_queries else None
+        if paged and "error" in paged and not paged.get("unpaginated"):
+            return paged
+        if not paged or "error" in paged:
+            result = await _run_query(client, query, variables, read_only=True)
+            if "error" in result or result.get("errors") or not isinstance(result.get("data"), dict):
+                return result
+            query_info = _single_request_info(result)
+        else:
+            result = await fetch_all_pages(
+                client.execute_query, paged["plan"], paged["document"], paged["query"], variables,
+                max_items=client.paginate_max_items,
+                page_size=client.aggregate_page_size,
+                max_seconds=client.aggregate_max_seconds,
+                concurrency=client.paginate_concurrency
+            )
+            query_info = result["query_info"]
+            if result.get("errors") and not query_info["items"]:
+                return result
+        raw_rows = extract_rows(result["data"])
+        rows = [flatten_row(row) for row in raw_rows]
+        columns = list({column: None for row in rows for column in row})
+        result_handle = client.result_store.put(raw_rows, {"query": query[:500]}) if client.result_store else None
+    else:
+        return {"error": "Provide a result_handle or a query to aggregate"}
+    
+    wanted = list(group_by or []) + [column for _, column, _ in parsed_metrics if column] + list(filters or {})
+    unknown = [column for column in wanted if column not in columns]
+    if unknown:
+        return {"error": f"Unknown column(s) {unknown}", "columns": columns}
+    if sort_by and sort_by not in [name for _, _, name in parsed_metrics]:
+        return {"error": f"sort_by must be one of the metrics: {[name for _, _, name in parsed_metrics]}"}
+    
+    aggregates = aggregate_rows(list(filter_rows(rows, filters)), group_by, parsed_metrics,
+                                sort_by=sort_by, top_k=top_k, descending=descending)
+    if result_handle:
+        aggregates["result_handle"] = result_handle
+    if query_info:
+        # Totals over a partial fetch must not be reported as final
+        aggregates["complete"] = query_info["complete"]
+        aggregates["query_info"] = query_info
+        for key in ("query_cost", "errors"):
+            if result.get(key):
+                aggregates[key] = result[key]
+    return aggregates
+
+async def _run_template(name: str, arguments: Dict[str, Any]) -> Dict:
+    """Bind a template's parameters and run it through the normal query path"""
+    client = get_client()
+    template = template_library.templates[name]
+    
+    if client.validate_queries and client.schema_mode != "lazy":
+        validation = await _validate_query(client, template.query)
+        if not validation["valid"]:
+            return {
+                "error": f"Query template '{name}' does not match this FIN schema",
+                "validation_errors": validation["errors"],
+                "hint": "Use query_graphql instead, or override the template in OG_FIN_QUERY_TEMPLATES_FILE"
+            }
+    
+    template_library.uses[name] += 1
+    variables = {key: value for key, value in arguments.items() if value is not None}
+    result = await _run_query(client, template.query, variables)
+    return _normalize_query_result(client, result, template.query)
+
+@mcp.tool()
+async def list_query_templates() -> Dict:
+    """
+    List the configured finance query templates and whether they work against this FIN schema.
+    
+    Each available template is also its own tool (named after the template) taking the listed
+    parameters, so common questions can be answered without writing GraphQL.
+    
+    Returns:
+        Dict: Templates with their parameters, descriptions and availability
+    """
+    if template_library is None:
+        return {"error": "Query templates are disabled or graphql-core is not installed"}
+    
+    client = get_client()
+    schema_data = None
+    if client.validate_queries and client.schema_mode != "lazy":
+        schema_data = await client.introspect_schema()
+        if not is_introspection_result(schema_data):
+            schema_data = None
+    
+    templates = []
+    for name, template in template_library.templates.items():
+        entry = {
+            "name": name,
+            "description": template.description,
+            "parameters": [
+                {key: value for key, value in parameter.items() if key != "annotation"}
+                for parameter in template_library.parameters(name)
+            ]
+        }
+        if schema_data is not None:
+            validation = client.query_validator.validate(template.query, schema_data)
+            entry["available"] = validation["valid"]
+            if not validation["valid"]:
+                entry["validation_errors"] = validation["errors"]
+        entry["registered"] = name in template_library.registered
+        templates.append(entry)
+    
+    return {"templates": templates, "total_templates": len(templates), "validated_against_schema": schema_data is not None}
+
+@mcp.tool()
+async def get_performance_stats() -> Dict:
+    """
+    Get cache hit rates and validation counters for this FIN MCP server.
+    
+    Returns:
+        Dict: Query result cache, local validation, cost limits, batching, result store, template and schema cache statistics
+    """
+    client = get_client()
+    return {
+        "query_cache": client.query_cache.stats() if client.query_cache else {"enabled": False},
+        "query_validation": client.query_validator.stats() if client.validate_queries else {"enabled": False},
+        "batching": client.query_batcher.stats() if client.query_batcher else {"enabled": False},
+        "query_cost": client.query_cost.stats() if client.query_cost.enabled else {"enabled": False},
+        "query_templates": {"uses": template_library.uses} if template_library else {"enabled": False},
+        "result_store": client.result_store.stats() if client.result_store else {"enabled": False},
+        "http_pool": client.transport.stats(),
+        "schema": client.schema_cache_info(),
+        "endpoint": client.endpoint
+    }
+
+async def register_query_templates() -> Dict:
+    """Register each query template that validates against the introspected schema as a tool.
+    
+    The tool's parameters are the template's variables. Templates that do not match this
+    endpoint's schema, or cannot be checked (lazy schema mode, validation disabled or the
+    schema unavailable), are not registered.
+    """
+    if template_library is None or not template_library.templates:
+        return {"registered": [], "unavailable": {}}
+    
+    client = get_client()
+    schema_data = None
+    if client.validate_queries and client.schema_mode != "lazy":
+        schema_data = await client.introspect_schema()
+    if not is_introspection_result(schema_data):
+        print("⚠️ Query templates need the full introspected schema to be validated; none registered", file=sys.stderr)
+        return {"registered": [], "unavailable": {}}
+    
+    for name, template in template_library.templates.items():
+        if name in template_library.registered:
+            continue
+        validation = client.query_validator.validate(template.query, schema_data)
+        if not validation["valid"]:
+            template_library.unavailable[name] = validation["errors"]
+            print(f"⚠️ Query template '{name}' does not match this FIN schema; not registered", file=sys.stderr)
+            continue
+        template_library.unavailable.pop(name, None)
+        mcp.add_tool(
+            template_library.make_tool(name, _run_template),
+            name=name,
+            description=template_library.describe(name)
+        )
+        template_library.registered.append(name)
+    return {"registered": list(template_library.registered), "unavailable": dict(template_library.unavailable)}
+
+# Awaited by the in-process tool loader before it lists this server's tools
+prepare_tools = register_query_templates
+
+async def warm_up():
+    """Create the GraphQL client, cache the introspected schema and register the query templates"""
+    await get_client().introspect_schema()
+    await register_query_templates()
+
+def create_http_app():
+    """Build the production HTTP app (called once per uvicorn worker)"""
+    return build_http_app(mcp, warmup=warm_up)
+
 if __name__ == "__main__":
+    import contextlib
+    
+    # Multi-worker production HTTP serving, configured through MCP_HTTP_* variables
+    if len(sys.argv) > 1 and sys.argv[1] == "--serve":
+        serve(__file__)
+        sys.exit(0)
+    
+    # Templates are validated against the schema before the tool list is served,
+    # within a bound so the client's initialize handshake is never held up for long.
+    # stdout carries the MCP protocol, so warm-up messages go to stderr.
+    async def _prepare_stdio():
+        with contextlib.redirect_stdout(sys.stderr):
+            client = get_client()
+            timeout = float(os.getenv("OG_FIN_TEMPLATE_STARTUP_TIMEOUT", "10"))
+            try:
+                await asyncio.wait_for(warm_up(), timeout=timeout)
+            except asyncio.TimeoutError:
+                print(f"⚠️ Schema not available within {timeout:g}s, query templates not registered")
+            except Exception as e:
+                print(f"⚠️ Warm-up failed, query templates not registered: {e}")
+            # A pending revalidation is dropped with this loop; reloading the stale
+            # schema from disk on the server's loop schedules it again there
+            revalidation = client._revalidation_task
+            if revalidation and not revalidation.done():
+                revalidation.cancel()
+                client.cached_schema = None
+            client._revalidation_task = None
+            client._schema_lock = None
+            # The session belongs to this loop; the server recreates it on its own
+            await client.transport.close()
+    if template_library is not None and template_library.templates:
+        asyncio.run(_prepare_stdio())
+    
     mcp.run(transport="stdio") 
\ No newline at end of file
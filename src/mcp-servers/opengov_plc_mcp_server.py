@@ -21,6 +21,12 @@ from fastmcp import FastMCP
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 
+# Production HTTP serving helpers (sibling module when run as a script)
+try:
+    from .http_serving import build_http_app, serve
+except ImportError:
+    from http_serving import build_http_app, serve
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -958,12 +964,23 @@ async def get_organization(community: str) -> Dict:
     """Get organization information"""
     return await get_client().make_request("GET", "/organization", community)
 
+async def warm_up():
+    """Create the API client and fetch an access token before serving requests"""
+    await get_client().get_access_token()
 
+def create_http_app():
+    """Build the production HTTP app (called once per uvicorn worker)"""
+    return build_http_app(mcp, warmup=warm_up)
 
 if __name__ == "__main__":
     # Run the server
     import sys
     
+    # Multi-worker production HTTP serving, configured through MCP_HTTP_* variables
+    if len(sys.argv) > 1 and sys.argv[1] == "--serve":
+        serve(__file__)
+        sys.exit(0)
+    
     # Default to stdio transport for LangGraph compatibility
     transport = "stdio"
     
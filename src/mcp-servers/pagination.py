@@ -0,0 +1,298 @@
+"""
+Automatic pagination for GraphQL list and connection fields
+
+Given a query with one root field, the schema decides how to page it:
+Relay connections (``first``/``after`` with ``pageInfo``) are followed cursor
+by cursor, offset/limit style fields are fetched several pages at a time.
+Paging stops at an item or time budget and all rows come back together.
+"""
+
+import asyncio
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+try:
+    from graphql.language import (
+        ArgumentNode, FieldNode, NameNode, Node, OperationDefinitionNode, SelectionSetNode,
+        VariableDefinitionNode, VariableNode, parse, parse_type, print_ast
+    )
+    GRAPHQL_CORE_AVAILABLE = True
+except ImportError:
+    GRAPHQL_CORE_AVAILABLE = False
+
+try:
+    from .schema_index import format_type_ref
+except ImportError:
+    from schema_index import format_type_ref
+
+CURSOR_SIZE_ARGS = ("first",)
+CURSOR_AFTER_ARGS = ("after",)
+OFFSET_ARGS = ("offset", "skip")
+LIMIT_ARGS = ("limit", "first", "take", "pageSize", "size")
+
+# Variables and alias injected into the rewritten query
+PAGE_SIZE_VARIABLE = "paginationPageSize"
+CURSOR_VARIABLE = "paginationCursor"
+OFFSET_VARIABLE = "paginationOffset"
+PAGE_INFO_ALIAS = "paginationPageInfo"
+
+ResolveType = Callable[[str], Awaitable[Dict]]
+Execute = Callable[[str, Dict, Any], Awaitable[Dict]]
+
+def _named_type(type_ref: Dict) -> Dict:
+    while type_ref.get("ofType"):
+        type_ref = type_ref["ofType"]
+    return type_ref
+
+def _is_list(type_ref: Dict) -> bool:
+    if type_ref["kind"] == "NON_NULL":
+        type_ref = type_ref["ofType"]
+    return type_ref["kind"] == "LIST"
+
+def _replace(node, **changes):
+    """Copy an AST node with some attributes replaced (locations are dropped)"""
+    fields = {key: getattr(node, key, None) for key in node.keys if key != "loc"}
+    fields.update(changes)
+    return type(node)(**fields)
+
+def _used_variables(node, names=None) -> set:
+    names = set() if names is None else names
+    if isinstance(node, VariableNode):
+        names.add(node.name.value)
+    for key in getattr(node, "keys", ()):
+        if key == "loc":
+            continue
+        value = getattr(node, key, None)
+        for item in value if isinstance(value, (list, tuple)) else [value]:
+            if isinstance(item, Node):
+                _used_variables(item, names)
+    return names
+
+async def plan_pagination(document, query_type_name: str, resolve_type: ResolveType) -> Dict:
+    """Work out how to page the single root field of ``document`` from the schema"""
+    operations = [d for d in document.definitions if isinstance(d, OperationDefinitionNode)]
+    if len(operations) != 1 or operations[0].operation.value != "query":
+        return {"error": "Pagination needs a document with exactly one query operation"}
+    selections = operations[0].selection_set.selections
+    if len(selections) != 1 or not isinstance(selections[0], FieldNode):
+        return {"error": "Pagination needs exactly one root field, e.g. { transactions(...) { ... } }"}
+    field = selections[0]
+
+    root_type = await resolve_type(query_type_name)
+    if "error" in root_type:
+        return root_type
+    field_def = next((f for f in root_type.get("fields") or [] if f["name"] == field.name.value), None)
+    if field_def is None:
+        return {"error": f"Unknown root field '{field.name.value}'"}
+
+    args = {arg["name"]: arg["type"] for arg in field_def.get("args", [])}
+    plan = {
+        "operation": operations[0],
+        "field": field,
+        "response_key": field.alias.value if field.alias else field.name.value
+    }
+
+    named = _named_type(field_def["type"])
+    if not _is_list(field_def["type"]) and named["kind"] == "OBJECT":
+        return_type = await resolve_type(named["name"])
+        if "error" in return_type:
+            return return_type
+        return_fields = {f["name"]: f for f in return_type.get("fields") or []}
+        size_arg = next((a for a in CURSOR_SIZE_ARGS if a in args), None)
+        after_arg = next((a for a in CURSOR_AFTER_ARGS if a in args), None)
+        if "pageInfo" in return_fields and size_arg and after_arg and ("edges" in return_fields or "nodes" in return_fields):
+            plan.update({
+                "strategy": "cursor",
+                "size_arg": size_arg, "size_type": args[size_arg],
+                "after_arg": after_arg, "after_type": args[after_arg]
+            })
+            return plan
+
+    offset_arg = next((a for a in OFFSET_ARGS if a in args), None)
+    limit_arg = next((a for a in LIMIT_ARGS if a in args), None)
+    if offset_arg and limit_arg:
+        plan.update({
+            "strategy": "offset",
+            "offset_arg": offset_arg, "offset_type": args[offset_arg],
+            "size_arg": limit_arg, "size_type": args[limit_arg]
+        })
+        return plan
+
+    return {"error": f"Field '{field.name.value}' is neither a Relay connection nor takes offset/limit arguments"}
+
+def build_paged_document(document, plan: Dict) -> Tuple[Any, str]:
+    """Rewrite the query so page size and position come from injected variables"""
+    paging_args = {plan["size_arg"]: (PAGE_SIZE_VARIABLE, plan["size_type"])}
+    if plan["strategy"] == "cursor":
+        paging_args[plan["after_arg"]] = (CURSOR_VARIABLE, plan["after_type"])
+    else:
+        paging_args[plan["offset_arg"]] = (OFFSET_VARIABLE, plan["offset_type"])
+
+    field = plan["field"]
+    arguments = [arg for arg in field.arguments or () if arg.name.value not in paging_args]
+    arguments += [
+        ArgumentNode(name=NameNode(value=arg), value=VariableNode(name=NameNode(value=variable)))
+        for arg, (variable, _) in paging_args.items()
+    ]
+    selections = list(field.selection_set.selections) if field.selection_set else []
+    if plan["strategy"] == "cursor":
+        page_info = parse(f"{{ {PAGE_INFO_ALIAS}: pageInfo {{ hasNextPage endCursor }} }}")
+        selections.append(page_info.definitions[0].selection_set.selections[0])
+    field = _replace(field, arguments=tuple(arguments), selection_set=SelectionSetNode(selections=tuple(selections)))
+
+    # Drop variable definitions the replaced paging arguments no longer use
+    operation = plan["operation"]
+    used = _used_variables(field)
+    definitions = [d for d in operation.variable_definitions or () if d.variable.name.value in used]
+    definitions += [
+        VariableDefinitionNode(
+            variable=VariableNode(name=NameNode(value=variable)),
+            type=parse_type(format_type_ref(arg_type)),
+            directives=()
+        )
+        for variable, arg_type in paging_args.values()
+    ]
+    operation = _replace(
+        operation,
+        variable_definitions=tuple(definitions),
+        selection_set=SelectionSetNode(selections=(field,))
+    )
+    paged = _replace(document, definitions=tuple(
+        operation if definition is plan["operation"] else definition for definition in document.definitions
+    ))
+    return paged, print_ast(paged)
+
+def _page_rows(value: Any) -> List[Any]:
+    """Rows in one page of a list, connection or object wrapping a list"""
+    if isinstance(value, list):
+        return value
+    if not isinstance(value, dict):
+        return []
+    if isinstance(value.get("edges"), list):
+        return [edge.get("node", edge) for edge in value["edges"] if edge]
+    if isinstance(value.get("nodes"), list):
+        return value["nodes"]
+    return next((item for item in value.values() if isinstance(item, list)), [])
+
+class PagingProgress:
+    """Counters for one paging run, updated as pages arrive"""
+
+    def __init__(self, strategy: str):
+        self.strategy = strategy
+        self.pages = 0
+        self.items = 0
+        self.stopped_reason = "complete"
+        self.errors: List[Any] = []
+        self.started = time.monotonic()
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "pagination": self.strategy,
+            "pages_fetched": self.pages,
+            "items": self.items,
+            "complete": self.stopped_reason == "complete",
+            "stopped_reason": self.stopped_reason,
+            "elapsed_seconds": round(time.monotonic() - self.started, 3)
+        }
+
+async def iter_pages(execute: Execute, plan: Dict, document: Any, query: str, variables: Optional[Dict],
+                     max_items: int, page_size: int, max_seconds: float, concurrency: int,
+                     progress: PagingProgress) -> AsyncIterator[List[Any]]:
+    """Yield the rows of each page until the data, the item budget or the time budget runs out"""
+    base_variables = {k: v for k, v in (variables or {}).items() if k in _used_variables(document)}
+    key = plan["response_key"]
+
+    async def fetch(position: Any) -> Dict:
+        page_variables = dict(base_variables)
+        page_variables[PAGE_SIZE_VARIABLE] = page_size
+        page_variables[CURSOR_VARIABLE if plan["strategy"] == "cursor" else OFFSET_VARIABLE] = position
+        remaining = max_seconds - (time.monotonic() - progress.started)
+        return await asyncio.wait_for(execute(query, page_variables, document), timeout=max(remaining, 0.001))
+
+    def page_failed(result: Dict) -> bool:
+        if "error" in result or result.get("errors") or not isinstance(result.get("data"), dict):
+            progress.errors.append(result.get("errors") or result.get("error") or "Empty page")
+            progress.stopped_reason = "error"
+            return True
+        return False
+
+    def take(page: List[Any]) -> List[Any]:
+        kept = page[:max_items - progress.items]
+        progress.items += len(kept)
+        if len(kept) < len(page):
+            # Rows of this page were dropped to stay within the item budget
+            progress.stopped_reason = "item_budget"
+        return kept
+
+    try:
+        if plan["strategy"] == "cursor":
+            # Cursors are only known after each page, so pages are fetched in order
+            cursor = None
+            while True:
+                result = await fetch(cursor)
+                progress.pages += 1
+                if page_failed(result):
+                    break
+                connection = result["data"].get(key) or {}
+                page = _page_rows(connection)
+                yield take(page)
+                page_info = connection.get(PAGE_INFO_ALIAS) or {}
+                if progress.items >= max_items:
+                    if page_info.get("hasNextPage"):
+                        progress.stopped_reason = "item_budget"
+                    break
+                if not page_info.get("hasNextPage") or not page_info.get("endCursor"):
+                    break
+                cursor = page_info["endCursor"]
+        else:
+            # Offsets are known up front, so several pages are requested at once.
+            # A short first page means the server caps the page size (or the data
+            # fits in one page): later offsets step by what it actually returned.
+            offset = 0
+            step = page_size
+            step_confirmed = False
+            done = False
+            while not done:
+                pages_left = -(-(max_items - progress.items) // step)
+                wave = [offset + i * step for i in range(max(1, min(concurrency, pages_left)))]
+                results = await asyncio.gather(*[fetch(position) for position in wave])
+                for position, result in zip(wave, results):
+                    progress.pages += 1
+                    if page_failed(result):
+                        done = True
+                        break
+                    page = _page_rows(result["data"].get(key))
+                    if not page:
+                        done = True
+                        break
+                    yield take(page)
+                    offset = position + len(page)
+                    if progress.items >= max_items:
+                        progress.stopped_reason, done = "item_budget", True
+                        break
+                    if len(page) < step:
+                        if step_confirmed:
+                            # A short page after full ones is the end of the data
+                            done = True
+                        else:
+                            # The rest of this wave was requested at the wrong offsets
+                            step = len(page)
+                        step_confirmed = True
+                        break
+                    step_confirmed = True
+    except asyncio.TimeoutError:
+        progress.stopped_reason = "time_budget"
+
+async def fetch_all_pages(execute: Execute, plan: Dict, document: Any, query: str, variables: Optional[Dict],
+                          max_items: int, page_size: int, max_seconds: float, concurrency: int) -> Dict:
+    """Fetch pages until the data, the item budget or the time budget runs out"""
+    progress = PagingProgress(plan["strategy"])
+    rows: List[Any] = []
+    async for page in iter_pages(execute, plan, document, query, variables, max_items,
+                                 page_size, max_seconds, concurrency, progress):
+        rows.extend(page)
+
+    result = {"data": {plan["response_key"]: rows}, "query_info": progress.summary()}
+    if progress.errors:
+        result["errors"] = progress.errors
+    return result
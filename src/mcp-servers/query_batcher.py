@@ -0,0 +1,212 @@
+"""
+Batching of concurrent read-only GraphQL queries into one aliased document
+
+Queries submitted within a short window are merged into a single operation:
+each query's root fields, variables and fragments get a per-query prefix so
+they cannot collide, the merged document is sent once, and the response is
+split back into one result per caller with the original field names.
+Anything that cannot be merged safely is sent on its own.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+try:
+    from graphql.language import (
+        DocumentNode, FieldNode, FragmentDefinitionNode, FragmentSpreadNode, NameNode, Node,
+        OperationDefinitionNode, OperationType, SelectionSetNode, VariableNode, print_ast
+    )
+    GRAPHQL_CORE_AVAILABLE = True
+except ImportError:
+    GRAPHQL_CORE_AVAILABLE = False
+
+Execute = Callable[[str, Optional[Dict]], Awaitable[Dict]]
+
+def _rename(value, prefix: str):
+    """Copy an AST value, prefixing variable and fragment names (locations are dropped)"""
+    if isinstance(value, (list, tuple)):
+        return tuple(_rename(item, prefix) for item in value)
+    if not isinstance(value, Node):
+        return value
+    fields = {key: _rename(getattr(value, key, None), prefix) for key in value.keys if key != "loc"}
+    if isinstance(value, (VariableNode, FragmentSpreadNode, FragmentDefinitionNode)):
+        fields["name"] = NameNode(value=f"{prefix}{value.name.value}")
+    return type(value)(**fields)
+
+def _mergeable_operation(document) -> Optional[Any]:
+    """The single query operation of ``document`` if it can be merged, else None"""
+    if not isinstance(document, DocumentNode):
+        return None
+    operations = [d for d in document.definitions if isinstance(d, OperationDefinitionNode)]
+    if len(operations) != 1 or operations[0].operation != OperationType.QUERY or operations[0].directives:
+        return None
+    # Root fields must be plain fields so each one can be aliased
+    if not all(isinstance(selection, FieldNode) for selection in operations[0].selection_set.selections):
+        return None
+    return operations[0]
+
+def _prefixed_copy(document, prefix: str) -> Tuple[Tuple, Tuple, List[Any]]:
+    """Copy ``document`` with root aliases, variables and fragments prefixed"""
+    document = _rename(document, prefix)
+    operation = _mergeable_operation(document)
+    # Alias every root field so its response key carries the prefix
+    root_fields = tuple(
+        type(field)(**{
+            **{key: getattr(field, key, None) for key in field.keys if key != "loc"},
+            "alias": NameNode(value=f"{prefix}{field.alias.value if field.alias else field.name.value}")
+        })
+        for field in operation.selection_set.selections
+    )
+    fragments = [d for d in document.definitions if isinstance(d, FragmentDefinitionNode)]
+    return root_fields, operation.variable_definitions or (), fragments
+
+def merge_queries(documents: List[Any], variables: List[Optional[Dict]]) -> Tuple[str, Dict, List[str]]:
+    """Merge parsed query documents into one aliased query.
+
+    Returns the merged query text, the merged variables and the prefix used
+    for each input document.
+    """
+    prefixes = [f"b{index}_" for index in range(len(documents))]
+    variable_definitions = []
+    selections = []
+    fragments = []
+    merged_variables: Dict[str, Any] = {}
+
+    for document, query_variables, prefix in zip(documents, variables, prefixes):
+        root_fields, query_variable_definitions, query_fragments = _prefixed_copy(document, prefix)
+        variable_definitions.extend(query_variable_definitions)
+        selections.extend(root_fields)
+        fragments.extend(query_fragments)
+        for name, value in (query_variables or {}).items():
+            merged_variables[f"{prefix}{name}"] = value
+
+    operation = OperationDefinitionNode(
+        operation=OperationType.QUERY,
+        name=NameNode(value="BatchedQuery"),
+        variable_definitions=tuple(variable_definitions),
+        directives=(),
+        selection_set=SelectionSetNode(selections=tuple(selections))
+    )
+    merged = DocumentNode(definitions=tuple([operation] + fragments))
+    return print_ast(merged), merged_variables, prefixes
+
+def split_result(result: Dict, prefixes: List[str]) -> Optional[List[Dict]]:
+    """Split a merged response back into one response per query.
+
+    Returns None when an error cannot be attributed to a single query, so the
+    caller can fall back to sending the queries separately.
+    """
+    data = result.get("data")
+    if not isinstance(data, dict):
+        return None
+
+    results: List[Dict] = [{"data": {}} for _ in prefixes]
+    for key, value in data.items():
+        for index, prefix in enumerate(prefixes):
+            if key.startswith(prefix):
+                results[index]["data"][key[len(prefix):]] = value
+                break
+
+    for error in result.get("errors") or []:
+        path = error.get("path") or []
+        owner = next((i for i, prefix in enumerate(prefixes) if path and str(path[0]).startswith(prefix)), None)
+        if owner is None:
+            return None
+        error = dict(error, path=[path[0][len(prefixes[owner]):]] + list(path[1:]))
+        results[owner].setdefault("errors", []).append(error)
+
+    return results
+
+class QueryBatcher:
+    """Collect read-only queries for ``window_seconds`` and send them as one request"""
+
+    def __init__(self, execute: Execute, window_seconds: float = 0.01, max_queries: int = 10):
+        self.execute = execute
+        self.window_seconds = window_seconds
+        self.max_queries = max(1, max_queries)
+        self._pending: List[Tuple[str, Any, Optional[Dict], asyncio.Future]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        self._tasks = set()
+        self.batches = 0
+        self.batched_queries = 0
+        self.fallbacks = 0
+
+    async def submit(self, query: str, variables: Optional[Dict], document: Any) -> Dict:
+        """Execute ``query``, possibly merged with other queries submitted in the same window"""
+        if self.window_seconds <= 0 or _mergeable_operation(document) is None:
+            return await self.execute(query, variables)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((query, document, variables, future))
+        if len(self._pending) >= self.max_queries:
+            # Full batch: send now instead of waiting for the window to close
+            self._schedule(self._send(self._take_pending()))
+        elif self._flush_task is None:
+            self._flush_task = self._schedule(self._flush_after_window())
+        return await future
+
+    def _take_pending(self):
+        batch, self._pending = self._pending, []
+        return batch
+
+    def _schedule(self, coroutine) -> asyncio.Task:
+        # Keep a reference so the task is not garbage collected mid-flight
+        task = asyncio.ensure_future(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _flush_after_window(self) -> None:
+        await asyncio.sleep(self.window_seconds)
+        self._flush_task = None
+        batch = self._take_pending()
+        if batch:
+            await self._send(batch)
+
+    async def _send(self, batch) -> None:
+        try:
+            if len(batch) == 1:
+                query, _, variables, future = batch[0]
+                result = await self.execute(query, variables)
+                if not future.done():
+                    future.set_result(result)
+                return
+
+            merged_query, merged_variables, prefixes = merge_queries(
+                [document for _, document, _, _ in batch],
+                [variables for _, _, variables, _ in batch]
+            )
+            result = await self.execute(merged_query, merged_variables or None)
+            self.batches += 1
+            self.batched_queries += len(batch)
+
+            if "error" in result:
+                # Transport failure: every query in the batch failed the same way
+                for _, _, _, future in batch:
+                    if not future.done():
+                        future.set_result(result)
+                return
+
+            results = split_result(result, prefixes)
+            if results is None:
+                # Errors not tied to one query: resend separately to get precise errors
+                self.fallbacks += 1
+                results = await asyncio.gather(*[self.execute(query, variables) for query, _, variables, _ in batch])
+            for (_, _, _, future), query_result in zip(batch, results):
+                if not future.done():
+                    future.set_result(query_result)
+        except Exception as e:
+            for _, _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+    def stats(self) -> Dict[str, Any]:
+        """Batching counters for the stats tool"""
+        return {
+            "window_ms": round(self.window_seconds * 1000, 1),
+            "max_queries": self.max_queries,
+            "batches_sent": self.batches,
+            "queries_batched": self.batched_queries,
+            "requests_saved": self.batched_queries - self.batches,
+            "fallbacks": self.fallbacks
+        }
@@ -0,0 +1,133 @@
+"""
+Result cache for read-only GraphQL queries
+
+Results are keyed on the canonical query document plus its variables, so
+reformatted copies of the same question share an entry. Each query's TTL is
+the shortest TTL configured for the root fields it selects, identical
+concurrent queries share one request, and mutations clear the whole cache.
+"""
+
+import asyncio
+import hashlib
+import json
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+def parse_field_ttls(spec: Optional[str]) -> Dict[str, float]:
+    """Parse ``"field=seconds,field=seconds"`` into per-root-field TTLs"""
+    ttls = {}
+    for item in (spec or "").split(","):
+        if "=" not in item:
+            continue
+        field, seconds = item.split("=", 1)
+        try:
+            ttls[field.strip()] = float(seconds)
+        except ValueError:
+            print(f"⚠️ Ignoring invalid query cache TTL '{item.strip()}'", file=sys.stderr)
+    return ttls
+
+def is_cacheable(result: Any) -> bool:
+    """Only successful responses are cached; errors are retried by the next caller"""
+    return isinstance(result, dict) and "error" not in result and not result.get("errors")
+
+class QueryResultCache:
+    """TTL cache of GraphQL responses with per-root-field TTLs and single-flight execution"""
+
+    def __init__(self, default_ttl: float = 300.0, field_ttls: Optional[Dict[str, float]] = None,
+                 max_entries: int = 256):
+        self.default_ttl = default_ttl
+        self.field_ttls = field_ttls or {}
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        # Bumped by every invalidation; loads started before it must not be stored
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.joined = 0
+        self.invalidations = 0
+        self.stale_discarded = 0
+
+    def ttl_for(self, root_fields: List[str]) -> float:
+        """Shortest TTL among the selected root fields (the default for unknown fields)"""
+        if not root_fields:
+            return self.default_ttl
+        return min(self.field_ttls.get(field, self.default_ttl) for field in root_fields)
+
+    @staticmethod
+    def key(document: str, variables: Optional[Dict] = None) -> str:
+        payload = json.dumps({"query": document, "variables": variables or {}}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def get_or_execute(self, document: str, variables: Optional[Dict], root_fields: List[str],
+                             execute: Callable[[], Awaitable[Dict]]) -> Dict:
+        """Cached response for the query, executing it once for all concurrent callers on a miss"""
+        key = self.key(document, variables)
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] >= time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            del self._entries[key]
+
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            self.joined += 1
+            return await asyncio.shield(in_flight)
+
+        self.misses += 1
+        generation = self.generation
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            result = await execute()
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so an exception nobody else awaited is not logged
+            future.exception()
+            raise
+        else:
+            if generation != self.generation:
+                # A mutation ran while this read was in flight; its result may predate it
+                self.stale_discarded += 1
+            elif is_cacheable(result):
+                self._store(key, result, self.ttl_for(root_fields))
+            future.set_result(result)
+            return result
+        finally:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+
+    def _store(self, key: str, result: Dict, ttl: float) -> None:
+        if ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic() + ttl, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self) -> None:
+        """Drop every cached response (after a mutation), including reads still in flight"""
+        self._entries.clear()
+        # Later callers start a fresh read instead of joining one sent before the mutation
+        self._in_flight.clear()
+        self.generation += 1
+        self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit rates and TTL configuration for the stats tool"""
+        lookups = self.hits + self.misses + self.joined
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "joined_in_flight": self.joined,
+            "hit_rate": round((self.hits + self.joined) / lookups, 3) if lookups else 0.0,
+            "default_ttl_seconds": self.default_ttl,
+            "field_ttls": self.field_ttls,
+            "invalidations": self.invalidations,
+            "stale_discarded": self.stale_discarded
+        }
@@ -0,0 +1,222 @@
+"""
+Static cost estimate for GraphQL queries
+
+Before a query is sent, its selection tree is walked against the schema to
+estimate how many objects it can return: every list field multiplies the
+cost of everything below it by its page limit (``first``, ``limit``, ...),
+or by a pessimistic guess when it has none. Queries over budget get default
+page limits added where the schema allows, or are rejected with the reasons.
+"""
+
+from typing import Any, Dict, List, Optional
+
+try:
+    from graphql import get_named_type, is_list_type, is_non_null_type
+    from graphql.language import (
+        ArgumentNode, FieldNode, FragmentDefinitionNode, FragmentSpreadNode, InlineFragmentNode,
+        IntValueNode, NameNode, Node, OperationDefinitionNode, VariableNode, print_ast
+    )
+    GRAPHQL_CORE_AVAILABLE = True
+except ImportError:
+    GRAPHQL_CORE_AVAILABLE = False
+
+LIMIT_ARGUMENTS = ("first", "last", "limit", "take", "pageSize", "size", "top")
+
+# Assumed length of a list nothing limits
+UNBOUNDED_LIST_SIZE = 1000
+
+def _returns_list(type_) -> bool:
+    if is_non_null_type(type_):
+        type_ = type_.of_type
+    return is_list_type(type_)
+
+def _argument_value(field: Any, name: str, variables: Dict) -> Optional[int]:
+    """Integer value of argument ``name`` on a field node, if it can be known statically"""
+    for argument in field.arguments or ():
+        if argument.name.value != name:
+            continue
+        value = argument.value
+        if isinstance(value, IntValueNode):
+            return int(value.value)
+        if isinstance(value, VariableNode):
+            variable = variables.get(value.name.value)
+            return variable if isinstance(variable, int) and not isinstance(variable, bool) else None
+    return None
+
+def _has_argument(field: Any, name: str) -> bool:
+    return any(argument.name.value == name for argument in field.arguments or ())
+
+def _with_limits(node, targets: Dict[int, str], limit: int):
+    """Copy an AST, adding ``<argument>: limit`` to the target field nodes (locations are dropped)"""
+    if isinstance(node, (list, tuple)):
+        return tuple(_with_limits(item, targets, limit) for item in node)
+    if not isinstance(node, Node):
+        return node
+    fields = {key: _with_limits(getattr(node, key, None), targets, limit) for key in node.keys if key != "loc"}
+    if id(node) in targets:
+        fields["arguments"] = tuple(fields.get("arguments") or ()) + (
+            ArgumentNode(name=NameNode(value=targets[id(node)]), value=IntValueNode(value=str(limit))),
+        )
+    return type(node)(**fields)
+
+class QueryCostAnalyzer:
+    """Estimate query cost from the schema and enforce depth and size budgets"""
+
+    def __init__(self, max_cost: int = 50000, max_depth: int = 10, default_page_limit: int = 100,
+                 mode: str = "rewrite"):
+        self.max_cost = max_cost
+        self.max_depth = max_depth
+        self.default_page_limit = default_page_limit
+        self.mode = mode
+        self.checked = 0
+        self.rewritten = 0
+        self.rejected = 0
+
+    @property
+    def enabled(self) -> bool:
+        return GRAPHQL_CORE_AVAILABLE and self.mode in ("rewrite", "reject")
+
+    def analyze(self, document, schema, variables: Optional[Dict] = None) -> Dict[str, Any]:
+        """Depth, breadth and estimated result size of every query operation in ``document``"""
+        fragments = {d.name.value: d for d in document.definitions if isinstance(d, FragmentDefinitionNode)}
+        state = {
+            "variables": variables or {},
+            "fragments": fragments,
+            "schema": schema,
+            "depth": 0,
+            "fields": 0,
+            "breadth": 0,
+            "nodes": 0,
+            "unbounded": []
+        }
+        for definition in document.definitions:
+            if isinstance(definition, OperationDefinitionNode) and definition.operation.value == "query":
+                self._walk(definition.selection_set, schema.query_type, 1, 1, [], state, None, ())
+
+        return {
+            "depth": state["depth"],
+            "field_count": state["fields"],
+            "max_breadth": state["breadth"],
+            "estimated_nodes": state["nodes"],
+            "unbounded_lists": [
+                {"path": entry["path"], "limit_argument": entry["argument"]} for entry in state["unbounded"]
+            ],
+            "_unbounded": state["unbounded"]
+        }
+
+    def _walk(self, selection_set, parent_type, multiplier: int, depth: int, path: List[str],
+              state: Dict, bound, seen_fragments) -> int:
+        """Accumulate cost for one selection set; ``bound`` is the page limit set by a parent connection field"""
+        breadth = 0
+        for selection in selection_set.selections:
+            if isinstance(selection, FieldNode):
+                name = selection.name.value
+                field_def = (getattr(parent_type, "fields", None) or {}).get(name)
+                if field_def is None or name.startswith("__"):
+                    continue
+                breadth += 1
+                state["fields"] += 1
+                state["depth"] = max(state["depth"], depth)
+                field_path = path + [selection.alias.value if selection.alias else name]
+                argument = next((a for a in LIMIT_ARGUMENTS if a in field_def.args), None)
+                limit = _argument_value(selection, argument, state["variables"]) if argument else None
+                count, child_bound = multiplier, None
+
+                if _returns_list(field_def.type):
+                    if limit is not None:
+                        size = limit
+                    elif bound and bound[0] == "limited":
+                        size = bound[1]
+                    else:
+                        size = UNBOUNDED_LIST_SIZE
+                        # Fix on this field if it takes a limit, otherwise on the connection field above it
+                        owner = (selection, argument, field_path) if argument else (bound[1:] if bound else (None, None, field_path))
+                        self._record_unbounded(state, *owner)
+                    count = multiplier * size
+                elif argument:
+                    # Connection-style field: its page limit bounds the lists directly below it
+                    child_bound = ("limited", limit) if limit is not None else ("unbounded", selection, argument, field_path)
+
+                state["nodes"] += count
+                if selection.selection_set:
+                    self._walk(selection.selection_set, get_named_type(field_def.type), count, depth + 1,
+                               field_path, state, child_bound, seen_fragments)
+            elif isinstance(selection, InlineFragmentNode):
+                fragment_type = parent_type
+                if selection.type_condition:
+                    fragment_type = state["schema"].get_type(selection.type_condition.name.value) or parent_type
+                breadth += self._walk(selection.selection_set, fragment_type, multiplier, depth, path,
+                                      state, bound, seen_fragments)
+            elif isinstance(selection, FragmentSpreadNode):
+                name = selection.name.value
+                fragment = state["fragments"].get(name)
+                if fragment is None or name in seen_fragments:
+                    continue
+                fragment_type = state["schema"].get_type(fragment.type_condition.name.value) or parent_type
+                breadth += self._walk(fragment.selection_set, fragment_type, multiplier, depth, path,
+                                      state, bound, seen_fragments + (name,))
+        state["breadth"] = max(state["breadth"], breadth)
+        return breadth
+
+    @staticmethod
+    def _record_unbounded(state: Dict, field: Any, argument: Optional[str], path: List[str]) -> None:
+        if any(entry["field"] is field and field is not None for entry in state["unbounded"]):
+            return
+        state["unbounded"].append({"field": field, "argument": argument, "path": ".".join(path)})
+
+    def check(self, document, schema, variables: Optional[Dict] = None) -> Dict[str, Any]:
+        """Decide whether to send, rewrite or reject a query.
+
+        Returns ``action`` ("allow", "rewrite" or "reject"), the ``cost``
+        estimate, the ``reasons`` for anything other than "allow" and the
+        ``document`` to send (with its text as ``query`` when rewritten).
+        """
+        self.checked += 1
+        cost = self.analyze(document, schema, variables)
+        decision = {"action": "allow", "cost": cost, "reasons": [], "document": document}
+
+        if cost["depth"] > self.max_depth:
+            decision["reasons"].append(f"Query depth {cost['depth']} exceeds the limit of {self.max_depth}")
+        if cost["estimated_nodes"] > self.max_cost:
+            decision["reasons"].append(
+                f"Query could return about {cost['estimated_nodes']} objects, over the budget of {self.max_cost}"
+            )
+        if not decision["reasons"]:
+            return self._public(decision)
+
+        # Depth cannot be fixed by adding limits; size may be
+        fixable = [entry for entry in cost["_unbounded"]
+                   if entry["field"] is not None and entry["argument"] and not _has_argument(entry["field"], entry["argument"])]
+        if self.mode == "rewrite" and fixable and cost["depth"] <= self.max_depth:
+            targets = {id(entry["field"]): entry["argument"] for entry in fixable}
+            rewritten = _with_limits(document, targets, self.default_page_limit)
+            new_cost = self.analyze(rewritten, schema, variables)
+            if new_cost["estimated_nodes"] <= self.max_cost:
+                self.rewritten += 1
+                decision.update({"action": "rewrite", "cost": new_cost, "document": rewritten, "query": print_ast(rewritten)})
+                decision["reasons"].append("Added {} to {}".format(
+                    ", ".join(sorted({f"{entry['argument']}: {self.default_page_limit}" for entry in fixable})),
+                    ", ".join(entry["path"] for entry in fixable)
+                ))
+                return self._public(decision)
+
+        self.rejected += 1
+        decision["action"] = "reject"
+        return self._public(decision)
+
+    @staticmethod
+    def _public(decision: Dict[str, Any]) -> Dict[str, Any]:
+        decision["cost"] = {key: value for key, value in decision["cost"].items() if not key.startswith("_")}
+        return decision
+
+    def stats(self) -> Dict[str, Any]:
+        """Budget configuration and decision counters"""
+        return {
+            "mode": self.mode,
+            "max_cost": self.max_cost,
+            "max_depth": self.max_depth,
+            "default_page_limit": self.default_page_limit,
+            "checked": self.checked,
+            "rewritten": self.rewritten,
+            "rejected": self.rejected
+        }
@@ -0,0 +1,216 @@
+"""
+Parameterized query templates for common finance questions
+
+Each template is a named GraphQL query whose variables become the typed
+parameters of an MCP tool, so frequent questions (budget vs actuals, vendor
+spend, fund balances, revenue by period) are answered without writing
+GraphQL. Deployments can add or replace templates with a JSON file of
+``{"name", "description", "query", "parameters": {"var": "description"}}``
+objects (``OG_FIN_QUERY_TEMPLATES_FILE``).
+
+Templates are parsed once at startup and validated against the introspected
+schema before they are registered. Field names differ between FIN
+deployments, so a built-in template whose fields this endpoint does not have
+is reported as unavailable and never offered as a tool.
+"""
+
+import inspect
+import json
+import sys
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional
+
+try:
+    from graphql import GraphQLError, parse, print_ast, value_from_ast_untyped
+    from graphql.language import ListTypeNode, NonNullTypeNode, OperationDefinitionNode
+    GRAPHQL_CORE_AVAILABLE = True
+except ImportError:
+    GRAPHQL_CORE_AVAILABLE = False
+
+class QueryTemplate(NamedTuple):
+    """A named, parameterized GraphQL query"""
+    name: str
+    description: str
+    query: str
+    parameters: Dict[str, str] = {}
+
+BUILTIN_TEMPLATES = [
+    QueryTemplate(
+        name="budget_vs_actuals",
+        description="Budgeted and actual amounts per account for a fiscal year, optionally for one fund.",
+        query="""
+query BudgetVsActuals($fiscalYear: Int!, $fund: String, $limit: Int = 100) {
+  budgetActuals(fiscalYear: $fiscalYear, fund: $fund, limit: $limit) {
+    account
+    fund
+    department
+    budgetAmount
+    actualAmount
+    variance
+  }
+}""",
+        parameters={
+            "fiscalYear": "Fiscal year, e.g. 2024",
+            "fund": "Fund code to restrict to",
+            "limit": "Maximum number of accounts"
+        }
+    ),
+    QueryTemplate(
+        name="vendor_spend",
+        description="Amounts paid to vendors in a date range, optionally for one vendor.",
+        query="""
+query VendorSpend($startDate: String!, $endDate: String!, $vendor: String, $limit: Int = 100) {
+  vendorPayments(startDate: $startDate, endDate: $endDate, vendor: $vendor, limit: $limit) {
+    vendorName
+    vendorNumber
+    paymentDate
+    amount
+    fund
+  }
+}""",
+        parameters={
+            "startDate": "Start date (YYYY-MM-DD)",
+            "endDate": "End date (YYYY-MM-DD)",
+            "vendor": "Vendor name or number to restrict to",
+            "limit": "Maximum number of payments"
+        }
+    ),
+    QueryTemplate(
+        name="fund_balances",
+        description="Current balance of each fund, optionally for one fiscal year.",
+        query="""
+query FundBalances($fiscalYear: Int, $limit: Int = 100) {
+  funds(fiscalYear: $fiscalYear, limit: $limit) {
+    code
+    name
+    beginningBalance
+    revenues
+    expenditures
+    endingBalance
+  }
+}""",
+        parameters={
+            "fiscalYear": "Fiscal year, e.g. 2024 (defaults to the current year)",
+            "limit": "Maximum number of funds"
+        }
+    ),
+    QueryTemplate(
+        name="revenue_by_period",
+        description="Revenue totals per accounting period for a fiscal year, optionally for one fund.",
+        query="""
+query RevenueByPeriod($fiscalYear: Int!, $fund: String, $limit: Int = 100) {
+  revenues(fiscalYear: $fiscalYear, fund: $fund, limit: $limit) {
+    period
+    fund
+    source
+    amount
+  }
+}""",
+        parameters={
+            "fiscalYear": "Fiscal year, e.g. 2024",
+            "fund": "Fund code to restrict to",
+            "limit": "Maximum number of rows"
+        }
+    )
+]
+
+SCALAR_TYPES = {"Int": int, "Float": float, "Boolean": bool}
+
+def load_templates(path: Optional[str] = None) -> List[QueryTemplate]:
+    """Built-in templates, extended or overridden by name from a JSON file"""
+    templates = {template.name: template for template in BUILTIN_TEMPLATES}
+    if path:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for item in json.load(f):
+                    template = QueryTemplate(
+                        name=item["name"],
+                        description=item.get("description", ""),
+                        query=item["query"],
+                        parameters=item.get("parameters", {})
+                    )
+                    templates[template.name] = template
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"⚠️ Could not load query templates from {path}: {e}", file=sys.stderr)
+    return list(templates.values())
+
+def _python_type(type_node) -> Any:
+    """Python annotation for a GraphQL variable type"""
+    if isinstance(type_node, NonNullTypeNode):
+        return _python_type(type_node.type)
+    if isinstance(type_node, ListTypeNode):
+        return List[_python_type(type_node.type)]
+    return SCALAR_TYPES.get(type_node.name.value, str)
+
+class TemplateLibrary:
+    """Parsed templates with their parameters and per-schema validation status"""
+
+    def __init__(self, templates: List[QueryTemplate]):
+        self.templates: Dict[str, QueryTemplate] = {}
+        self.documents: Dict[str, Any] = {}
+        for template in templates:
+            try:
+                document = parse(template.query)
+            except GraphQLError as e:
+                print(f"⚠️ Skipping query template '{template.name}': {e.message}", file=sys.stderr)
+                continue
+            operations = [d for d in document.definitions if isinstance(d, OperationDefinitionNode)]
+            if len(operations) != 1 or operations[0].operation.value != "query":
+                print(f"⚠️ Skipping query template '{template.name}': it must contain exactly one query", file=sys.stderr)
+                continue
+            self.templates[template.name] = template
+            self.documents[template.name] = document
+        self.uses = {name: 0 for name in self.templates}
+        # Filled in by validation against the schema: tools registered, and errors for the rest
+        self.registered: List[str] = []
+        self.unavailable: Dict[str, List[str]] = {}
+
+    def parameters(self, name: str) -> List[Dict[str, Any]]:
+        """Tool parameters derived from the template's variable definitions"""
+        operation = next(d for d in self.documents[name].definitions if isinstance(d, OperationDefinitionNode))
+        descriptions = self.templates[name].parameters
+        parameters = []
+        for definition in operation.variable_definitions or ():
+            default = value_from_ast_untyped(definition.default_value) if definition.default_value else None
+            parameters.append({
+                "name": definition.variable.name.value,
+                "type": print_ast(definition.type),
+                "required": isinstance(definition.type, NonNullTypeNode) and definition.default_value is None,
+                "default": default,
+                "description": descriptions.get(definition.variable.name.value, ""),
+                "annotation": _python_type(definition.type)
+            })
+        return parameters
+
+    def signature(self, name: str) -> inspect.Signature:
+        """Python signature for the template's tool (required parameters first)"""
+        parameters = sorted(self.parameters(name), key=lambda p: not p["required"])
+        return inspect.Signature(
+            [
+                inspect.Parameter(
+                    p["name"], inspect.Parameter.KEYWORD_ONLY,
+                    annotation=p["annotation"] if p["required"] else Optional[p["annotation"]],
+                    default=inspect.Parameter.empty if p["required"] else p["default"]
+                )
+                for p in parameters
+            ],
+            return_annotation=Dict
+        )
+
+    def describe(self, name: str) -> str:
+        """Tool description listing the parameters"""
+        template = self.templates[name]
+        lines = [template.description, "", "Runs a FIN query template validated against this endpoint's schema.", "", "Args:"]
+        for p in self.parameters(name):
+            optional = "" if p["required"] else f", optional, default {p['default']}"
+            lines.append(f"    {p['name']} ({p['type']}{optional}): {p['description']}")
+        return "\n".join(lines)
+
+    def make_tool(self, name: str, run: Callable[[str, Dict[str, Any]], Awaitable[Dict]]):
+        """Async function with the template's typed signature, for registration as an MCP tool"""
+        async def template_tool(**arguments) -> Dict:
+            return await run(name, arguments)
+
+        template_tool.__name__ = name
+        template_tool.__doc__ = self.describe(name)
+        template_tool.__signature__ = self.signature(name)
+        return template_tool
@@ -0,0 +1,149 @@
+"""
+Local GraphQL validation against the cached introspection schema
+
+Queries are parsed and validated with graphql-core before they are sent, so
+syntax errors, unknown fields and wrong argument types go straight back to
+the model without a round trip to the endpoint. Parsed documents are kept in
+a small LRU because the model tends to resend the same query text.
+"""
+
+import sys
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+try:
+    from graphql import GraphQLError, build_client_schema, parse, print_ast, validate
+    from graphql.language import FieldNode, OperationDefinitionNode
+    GRAPHQL_CORE_AVAILABLE = True
+except ImportError:
+    # Fallback: query_graphql keeps its basic keyword checks
+    GRAPHQL_CORE_AVAILABLE = False
+
+def _format_error(error) -> Dict[str, Any]:
+    formatted = {"message": error.message}
+    if error.locations:
+        formatted["locations"] = [{"line": loc.line, "column": loc.column} for loc in error.locations]
+    return formatted
+
+class QueryValidator:
+    """Parse and validate GraphQL documents with graphql-core, caching parsed documents"""
+
+    def __init__(self, max_documents: int = 256):
+        self.max_documents = max_documents
+        self._documents: "OrderedDict[str, Any]" = OrderedDict()
+        self._printed: Dict[int, str] = {}
+        self._validated: Dict[int, List[Dict[str, Any]]] = {}
+        self._schema = None
+        self._schema_source = None
+        self.hits = 0
+        self.misses = 0
+        self.rejected = 0
+        self.validation_hits = 0
+
+    @property
+    def available(self) -> bool:
+        return GRAPHQL_CORE_AVAILABLE
+
+    def parse_document(self, query: str):
+        """Parsed document for ``query`` (or the GraphQLError it raised), from the LRU when possible"""
+        cached = self._documents.get(query)
+        if cached is not None:
+            self.hits += 1
+            self._documents.move_to_end(query)
+            return cached
+
+        self.misses += 1
+        try:
+            document = parse(query)
+        except GraphQLError as e:
+            document = e
+        self._documents[query] = document
+        while len(self._documents) > self.max_documents:
+            _, evicted = self._documents.popitem(last=False)
+            self._printed.pop(id(evicted), None)
+            self._validated.pop(id(evicted), None)
+        return document
+
+    def _print(self, document) -> str:
+        """Canonical text of a parsed document (formatting and comments removed), printed once"""
+        printed = self._printed.get(id(document))
+        if printed is None:
+            printed = print_ast(document)
+            self._printed[id(document)] = printed
+        return printed
+
+    def get_schema(self, schema_data: Optional[Dict]):
+        """graphql-core schema for an introspection result, built once per schema version"""
+        if schema_data is None:
+            return None
+        if self._schema_source is not schema_data:
+            self._schema_source = schema_data
+            self._validated.clear()
+            try:
+                self._schema = build_client_schema(schema_data["data"])
+            except Exception as e:
+                # Partial (lazy) or unusual introspection data: validate syntax only
+                print(f"⚠️ Could not build schema for local validation: {e}", file=sys.stderr)
+                self._schema = None
+        return self._schema
+
+    def validate(self, query: str, schema_data: Optional[Dict] = None) -> Dict[str, Any]:
+        """Validate ``query`` and describe its operations.
+
+        Returns ``valid``, ``errors`` (message and locations), the
+        ``operation_types`` in the document, whether the schema was used
+        (``schema_validated``) or only the syntax was checked, the canonical
+        ``document`` text, the ``root_fields`` it selects and the
+        ``parsed_document`` itself.
+        """
+        document = self.parse_document(query)
+        if isinstance(document, GraphQLError):
+            self.rejected += 1
+            return {"valid": False, "errors": [_format_error(document)], "operation_types": [], "schema_validated": False}
+
+        operation_types = []
+        root_fields = []
+        for definition in document.definitions:
+            if not isinstance(definition, OperationDefinitionNode):
+                continue
+            operation_types.append(definition.operation.value)
+            for selection in definition.selection_set.selections:
+                # Root fields selected through fragments are not resolved here
+                root_fields.append(selection.name.value if isinstance(selection, FieldNode) else "*")
+
+        schema = self.get_schema(schema_data)
+        errors: List[Dict[str, Any]] = []
+        if schema is not None:
+            # Validation is static, so a document is validated once per schema version
+            cached_errors = self._validated.get(id(document))
+            if cached_errors is None:
+                cached_errors = [_format_error(error) for error in validate(schema, document)]
+                self._validated[id(document)] = cached_errors
+            else:
+                self.validation_hits += 1
+            errors = cached_errors
+        if errors:
+            self.rejected += 1
+
+        return {
+            "valid": not errors,
+            "errors": errors,
+            "operation_types": operation_types,
+            "schema_validated": schema is not None,
+            "document": self._print(document),
+            "root_fields": root_fields,
+            "parsed_document": document
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Document cache and validation counters"""
+        lookups = self.hits + self.misses
+        return {
+            "available": self.available,
+            "cached_documents": len(self._documents),
+            "document_cache_hits": self.hits,
+            "document_cache_misses": self.misses,
+            "document_cache_hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "validation_cache_hits": self.validation_hits,
+            "rejected_locally": self.rejected
+        }
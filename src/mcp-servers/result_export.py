@@ -0,0 +1,163 @@
+"""
+Streaming export of query rows to CSV or Parquet files
+
+Rows are written page by page as they arrive, so an export holds one page in
+memory no matter how large the file gets. Columns are fixed by the first
+page; nested values are written as JSON text.
+"""
+
+import csv
+import json
+import os
+import re
+import time
+from typing import Any, Dict, List, Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+try:
+    from .json_normalizer import flatten_row
+except ImportError:
+    from json_normalizer import flatten_row
+
+EXPORT_FORMATS = ("csv", "parquet")
+DEFAULT_EXPORT_DIR = os.path.join(os.path.expanduser("~"), ".cache", "opengov-mcp", "exports")
+
+def export_path(export_dir: str, filename: Optional[str], export_format: str) -> str:
+    """Path for an export inside ``export_dir`` (file names cannot point elsewhere)"""
+    if filename:
+        name = re.sub(r"[^A-Za-z0-9._-]", "_", os.path.basename(filename)).lstrip(".") or "export"
+    else:
+        name = time.strftime("fin_export_%Y%m%d_%H%M%S")
+    if not name.lower().endswith(f".{export_format}"):
+        name = f"{name}.{export_format}"
+    return os.path.join(export_dir, name)
+
+def _cell(value: Any) -> Any:
+    return json.dumps(value, default=str) if isinstance(value, (dict, list)) else value
+
+class CsvExportWriter:
+    """Append pages of flat rows to a CSV file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "w", newline="", encoding="utf-8")
+        self._writer = None
+        self.columns: List[str] = []
+        self.dropped_columns = set()
+
+    def write(self, rows: List[Dict[str, Any]]) -> None:
+        if not rows:
+            return
+        if self._writer is None:
+            self.columns = list({column: None for row in rows for column in row})
+            self._writer = csv.DictWriter(self._file, fieldnames=self.columns, extrasaction="ignore")
+            self._writer.writeheader()
+        for row in rows:
+            self.dropped_columns.update(column for column in row if column not in self._writer.fieldnames)
+            self._writer.writerow({column: _cell(value) for column, value in row.items()})
+
+    def column_types(self) -> Dict[str, str]:
+        return {column: "string" for column in self.columns}
+
+    def close(self) -> None:
+        self._file.close()
+
+def _infer_arrow_type(values: List[Any]):
+    present = [value for value in values if value is not None]
+    if present and all(isinstance(value, bool) for value in present):
+        return pa.bool_()
+    if present and all(isinstance(value, int) and not isinstance(value, bool) for value in present):
+        return pa.int64()
+    if present and all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in present):
+        return pa.float64()
+    return pa.string()
+
+class ParquetExportWriter:
+    """Append pages of flat rows to a Parquet file, one row group per page"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._writer = None
+        self.schema = None
+        self.columns: List[str] = []
+        self.dropped_columns = set()
+        self.coerced_values = 0
+
+    def _array(self, values: List[Any], arrow_type):
+        if pa.types.is_string(arrow_type):
+            return pa.array([None if value is None else str(value) for value in values], type=arrow_type)
+        try:
+            return pa.array(values, type=arrow_type)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, OverflowError, TypeError):
+            # Values that do not fit the column type fixed by the first page are written as nulls
+            converted = []
+            for value in values:
+                try:
+                    converted.append(pa.scalar(value, type=arrow_type).as_py() if value is not None else None)
+                except (pa.ArrowInvalid, pa.ArrowTypeError, OverflowError, TypeError):
+                    self.coerced_values += 1
+                    converted.append(None)
+            return pa.array(converted, type=arrow_type)
+
+    def write(self, rows: List[Dict[str, Any]]) -> None:
+        if not rows:
+            return
+        if self._writer is None:
+            self.columns = list({column: None for row in rows for column in row})
+            self.schema = pa.schema([
+                (column, _infer_arrow_type([_cell(row.get(column)) for row in rows])) for column in self.columns
+            ])
+            self._writer = pq.ParquetWriter(self.path, self.schema)
+        for row in rows:
+            self.dropped_columns.update(column for column in row if column not in self.schema.names)
+        arrays = [
+            self._array([_cell(row.get(field.name)) for row in rows], field.type)
+            for field in self.schema
+        ]
+        self._writer.write_table(pa.Table.from_arrays(arrays, schema=self.schema))
+
+    def column_types(self) -> Dict[str, str]:
+        return {field.name: str(field.type) for field in self.schema} if self.schema else {}
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        elif not os.path.exists(self.path):
+            # No rows: still leave an (empty) file behind
+            pq.write_table(pa.table({}), self.path)
+
+class ExportSink:
+    """Flatten pages of result rows and stream them into a CSV or Parquet writer"""
+
+    def __init__(self, path: str, export_format: str):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.format = export_format
+        self.writer = ParquetExportWriter(path) if export_format == "parquet" else CsvExportWriter(path)
+        self.rows = 0
+
+    def write_page(self, rows: List[Any]) -> None:
+        self.writer.write([flatten_row(row) for row in rows])
+        self.rows += len(rows)
+
+    def close(self) -> Dict[str, Any]:
+        """Close the file and summarize what was written"""
+        self.writer.close()
+        summary = {
+            "path": self.path,
+            "format": self.format,
+            "row_count": self.rows,
+            "file_size_bytes": os.path.getsize(self.path) if os.path.exists(self.path) else 0,
+            "columns": self.writer.column_types()
+        }
+        if self.writer.dropped_columns:
+            summary["dropped_columns"] = sorted(self.writer.dropped_columns)
+        if getattr(self.writer, "coerced_values", 0):
+            summary["values_written_as_null"] = self.writer.coerced_values
+        return summary
@@ -0,0 +1,152 @@
+"""
+Server-side store for large query results
+
+Results too large to return in full are kept here under an opaque handle so
+later tool calls can page, filter and project them without running the query
+again. The store is an LRU bounded by entry count and total rows.
+"""
+
+import secrets
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional
+
+try:
+    from .json_normalizer import flatten_row
+except ImportError:
+    from json_normalizer import flatten_row
+
+FILTER_OPERATORS = ("eq", "ne", "gt", "gte", "lt", "lte", "contains", "in")
+
+class StoredResult:
+    """Rows of one query result plus where they came from"""
+
+    def __init__(self, handle: str, rows: List[Any], source: Dict[str, Any]):
+        self.handle = handle
+        self.rows = rows
+        self.source = source
+        self.created_at = time.time()
+        self._columns: Optional[List[str]] = None
+
+    def flat_rows(self, start: int = 0, stop: Optional[int] = None) -> Iterable[Dict[str, Any]]:
+        """Flattened rows in ``[start, stop)``, flattened on demand"""
+        for row in self.rows[start:stop]:
+            yield flatten_row(row)
+
+    @property
+    def columns(self) -> List[str]:
+        if self._columns is None:
+            columns: Dict[str, None] = {}
+            for row in self.flat_rows():
+                columns.update(dict.fromkeys(row))
+            self._columns = list(columns)
+        return self._columns
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "result_handle": self.handle,
+            "total_rows": len(self.rows),
+            "columns": self.columns,
+            "source": self.source
+        }
+
+def _matches(value: Any, condition: Any) -> bool:
+    """Whether a column value satisfies one filter condition"""
+    if not isinstance(condition, dict):
+        return value == condition
+    try:
+        for operator, expected in condition.items():
+            if operator == "eq" and not value == expected:
+                return False
+            if operator == "ne" and not value != expected:
+                return False
+            if operator == "gt" and not (value is not None and value > expected):
+                return False
+            if operator == "gte" and not (value is not None and value >= expected):
+                return False
+            if operator == "lt" and not (value is not None and value < expected):
+                return False
+            if operator == "lte" and not (value is not None and value <= expected):
+                return False
+            if operator == "contains" and not (value is not None and str(expected).lower() in str(value).lower()):
+                return False
+            if operator == "in" and value not in expected:
+                return False
+    except TypeError:
+        # Values that cannot be compared (e.g. a string against a number) do not match
+        return False
+    return True
+
+def validate_filters(filters: Optional[Dict[str, Any]]) -> Optional[str]:
+    """An error message for malformed filters, or None"""
+    for column, condition in (filters or {}).items():
+        if isinstance(condition, dict):
+            unknown = [op for op in condition if op not in FILTER_OPERATORS]
+            if unknown:
+                return f"Unknown filter operator(s) {unknown} for '{column}'; use one of {list(FILTER_OPERATORS)}"
+            if "in" in condition and not isinstance(condition["in"], (list, tuple)):
+                return f"The 'in' filter for '{column}' needs a list of values"
+    return None
+
+def filter_rows(rows: Iterable[Dict[str, Any]], filters: Optional[Dict[str, Any]]) -> Iterable[Dict[str, Any]]:
+    """Flat rows matching every ``column: value`` or ``column: {operator: value}`` filter"""
+    filters = filters or {}
+    for row in rows:
+        if all(_matches(row.get(column), condition) for column, condition in filters.items()):
+            yield row
+
+def project_row(row: Dict[str, Any], fields: Optional[List[str]]) -> Dict[str, Any]:
+    """Keep only ``fields`` (all columns when no fields are given)"""
+    if not fields:
+        return row
+    return {field: row.get(field) for field in fields}
+
+class ResultStore:
+    """LRU of stored results bounded by entry count and total row count"""
+
+    def __init__(self, max_entries: int = 16, max_total_rows: int = 200000):
+        self.max_entries = max(1, max_entries)
+        self.max_total_rows = max_total_rows
+        self._results: "OrderedDict[str, StoredResult]" = OrderedDict()
+        self._total_rows = 0
+        self.stored = 0
+        self.evictions = 0
+        self.hits = 0
+        self.misses = 0
+
+    def put(self, rows: List[Any], source: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """Store ``rows`` and return their handle (None if the result is larger than the whole store)"""
+        if len(rows) > self.max_total_rows:
+            return None
+        handle = f"res_{secrets.token_hex(8)}"
+        self._results[handle] = StoredResult(handle, rows, source or {})
+        self._total_rows += len(rows)
+        self.stored += 1
+        while len(self._results) > self.max_entries or self._total_rows > self.max_total_rows:
+            _, evicted = self._results.popitem(last=False)
+            self._total_rows -= len(evicted.rows)
+            self.evictions += 1
+        return handle
+
+    def get(self, handle: str) -> Optional[StoredResult]:
+        """The stored result for ``handle``, marking it recently used"""
+        result = self._results.get(handle)
+        if result is None:
+            self.misses += 1
+            return None
+        self._results.move_to_end(handle)
+        self.hits += 1
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Store occupancy for the stats tool"""
+        return {
+            "results": len(self._results),
+            "max_entries": self.max_entries,
+            "total_rows": self._total_rows,
+            "max_total_rows": self.max_total_rows,
+            "stored": self.stored,
+            "evictions": self.evictions,
+            "hits": self.hits,
+            "misses": self.misses
+        }
@@ -0,0 +1,83 @@
+"""
+Persistent, versioned cache for GraphQL introspection results
+
+The full introspection query is large and deeply nested, and with stdio every
+MCP session can start a new server process. The cache keeps one JSON file per
+endpoint holding the introspection result, a hash of the schema and the time
+it was fetched, so a cold process answers schema tools with a file read.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Dict, Optional
+
+# Bump when the file layout changes so old files are ignored instead of misread
+CACHE_FORMAT_VERSION = 1
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "opengov-mcp")
+
+def schema_hash(schema: Dict[str, Any]) -> str:
+    """Stable content hash of an introspection result"""
+    encoded = json.dumps(schema, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+class SchemaDiskCache:
+    """Introspection result cache stored as one file per GraphQL endpoint"""
+
+    def __init__(self, endpoint: str, cache_dir: Optional[str] = None, ttl_seconds: float = 86400.0):
+        self.endpoint = endpoint
+        self.cache_dir = os.path.expanduser(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+        self.ttl_seconds = ttl_seconds
+        endpoint_key = hashlib.sha256(endpoint.encode("utf-8")).hexdigest()[:16]
+        self.path = os.path.join(self.cache_dir, f"graphql_schema_{endpoint_key}.json")
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """Read the cache entry, or None when missing, unreadable or from another version"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if not isinstance(entry, dict) or entry.get("version") != CACHE_FORMAT_VERSION:
+            return None
+        if entry.get("endpoint") != self.endpoint or not isinstance(entry.get("schema"), dict):
+            return None
+        return entry
+
+    def save(self, schema: Dict[str, Any], digest: Optional[str] = None) -> Optional[str]:
+        """Write the schema atomically and return its hash (None when the write failed)"""
+        digest = digest or schema_hash(schema)
+        entry = {
+            "version": CACHE_FORMAT_VERSION,
+            "endpoint": self.endpoint,
+            "schema_hash": digest,
+            "fetched_at": time.time(),
+            "schema": schema
+        }
+        tmp_path = None
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Write to a temp file first so concurrent readers never see a partial file
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=".schema-", suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+        except (OSError, TypeError, ValueError) as e:
+            print(f"⚠️ Could not write schema cache {self.path}: {e}", file=sys.stderr)
+            if tmp_path and os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            return None
+        return digest
+
+    def age(self, entry: Dict[str, Any]) -> float:
+        """Seconds since the entry was fetched"""
+        return max(0.0, time.time() - float(entry.get("fetched_at", 0)))
+
+    def is_fresh(self, entry: Dict[str, Any]) -> bool:
+        """Whether the entry is still within its TTL"""
+        return self.age(entry) < self.ttl_seconds
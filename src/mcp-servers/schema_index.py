@@ -0,0 +1,406 @@
+"""
+Compiled index over a GraphQL introspection result
+
+Built once per schema version, the index answers the schema tools with
+dictionary lookups instead of scanning ``__schema.types`` on every call:
+types by name and kind, precomputed query/mutation signatures, the sorted
+type listing and SDL fragments rendered once per type. A ranked full-text
+search over type, field and argument names and descriptions is built on
+first use.
+"""
+
+import bisect
+import heapq
+import math
+import re
+from typing import Any, Dict, List, Optional
+
+def format_type_ref(type_ref: Dict) -> str:
+    """Format a type reference as SDL"""
+    if type_ref["kind"] == "NON_NULL":
+        return f"{format_type_ref(type_ref['ofType'])}!"
+    elif type_ref["kind"] == "LIST":
+        return f"[{format_type_ref(type_ref['ofType'])}]"
+    else:
+        return type_ref["name"]
+
+def format_field_as_sdl(field: Dict) -> str:
+    """Format a field as SDL"""
+    name = field["name"]
+    type_str = format_type_ref(field["type"])
+    args = field.get("args", [])
+
+    if args:
+        arg_strs = []
+        for arg in args:
+            arg_str = f"{arg['name']}: {format_type_ref(arg['type'])}"
+            if arg.get("defaultValue"):
+                arg_str += f" = {arg['defaultValue']}"
+            arg_strs.append(arg_str)
+        return f"{name}({', '.join(arg_strs)}): {type_str}"
+    else:
+        return f"{name}: {type_str}"
+
+def format_input_field_as_sdl(field: Dict) -> str:
+    """Format an input field as SDL"""
+    name = field["name"]
+    type_str = format_type_ref(field["type"])
+
+    result = f"{name}: {type_str}"
+    if field.get("defaultValue"):
+        result += f" = {field['defaultValue']}"
+
+    return result
+
+def format_type_as_sdl(type_info: Dict) -> str:
+    """Format a single type as SDL"""
+    kind = type_info["kind"]
+    name = type_info["name"]
+    description = type_info.get("description")
+
+    sdl = ""
+    if description:
+        sdl += f'"""{description}"""\n'
+
+    if kind == "OBJECT":
+        interfaces = type_info.get("interfaces") or []
+        implements = ""
+        if interfaces:
+            interface_names = [iface["name"] for iface in interfaces]
+            implements = f" implements {' & '.join(interface_names)}"
+
+        sdl += f"type {name}{implements} {{\n"
+        for field in type_info.get("fields") or []:
+            sdl += f"  {format_field_as_sdl(field)}\n"
+        sdl += "}"
+
+    elif kind == "INPUT_OBJECT":
+        sdl += f"input {name} {{\n"
+        for field in type_info.get("inputFields") or []:
+            sdl += f"  {format_input_field_as_sdl(field)}\n"
+        sdl += "}"
+
+    elif kind == "ENUM":
+        sdl += f"enum {name} {{\n"
+        for value in type_info.get("enumValues") or []:
+            if value.get("description"):
+                sdl += f'  """{value["description"]}"""\n'
+            sdl += f"  {value['name']}\n"
+        sdl += "}"
+
+    elif kind == "INTERFACE":
+        sdl += f"interface {name} {{\n"
+        for field in type_info.get("fields") or []:
+            sdl += f"  {format_field_as_sdl(field)}\n"
+        sdl += "}"
+
+    elif kind == "UNION":
+        possible_types = type_info.get("possibleTypes") or []
+        if possible_types:
+            type_names = [t["name"] for t in possible_types]
+            sdl += f"union {name} = {' | '.join(type_names)}"
+
+    elif kind == "SCALAR":
+        sdl += f"scalar {name}"
+
+    return sdl
+
+def _truncate(text: Optional[str], limit: int) -> Optional[str]:
+    if text and len(text) > limit:
+        return text[:limit] + "..."
+    return text
+
+# Splits identifiers at case changes and digits: "budgetActualsV2" -> budget, Actuals, V, 2
+_IDENTIFIER_PART = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+")
+
+# Weight of a token by where it appears in a search document
+NAME_WEIGHT = 3.0
+ARGUMENT_WEIGHT = 1.5
+DESCRIPTION_WEIGHT = 1.0
+PARENT_WEIGHT = 0.5
+
+def _stem(token: str) -> str:
+    """Fold simple plurals so "vendors" matches "vendor" """
+    if len(token) > 3 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 3 and token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        return token[:-1]
+    return token
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercased, plural-folded tokens of text and camelCase/snake_case identifiers"""
+    return [_stem(part.lower()) for part in _IDENTIFIER_PART.findall(text or "")]
+
+class SchemaSearchIndex:
+    """Inverted index over types, fields, arguments and descriptions with TF-IDF ranking"""
+
+    def __init__(self, index: "SchemaIndex"):
+        self.documents: List[Dict[str, Any]] = []
+        self.postings: Dict[str, Dict[int, float]] = {}
+        root_kinds = {index.query_type_name: "query", index.mutation_type_name: "mutation"}
+
+        for name, type_info in index.types.items():
+            values = " ".join(value["name"] for value in type_info.get("enumValues") or [])
+            self._add(
+                {"kind": "type", "name": name, "type_kind": type_info["kind"],
+                 "signature": f"{type_info['kind'].lower()} {name}", "description": type_info.get("description")},
+                [(name, NAME_WEIGHT), (type_info.get("description"), DESCRIPTION_WEIGHT), (values, DESCRIPTION_WEIGHT)]
+            )
+            field_kind = root_kinds.get(name, "field")
+            for field in type_info.get("fields") or []:
+                arguments = " ".join(f"{arg['name']} {arg.get('description') or ''}" for arg in field.get("args", []))
+                self._add(
+                    {"kind": field_kind, "name": field["name"] if field_kind != "field" else f"{name}.{field['name']}",
+                     "signature": format_field_as_sdl(field), "description": field.get("description")},
+                    [(field["name"], NAME_WEIGHT), (arguments, ARGUMENT_WEIGHT),
+                     (field.get("description"), DESCRIPTION_WEIGHT), (name if field_kind == "field" else "", PARENT_WEIGHT)]
+                )
+            for field in type_info.get("inputFields") or []:
+                self._add(
+                    {"kind": "field", "name": f"{name}.{field['name']}",
+                     "signature": format_input_field_as_sdl(field), "description": field.get("description")},
+                    [(field["name"], NAME_WEIGHT), (field.get("description"), DESCRIPTION_WEIGHT), (name, PARENT_WEIGHT)]
+                )
+
+        self.vocabulary = sorted(self.postings)
+
+    def _add(self, document: Dict[str, Any], texts: List) -> None:
+        doc_id = len(self.documents)
+        self.documents.append(document)
+        weights: Dict[str, float] = {}
+        for text, weight in texts:
+            # Each token counts once per part so long descriptions do not dominate
+            for token in set(tokenize(text)):
+                weights[token] = max(weights.get(token, 0.0), weight)
+        for token, weight in weights.items():
+            self.postings.setdefault(token, {})[doc_id] = weight
+
+    def _expand(self, token: str) -> Dict[str, float]:
+        """Index tokens matching a query token: exact, else prefixes of 3+ characters at half weight"""
+        if token in self.postings:
+            return {token: 1.0}
+        if len(token) < 3:
+            return {}
+        start = bisect.bisect_left(self.vocabulary, token)
+        matches = {}
+        for candidate in self.vocabulary[start:]:
+            if not candidate.startswith(token):
+                break
+            matches[candidate] = 0.5
+        return matches
+
+    def search(self, query: str, limit: int = 10, kind: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Top ``limit`` documents for ``query``, optionally of one kind (query, mutation, type, field)"""
+        query_tokens = list(dict.fromkeys(tokenize(query)))
+        if not query_tokens:
+            return []
+        total = len(self.documents)
+        scores: Dict[int, float] = {}
+        matched: Dict[int, int] = {}
+        for query_token in query_tokens:
+            seen = set()
+            for token, factor in self._expand(query_token).items():
+                postings = self.postings[token]
+                idf = math.log(1 + total / len(postings))
+                for doc_id, weight in postings.items():
+                    scores[doc_id] = scores.get(doc_id, 0.0) + weight * idf * factor
+                    seen.add(doc_id)
+            for doc_id in seen:
+                matched[doc_id] = matched.get(doc_id, 0) + 1
+
+        compact = re.sub(r"[^a-z0-9]", "", query.lower())
+        ranked = []
+        for doc_id, score in scores.items():
+            document = self.documents[doc_id]
+            if kind and document["kind"] != kind:
+                continue
+            # Favour documents matching more of the query, root operations and exact names
+            score *= matched[doc_id] / len(query_tokens)
+            if document["kind"] in ("query", "mutation"):
+                score *= 1.3
+            if document["name"].rsplit(".", 1)[-1].lower() == compact:
+                score *= 2
+            ranked.append((score, -doc_id))
+
+        results = []
+        for score, negative_id in heapq.nlargest(max(limit, 1), ranked):
+            document = dict(self.documents[-negative_id])
+            document["description"] = _truncate(document.get("description"), 150)
+            document["score"] = round(score, 3)
+            results.append(document)
+        return results
+
+def is_introspection_result(schema_data: Any) -> bool:
+    """Whether ``schema_data`` is a usable introspection response"""
+    return isinstance(schema_data, dict) and "data" in schema_data and "__schema" in (schema_data["data"] or {})
+
+class SchemaIndex:
+    """Lookup structures compiled from one introspection result.
+
+    Type entries reference the introspection dicts rather than copying them,
+    so the index adds little memory on top of the cached schema. A partial
+    schema (names and kinds only) can be indexed too and completed type by
+    type with ``add_type``.
+    """
+
+    def __init__(self, schema_data: Dict, schema_hash: Optional[str] = None):
+        schema = schema_data["data"]["__schema"]
+        self.schema_data = schema_data
+        self.schema_hash = schema_hash
+
+        self.query_type_name = (schema.get("queryType") or {}).get("name")
+        self.mutation_type_name = (schema.get("mutationType") or {}).get("name")
+        self.subscription_type_name = (schema.get("subscriptionType") or {}).get("name")
+
+        # Types by name (introspection order) and names by kind, skipping __ types
+        self.types: Dict[str, Dict] = {}
+        self.names_by_kind: Dict[str, List[str]] = {}
+        for type_info in schema.get("types", []):
+            name = type_info["name"]
+            if name.startswith("__"):
+                continue
+            self.types[name] = type_info
+            self.names_by_kind.setdefault(type_info["kind"], []).append(name)
+        self.type_counts = {kind: len(names) for kind, names in self.names_by_kind.items()}
+
+        self._operations = {
+            "query": self._build_operations(self.query_type_name),
+            "mutation": self._build_operations(self.mutation_type_name)
+        }
+
+        self._type_listing: Optional[List[Dict]] = None
+        self._listing_by_kind: Dict[str, List[Dict]] = {}
+        self._sdl: Dict[str, str] = {}
+        self._full_sdl: Optional[str] = None
+        self._search: Optional[SchemaSearchIndex] = None
+
+    def _build_operations(self, root_type_name: Optional[str]) -> Optional[List[Dict]]:
+        """Precompute operation signatures for a root type (None when it is missing)"""
+        root = self.types.get(root_type_name) if root_type_name else None
+        if root is None:
+            return None
+        return [
+            {
+                "name": field["name"],
+                "description": field.get("description"),
+                "return_type": format_type_ref(field["type"]),
+                "arguments": [
+                    {
+                        "name": arg["name"],
+                        "type": format_type_ref(arg["type"]),
+                        "description": arg.get("description"),
+                        "default_value": arg.get("defaultValue")
+                    }
+                    for arg in field.get("args", [])
+                ]
+            }
+            for field in root.get("fields") or []
+        ]
+
+    def get_type(self, name: str) -> Optional[Dict]:
+        """Introspection entry for a type"""
+        return self.types.get(name)
+
+    def is_resolved(self, name: str) -> bool:
+        """Whether the full definition of a type (not just its name and kind) is known"""
+        type_info = self.types.get(name)
+        # Full type entries always carry the ``fields`` key, even when it is null
+        return type_info is not None and "fields" in type_info
+
+    def add_type(self, type_info: Dict) -> None:
+        """Add or replace a fully resolved type, invalidating what depends on it"""
+        name = type_info["name"]
+        previous = self.types.get(name)
+        self.types[name] = type_info
+        if previous is None:
+            self.names_by_kind.setdefault(type_info["kind"], []).append(name)
+            self.type_counts[type_info["kind"]] = self.type_counts.get(type_info["kind"], 0) + 1
+
+        self._sdl.pop(name, None)
+        self._full_sdl = None
+        self._search = None
+        self._type_listing = None
+        self._listing_by_kind.clear()
+        if name == self.query_type_name:
+            self._operations["query"] = self._build_operations(name)
+        if name == self.mutation_type_name:
+            self._operations["mutation"] = self._build_operations(name)
+
+    def operations(self, operation_type: str = "query") -> Optional[List[Dict]]:
+        """Precomputed signatures of the root fields for ``query`` or ``mutation``"""
+        return self._operations.get(operation_type)
+
+    def operation_count(self, operation_type: str = "query") -> int:
+        return len(self._operations.get(operation_type) or [])
+
+    def type_listing(self, kind: Optional[str] = None) -> List[Dict]:
+        """Sorted type summaries, optionally for one kind"""
+        if self._type_listing is None:
+            # Sorted by kind then name, with descriptions cut for context size
+            self._type_listing = sorted(
+                (
+                    {
+                        "name": name,
+                        "kind": type_info["kind"],
+                        "description": _truncate(type_info.get("description", "No description available"), 150),
+                        "fields_count": len(type_info.get("fields") or [])
+                    }
+                    for name, type_info in self.types.items()
+                ),
+                key=lambda entry: (entry["kind"], entry["name"])
+            )
+        if not kind:
+            return self._type_listing
+        kind = kind.upper()
+        if kind not in self._listing_by_kind:
+            self._listing_by_kind[kind] = [entry for entry in self._type_listing if entry["kind"] == kind]
+        return self._listing_by_kind[kind]
+
+    def sample_types(self, count: int = 20) -> List[Dict]:
+        """First ``count`` types in introspection order with short descriptions"""
+        samples = []
+        for name, type_info in self.types.items():
+            if len(samples) >= count:
+                break
+            samples.append({
+                "name": name,
+                "kind": type_info["kind"],
+                "description": _truncate(type_info.get("description", "No description"), 100)
+            })
+        return samples
+
+    def type_sdl(self, name: str) -> Optional[str]:
+        """SDL for one resolved type, rendered once"""
+        if name not in self._sdl:
+            if not self.is_resolved(name):
+                return None
+            type_info = self.types[name]
+            self._sdl[name] = format_type_as_sdl(type_info)
+        return self._sdl[name]
+
+    def full_sdl(self) -> str:
+        """SDL for all resolved types, assembled from the per-type fragments"""
+        if self._full_sdl is None:
+            sdl_parts = []
+            schema_def_parts = []
+            if self.query_type_name:
+                schema_def_parts.append(f"query: {self.query_type_name}")
+            if self.mutation_type_name:
+                schema_def_parts.append(f"mutation: {self.mutation_type_name}")
+            if self.subscription_type_name:
+                schema_def_parts.append(f"subscription: {self.subscription_type_name}")
+            if schema_def_parts:
+                sdl_parts.append(f"schema {{\n  {chr(10).join(schema_def_parts)}\n}}")
+
+            for name in self.types:
+                type_sdl = self.type_sdl(name)
+                if type_sdl:
+                    sdl_parts.append(type_sdl)
+            self._full_sdl = "\n\n".join(sdl_parts)
+        return self._full_sdl
+
+    def search(self, query: str, limit: int = 10, kind: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Ranked matches for ``query`` across type, field and argument names and descriptions"""
+        if self._search is None:
+            self._search = SchemaSearchIndex(self)
+        return self._search.search(query, limit, kind)
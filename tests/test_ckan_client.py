@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""Test script for the shared async CKAN client"""
+
+import asyncio
+import json
+import os
+import sys
+
+# Add the project root and the MCP servers directory to the path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "src", "mcp-servers"))
+
+from aiohttp import web
+from ckan_client import CKANClient, CKANError, get_ckan_client, normalize_query
+import opengov_open_data_mcp_server as open_data
+
+DATASET = {
+    "id": "abc-123", "name": "city-budget", "title": "City Budget", "notes": "x" * 600,
+    "organization": {"title": "Finance"}, "num_resources": 1, "num_tags": 1,
+    "tags": [{"name": "budget"}], "resources": [{"name": "CSV", "format": "CSV", "url": "http://example/b.csv"}],
+    "metadata_modified": "2024-01-01T00:00:00"
+}
+
+async def _serve(calls):
+    async def package_search(request):
+        calls.append(("search", dict(request.query)))
+        await asyncio.sleep(0.05)
+        return web.json_response({"success": True, "result": {"count": 1, "results": [DATASET]}})
+
+    async def package_show(request):
+        calls.append(("show", request.query["id"]))
+        if request.query["id"] == "missing":
+            return web.json_response({"success": False, "error": {"message": "Not found"}}, status=404)
+        return web.json_response({"success": True, "result": DATASET})
+
+    app = web.Application()
+    app.router.add_get("/api/3/action/package_search", package_search)
+    app.router.add_get("/api/3/action/package_show", package_show)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    return runner, f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+
+def test_searches_are_cached_and_single_flight():
+    async def run():
+        calls = []
+        runner, base_url = await _serve(calls)
+        client = CKANClient(base_url)
+        try:
+            results = await asyncio.gather(
+                client.search_datasets("City  Budget", rows=5),
+                client.search_datasets("City Budget", rows=5),
+                client.search_datasets(" City\tBudget ", rows=5)
+            )
+            assert results[0] == results[1] == results[2]
+            assert results[0]["count"] == 1
+            assert results[0]["results"][0]["notes"] == "x" * 150 + "..."
+            assert len(calls) == 1 and calls[0][1] == {"q": "City  Budget", "rows": "5", "start": "0"}
+
+            # Case matters to Solr (field values, AND/OR), so it is part of the key
+            await client.search_datasets("tags:parks", rows=5)
+            await client.search_datasets("tags:Parks", rows=5)
+            assert [c[1]["q"] for c in calls[1:]] == ["tags:parks", "tags:Parks"]
+
+            # Different paging is a different request; rows are clamped to 100
+            await client.search_datasets("city budget", rows=500, start=-3)
+            assert calls[-1][1] == {"q": "city budget", "rows": "100", "start": "0"}
+
+            first = await client.dataset_details("city-budget")
+            await client.dataset_details("city-budget")
+            assert [c for c in calls if c[0] == "show"] == [("show", "city-budget")]
+            assert first["url"] == f"{base_url}/dataset/city-budget"
+            assert first["tags"] == ["budget"]
+
+            try:
+                await client.dataset_details("missing")
+                assert False, "expected CKANError"
+            except CKANError as e:
+                assert "404" in str(e)
+            assert client.stats()["cache"]["joined_in_flight"] == 2
+        finally:
+            await client.close()
+            await runner.cleanup()
+
+    asyncio.run(run())
+
+def test_mcp_tools_use_the_shared_client():
+    async def run():
+        calls = []
+        runner, base_url = await _serve(calls)
+        try:
+            assert get_ckan_client(base_url) is get_ckan_client(base_url + "/")
+            result = json.loads(await open_data.search_ckan_datasets("budget", base_url=base_url))
+            assert result["results"][0]["id"] == "abc-123"
+            details = json.loads(await open_data.get_ckan_dataset_details("city-budget", base_url=base_url))
+            assert details["organization_title"] == "Finance"
+            await open_data.search_ckan_datasets(" budget ", base_url=base_url)
+            assert len(calls) == 2
+        finally:
+            await get_ckan_client(base_url).close()
+            await runner.cleanup()
+
+    asyncio.run(run())
+
+def test_normalize_query():
+    assert normalize_query("  Police\tIncidents  2024 ") == "Police Incidents 2024"
+    assert normalize_query("a AND b") != normalize_query("a and b")
+    assert normalize_query(None) == ""
+
+if __name__ == "__main__":
+    test_searches_are_cached_and_single_flight()
+    test_mcp_tools_use_the_shared_client()
+    test_normalize_query()
+    print("✅ CKAN client tests passed")
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""Test script for the local CKAN catalog index"""
+
+import asyncio
+import os
+import sys
+import tempfile
+
+# Add the MCP servers directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "mcp-servers"))
+
+from aiohttp import web
+import ckan_index
+from ckan_client import CKANClient
+from ckan_index import CKANCatalogIndex, index_path
+
+def _dataset(i, title, notes="", tags=(), formats=(), modified="2024-01-01T00:00:00"):
+    return {
+        "id": f"ds-{i}", "name": f"dataset-{i}", "title": title, "notes": notes,
+        "organization": {"title": "Finance"}, "tags": [{"name": tag} for tag in tags],
+        "resources": [{"format": fmt} for fmt in formats], "metadata_modified": modified
+    }
+
+CATALOG = [
+    _dataset(1, "City Budget", "Annual appropriations", tags=["finance"], formats=["CSV"]),
+    _dataset(2, "Police Incidents", "Reported incidents, including budget overruns", formats=["JSON"]),
+    _dataset(3, "Street Trees", "Tree inventory", tags=["environment"], formats=["GeoJSON"],
+             modified="2024-02-01T00:00:00"),
+    _dataset(4, "Building Permits", "Permits issued", formats=["CSV"], modified="2024-03-01T00:00:00"),
+    _dataset(5, "Parking Citations", "Tickets issued by parking enforcement", modified="2024-03-05T00:00:00"),
+]
+
+async def _serve(catalog, calls):
+    async def package_search(request):
+        query = dict(request.query)
+        calls.append(query)
+        datasets = sorted(catalog, key=lambda d: d["metadata_modified"])
+        if "fq" in query:
+            since = query["fq"].split("[", 1)[1].split(" TO", 1)[0].rstrip("Z")
+            datasets = [d for d in datasets if d["metadata_modified"] >= since]
+        start, rows = int(query["start"]), int(query["rows"])
+        return web.json_response({"success": True, "result": {
+            "count": len(datasets), "results": datasets[start:start + rows]
+        }})
+
+    app = web.Application()
+    app.router.add_get("/api/3/action/package_search", package_search)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    return runner, f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+
+def test_sync_pages_the_catalog_and_ranks_with_bm25():
+    async def run():
+        calls = []
+        runner, base_url = await _serve(CATALOG, calls)
+        client = CKANClient(base_url)
+        with tempfile.TemporaryDirectory() as tmp:
+            index = CKANCatalogIndex(index_path(base_url, tmp))
+            try:
+                assert not index.ready
+                summary = await index.sync(client)
+                assert summary["full"] and summary["fetched"] == 5 and summary["removed"] == 0
+                assert [c["start"] for c in calls] == ["0", "2", "4"]
+                assert calls[0]["sort"] == "metadata_modified asc" and "fq" not in calls[0]
+                assert index.ready
+
+                # A title match outranks a description match
+                result = index.search("budget")
+                assert result["count"] == 2 and result["source"] == "local_index"
+                assert [r["id"] for r in result["results"]] == ["ds-1", "ds-2"]
+
+                # Tags and resource formats are searchable; stemming matches plurals
+                assert [r["id"] for r in index.search("environment")["results"]] == ["ds-3"]
+                assert {r["id"] for r in index.search("csv")["results"]} == {"ds-1", "ds-4"}
+                assert index.search("permit")["results"][0]["id"] == "ds-4"
+
+                # All words must match when possible, otherwise any word does
+                assert index.search("city budget")["count"] == 1
+                assert index.search("budget trees")["count"] == 3
+
+                # FTS syntax in user text is treated as plain words
+                assert index.search('budget" OR NEAR(')["count"] == 2
+                assert index.search("*:*")["count"] == 5
+                assert index.search("*:*", rows=2, start=1)["results"][0]["id"] == "ds-4"
+            finally:
+                await client.close()
+                await runner.cleanup()
+
+    page_size = ckan_index.SYNC_PAGE_SIZE
+    ckan_index.SYNC_PAGE_SIZE = 2
+    try:
+        asyncio.run(run())
+    finally:
+        ckan_index.SYNC_PAGE_SIZE = page_size
+
+def test_incremental_and_full_syncs():
+    async def run():
+        calls = []
+        catalog = list(CATALOG)
+        runner, base_url = await _serve(catalog, calls)
+        client = CKANClient(base_url)
+        with tempfile.TemporaryDirectory() as tmp:
+            index = CKANCatalogIndex(index_path(base_url, tmp))
+            try:
+                await index.sync(client)
+
+                # Only datasets modified since the newest indexed one are fetched
+                catalog[0] = _dataset(1, "City Budget Amendments", modified="2024-04-01T00:00:00")
+                calls.clear()
+                summary = await index.sync(client)
+                assert not summary["full"]
+                assert calls[0]["fq"] == "metadata_modified:[2024-03-05T00:00:00Z TO *]"
+                assert summary["fetched"] == 2
+                assert index.search("amendments")["results"][0]["id"] == "ds-1"
+                assert index.stats()["datasets"] == 5
+
+                # A full sync drops datasets that are no longer in the catalog
+                del catalog[1]
+                summary = await index.sync(client, full=True)
+                assert summary["full"] and summary["removed"] == 1
+                assert index.search("incidents")["count"] == 0
+                assert index.stats()["datasets"] == 4
+            finally:
+                await client.close()
+                await runner.cleanup()
+
+    asyncio.run(run())
+
+def test_client_answers_from_the_index_once_synced():
+    async def run():
+        calls = []
+        runner, base_url = await _serve(CATALOG, calls)
+        client = CKANClient(base_url)
+        with tempfile.TemporaryDirectory() as tmp:
+            client.index = CKANCatalogIndex(index_path(base_url, tmp), sync_interval=3600)
+            try:
+                # Before the first sync completes, searches go to the portal
+                live = await client.search_datasets("budget")
+                assert "source" not in live
+                while not client.index.ready:
+                    await asyncio.sleep(0.01)
+
+                requests = client.requests
+                result = await client.search_datasets("budget", rows=1)
+                assert result["source"] == "local_index" and result["count"] == 2
+                assert result["results"][0]["id"] == "ds-1"
+                assert client.requests == requests
+                assert client.stats()["index"]["datasets"] == 5
+                assert (await client.search_datasets("*:*"))["source"] == "local_index"
+
+                # Solr field syntax keeps its portal meaning
+                fielded = await client.search_datasets("tags:finance")
+                assert "source" not in fielded and client.requests == requests + 1
+
+                # Readiness is known from the file, without waiting for another sync
+                assert CKANCatalogIndex(client.index.path).ready
+            finally:
+                client.index._task.cancel()
+                await client.close()
+                await runner.cleanup()
+
+    asyncio.run(run())
+
+if __name__ == "__main__":
+    test_sync_pages_the_catalog_and_ranks_with_bm25()
+    test_incremental_and_full_syncs()
+    test_client_answers_from_the_index_once_synced()
+    print("✅ CKAN index tests passed")
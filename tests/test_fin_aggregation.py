@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""Test script for server-side aggregation of FIN query results"""
+
+import asyncio
+import os
+import sys
+
+# Add the MCP servers directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "mcp-servers"))
+
+os.environ.setdefault("OG_FIN_BEARER_TOKEN", "test-token")
+
+from graphql import build_schema, get_introspection_query, graphql_sync
+import opengov_fin_mcp_server as fin
+from aggregation import aggregate_rows, parse_metrics
+
+SCHEMA = build_schema("""
+type Query {
+  expenses: [Expense]
+  ledger(offset: Int, limit: Int): [Expense]
+  recent(limit: Int): [Expense]
+}
+type Mutation { deleteExpense(id: ID!): Boolean }
+type Expense { id: ID! amount: Float department: Department }
+type Department { name: String }
+""")
+
+DEPARTMENTS = ["Parks", "Police", "Fire", "Library"]
+EXPENSES = [
+    {"id": str(i), "amount": None if i % 10 == 9 else float(i), "department": {"name": DEPARTMENTS[i % 4]}}
+    for i in range(1000)
+]
+
+class OfflineClient(fin.OpenGovFINGraphQLClient):
+    """FIN client with a local schema that counts the requests it would send"""
+
+    def __init__(self):
+        super().__init__()
+        self.schema_mode = "full"
+        self.schema_cache = None
+        self.query_cache = None
+        self.allow_mutations = True
+        self.requests = 0
+
+    async def _fetch_schema(self):
+        return {"data": graphql_sync(SCHEMA, get_introspection_query()).data}
+
+    async def make_graphql_request(self, query, variables=None):
+        self.requests += 1
+        return {"data": {"expenses": EXPENSES}}
+
+ROOT = {
+    "expenses": EXPENSES,
+    "ledger": lambda info, offset=0, limit=10: EXPENSES[offset:offset + limit],
+    "recent": lambda info, limit=None: EXPENSES[:limit]
+}
+
+class SchemaClient(OfflineClient):
+    """Offline client that executes queries against the local schema"""
+
+    async def make_graphql_request(self, query, variables=None):
+        self.requests += 1
+        return {"data": graphql_sync(SCHEMA, query, root_value=ROOT, variable_values=variables).data}
+
+def _expected(department):
+    amounts = [e["amount"] for e in EXPENSES if e["department"]["name"] == department and e["amount"] is not None]
+    return {"department.name": department, "count": 250, "sum_amount": sum(amounts),
+            "mean_amount": round(sum(amounts) / len(amounts), 6), "max_amount": max(amounts)}
+
+def test_aggregate_rows_matches_python():
+    metrics, error = parse_metrics(["count", "sum:amount", "mean:amount", "max:amount"])
+    assert error is None
+    rows = [{"id": e["id"], "amount": e["amount"], "department.name": e["department"]["name"]} for e in EXPENSES]
+    result = aggregate_rows(rows, ["department.name"], metrics, sort_by="sum_amount", top_k=2)
+    expected = sorted((_expected(d) for d in DEPARTMENTS), key=lambda g: -g["sum_amount"])[:2]
+    assert result["groups"] == expected
+    assert result["group_count"] == 4 and result["rows_aggregated"] == 1000
+
+    assert parse_metrics(["median:amount"])[1].startswith("Unknown metric")
+    assert "needs a column" in parse_metrics(["sum"])[1]
+
+def test_list_valued_group_columns():
+    rows = [{"tags": ["a", "b"], "amount": 1.0}, {"tags": ["a", "b"], "amount": 2.0},
+            {"tags": ["c"], "amount": 5.0}, {"tags": {"x": 1}, "amount": 1.0}]
+    metrics, _ = parse_metrics(["count", "sum:amount"])
+    result = aggregate_rows(rows, ["tags"], metrics, sort_by="sum_amount")
+    assert result["groups"] == [
+        {"tags": ["c"], "count": 1, "sum_amount": 5.0},
+        {"tags": ["a", "b"], "count": 2, "sum_amount": 3.0},
+        {"tags": {"x": 1}, "count": 1, "sum_amount": 1.0}
+    ]
+
+def test_aggregate_tool_uses_handles_and_queries():
+    original = fin.client
+    fin.client = client = OfflineClient()
+    try:
+        async def check():
+            result = await fin.aggregate_result(
+                group_by=["department.name"], metrics=["count", "sum:amount"],
+                query="{ expenses { id amount department { name } } }",
+                filters={"amount": {"gte": 500}}, sort_by="sum_amount", descending=False
+            )
+            sums = {d: sum(e["amount"] for e in EXPENSES if e["department"]["name"] == d and (e["amount"] or 0) >= 500)
+                    for d in DEPARTMENTS}
+            assert [g["department.name"] for g in result["groups"]] == sorted(DEPARTMENTS, key=sums.get)
+            assert sum(g["count"] for g in result["groups"]) == 450
+
+            # The fetched rows were stored, so follow-up aggregations do not hit the API
+            total = await fin.aggregate_result(metrics=["count:amount", "min:amount"], result_handle=result["result_handle"])
+            assert total["groups"] == [{"count_amount": 900, "min_amount": 0.0}]
+            assert client.requests == 1
+
+            assert "Unknown column" in (await fin.aggregate_result(["dept"], query="{ expenses { id } }"))["error"]
+            assert "read-only" in (await fin.aggregate_result(query="mutation { deleteExpense(id: 1) }"))["error"]
+
+        asyncio.run(check())
+    finally:
+        fin.client = original
+
+def test_aggregate_query_reports_whether_totals_are_complete():
+    original = fin.client
+    fin.client = client = SchemaClient()
+    client.aggregate_page_size = 300
+    try:
+        async def check():
+            # List fields are paged to the end before grouping
+            result = await fin.aggregate_result(metrics=["count"], query="{ ledger { id } }")
+            assert result["groups"] == [{"count": 1000}]
+            assert result["complete"] is True
+            assert result["query_info"]["pagination"] == "offset"
+
+            client.paginate_max_items = 400
+            result = await fin.aggregate_result(metrics=["count"], query="{ ledger { id } }")
+            assert result["groups"] == [{"count": 400}] and result["complete"] is False
+            assert result["query_info"]["stopped_reason"] == "item_budget"
+
+            # A query cut down to a page limit by the cost check is partial too
+            client.query_cost.max_cost = 500
+            result = await fin.aggregate_result(metrics=["count"], query="{ recent { id amount } }")
+            assert result["complete"] is False and result["query_info"]["truncated"] is True
+            assert result["query_cost"]["rewritten"] is True
+            assert result["groups"][0]["count"] == client.query_cost.default_page_limit
+
+        asyncio.run(check())
+    finally:
+        fin.client = original
+
+if __name__ == "__main__":
+    test_aggregate_rows_matches_python()
+    test_list_valued_group_columns()
+    test_aggregate_tool_uses_handles_and_queries()
+    test_aggregate_query_reports_whether_totals_are_complete()
+    print("✅ FIN aggregation tests passed")
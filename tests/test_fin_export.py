@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""Test script for streaming FIN query results to CSV and Parquet files"""
+
+import asyncio
+import csv
+import os
+import sys
+import tempfile
+
+# Add the MCP servers directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "mcp-servers"))
+
+os.environ.setdefault("OG_FIN_BEARER_TOKEN", "test-token")
+
+from graphql import build_schema, get_introspection_query, graphql_sync
+import opengov_fin_mcp_server as fin
+from result_export import export_path
+
+SCHEMA = build_schema("""
+type Query {
+  payments(offset: Int, limit: Int): [Payment]
+  recent(limit: Int): [Payment]
+  fund(code: String!): Fund
+}
+type Payment { id: ID! amount: Float vendor: Vendor tags: [String] }
+type Vendor { name: String }
+type Fund { code: String accounts: [String] }
+""")
+
+PAYMENTS = [{"id": str(i), "amount": i / 4, "vendor": {"name": f"Vendor {i % 7}"}, "tags": ["a", str(i)]} for i in range(1234)]
+
+ROOT = {
+    "payments": lambda info, offset=0, limit=10: PAYMENTS[offset:offset + limit],
+    "recent": lambda info, limit=None: PAYMENTS[:limit],
+    "fund": lambda info, code: {"code": code, "accounts": ["4000", "5000"]}
+}
+
+class ExportClient(fin.OpenGovFINGraphQLClient):
+    """FIN client executing against a local graphql-core schema"""
+
+    def __init__(self, export_dir):
+        super().__init__()
+        self.schema_mode = "full"
+        self.schema_cache = None
+        self.query_cache = None
+        self.export_dir = export_dir
+
+    async def _fetch_schema(self):
+        return {"data": graphql_sync(SCHEMA, get_introspection_query()).data}
+
+    async def make_graphql_request(self, query, variables=None):
+        result = graphql_sync(SCHEMA, query, root_value=ROOT, variable_values=variables)
+        return {"data": result.data}
+
+class RecordingContext:
+    """Stands in for the MCP request context and records progress notifications"""
+
+    def __init__(self):
+        self.progress = []
+
+    async def report_progress(self, progress, total=None, message=None):
+        self.progress.append(progress)
+
+def _run_with_client(client, check):
+    original = fin.client
+    fin.client = client
+    try:
+        asyncio.run(check())
+    finally:
+        fin.client = original
+
+def test_export_paths_stay_in_export_dir():
+    assert export_path("/exports", "../../etc/passwd", "csv") == "/exports/passwd.csv"
+    assert export_path("/exports", "budget.parquet", "parquet") == "/exports/budget.parquet"
+    assert export_path("/exports", None, "csv").startswith("/exports/fin_export_")
+
+def test_paged_results_stream_to_csv_and_parquet():
+    with tempfile.TemporaryDirectory() as export_dir:
+        client = ExportClient(export_dir)
+
+        async def check():
+            ctx = RecordingContext()
+            summary = await fin.export_query_results("{ payments { id amount vendor { name } tags } }",
+                                                     filename="payments", page_size=100, ctx=ctx)
+            assert summary["path"] == os.path.join(export_dir, "payments.csv")
+            assert summary["row_count"] == 1234 and summary["query_info"]["complete"] is True
+            assert ctx.progress[-1] == 1234 and len(ctx.progress) == 13
+            with open(summary["path"], newline="") as f:
+                rows = list(csv.DictReader(f))
+            assert len(rows) == 1234
+            assert rows[5] == {"id": "5", "amount": "1.25", "vendor.name": "Vendor 5", "tags": '["a", "5"]'}
+
+            summary = await fin.export_query_results("{ payments { id amount } }", format="parquet", max_rows=250)
+            assert summary["row_count"] == 250 and summary["query_info"]["stopped_reason"] == "item_budget"
+            assert summary["columns"] == {"id": "string", "amount": "double"}
+            import pyarrow.parquet as pq
+            table = pq.read_table(summary["path"])
+            assert table.num_rows == 250 and table.column("amount").to_pylist()[4] == 1.0
+
+            # Cutting the short last page to fit max_rows is reported as truncation
+            summary = await fin.export_query_results("{ payments { id } }", filename="cut", page_size=500, max_rows=1220)
+            assert summary["row_count"] == 1220 and summary["query_info"]["complete"] is False
+
+            # Queries without pagination arguments are exported from one request
+            summary = await fin.export_query_results("{ fund(code: \"100\") { code accounts } }", filename="fund")
+            assert summary["row_count"] == 1 and summary["query_info"]["pagination"] == "none"
+            assert summary["query_info"]["complete"] is True
+
+            # A single request is incomplete when rows are cut to max_rows or the cost check added a page limit
+            summary = await fin.export_query_results("{ recent { id } }", filename="recent", max_rows=1000)
+            assert summary["row_count"] == 1000
+            assert summary["query_info"]["complete"] is False and summary["query_info"]["truncated"] is True
+            client.query_cost.max_cost = 500
+            summary = await fin.export_query_results("{ recent { id amount } }", filename="limited")
+            assert summary["row_count"] == client.query_cost.default_page_limit
+            assert summary["query_info"]["truncated"] is True and summary["query_cost"]["rewritten"] is True
+
+            assert "Unsupported export format" in (await fin.export_query_results("{ payments { id } }", format="xlsx"))["error"]
+
+        _run_with_client(client, check)
+
+if __name__ == "__main__":
+    test_export_paths_stay_in_export_dir()
+    test_paged_results_stream_to_csv_and_parquet()
+    print("✅ FIN export tests passed")
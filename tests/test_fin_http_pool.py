@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""Test script for the pooled FIN HTTP transport"""
+
+import asyncio
+import os
+import sys
+
+# Add the MCP servers directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "mcp-servers"))
+
+os.environ.setdefault("OG_FIN_BEARER_TOKEN", "test-token")
+
+from aiohttp import web
+from http_pool import PooledGraphQLTransport
+import opengov_fin_mcp_server as fin
+
+async def _serve(handler):
+    app = web.Application()
+    app.router.add_post("/graphql", handler)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}/graphql"
+
+def test_requests_share_one_session_and_respect_the_in_flight_limit():
+    async def run():
+        state = {"active": 0, "peak": 0, "ports": set()}
+
+        async def handler(request):
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+            state["ports"].add(request.transport.get_extra_info("peername")[1])
+            await asyncio.sleep(0.02)
+            state["active"] -= 1
+            return web.json_response({"data": {"echo": (await request.json())["query"]}})
+
+        runner, url = await _serve(handler)
+        transport = PooledGraphQLTransport(max_in_flight=2, backoff_seconds=0.01)
+        try:
+            results = await asyncio.gather(*(transport.post_json(url, {"query": str(i)}, {}) for i in range(8)))
+            assert [r["data"]["echo"] for r in results] == [str(i) for i in range(8)]
+            assert state["peak"] == 2
+            # Keep-alive: eight requests over the two pooled connections
+            assert len(state["ports"]) == 2
+            stats = transport.stats()
+            assert stats["requests"] == 8
+            assert stats["sessions_created"] == 1
+            assert stats["max_queued"] >= 6
+            assert stats["in_flight"] == 0 and stats["queued"] == 0
+        finally:
+            await transport.close()
+            await runner.cleanup()
+
+    asyncio.run(run())
+
+def test_transient_errors_are_retried_but_mutations_are_not():
+    async def run():
+        calls = []
+
+        async def handler(request):
+            calls.append(1)
+            if len(calls) % 2:
+                return web.Response(status=503, text="busy")
+            return web.json_response({"data": {"ok": True}})
+
+        runner, url = await _serve(handler)
+        transport = PooledGraphQLTransport(backoff_seconds=0.01)
+        try:
+            assert await transport.post_json(url, {"query": "{ ok }"}, {}) == {"data": {"ok": True}}
+            assert len(calls) == 2
+            assert transport.stats()["retries"] == 1
+
+            result = await transport.post_json(url, {"query": "mutation { ok }"}, {}, retry=False)
+            assert result["status"] == 503
+            assert result["details"] == "busy"
+            assert len(calls) == 3
+        finally:
+            await transport.close()
+            await runner.cleanup()
+
+    asyncio.run(run())
+
+def test_timeouts_and_full_queue_return_errors():
+    async def run():
+        async def handler(request):
+            await asyncio.sleep(0.5)
+            return web.json_response({"data": {}})
+
+        runner, url = await _serve(handler)
+        transport = PooledGraphQLTransport(max_in_flight=1, max_queue=1, timeout_seconds=0.1, max_retries=0)
+        try:
+            results = await asyncio.gather(*(transport.post_json(url, {"query": "{ slow }"}, {}) for _ in range(3)))
+            assert sum("timed out" in r["error"] for r in results) == 2
+            assert sum("Too many concurrent" in r["error"] for r in results) == 1
+            stats = transport.stats()
+            assert stats["timeouts"] == 2
+            assert stats["rejected"] == 1
+        finally:
+            await transport.close()
+            await runner.cleanup()
+
+    asyncio.run(run())
+
+def test_client_sends_through_the_pool_without_retrying_mutations():
+    async def run():
+        calls = []
+
+        async def handler(request):
+            calls.append(request.headers["Authorization"])
+            return web.Response(status=502, text="bad gateway")
+
+        runner, url = await _serve(handler)
+        client = fin.OpenGovFINGraphQLClient()
+        client.endpoint = url
+        client.transport.backoff_seconds = 0.01
+        try:
+            assert (await client.make_graphql_request("# approve\nmutation { approve }"))["status"] == 502
+            assert len(calls) == 1
+            assert (await client.make_graphql_request("{ vendors { id } }"))["status"] == 502
+            assert len(calls) == 1 + 1 + client.transport.max_retries
+            assert calls[0] == "Bearer test-token"
+        finally:
+            await client.transport.close()
+            await runner.cleanup()
+
+    asyncio.run(run())
+
+if __name__ == "__main__":
+    test_requests_share_one_session_and_respect_the_in_flight_limit()
+    test_transient_errors_are_retried_but_mutations_are_not()
+    test_timeouts_and_full_queue_return_errors()
+    test_client_sends_through_the_pool_without_retrying_mutations()
+    print("✅ FIN HTTP pool tests passed")
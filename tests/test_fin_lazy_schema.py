@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Test script for lazy, on-demand FIN schema type resolution"""
+
+import asyncio
+import os
+import sys
+
+# Add the MCP servers directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "mcp-servers"))
+
+os.environ.setdefault("OG_FIN_BEARER_TOKEN", "test-token")
+
+import opengov_fin_mcp_server as fin
+
+def _named(kind, name):
+    return {"kind": kind, "name": name, "ofType": None}
+
+TYPES = {
+    "Query": {"kind": "OBJECT", "name": "Query", "description": None, "interfaces": [], "inputFields": None,
+              "enumValues": None, "possibleTypes": None, "fields": [
+                  {"name": "vendor", "description": None, "type": _named("OBJECT", "Vendor"), "args": [], "isDeprecated": False}
+              ]},
+    "Vendor": {"kind": "OBJECT", "name": "Vendor", "description": "A supplier", "interfaces": [], "inputFields": None,
+               "enumValues": None, "possibleTypes": None, "fields": [
+                   {"name": "name", "description": None, "type": _named("SCALAR", "String"), "args": [], "isDeprecated": False}
+               ]}
+}
+
+class LazyClient(fin.OpenGovFINGraphQLClient):
+    """FIN client answering the lazy schema queries from canned types"""
+
+    def __init__(self):
+        super().__init__()
+        self.schema_mode = "lazy"
+        self.requests = []
+
+    async def make_graphql_request(self, query, variables=None):
+        await asyncio.sleep(0)
+        if "SchemaRoots" in query:
+            self.requests.append("roots")
+            return {"data": {"__schema": {
+                "queryType": {"name": "Query"}, "mutationType": None, "subscriptionType": None,
+                "types": [{"kind": t["kind"], "name": name, "description": t["description"]} for name, t in TYPES.items()]
+                         + [{"kind": "SCALAR", "name": "String", "description": None}]
+            }}}
+        self.requests.append(variables["name"])
+        return {"data": {"__type": TYPES.get(variables["name"])}}
+
+def test_only_root_types_are_fetched_up_front():
+    async def check():
+        client = LazyClient()
+        schema = await client.introspect_schema()
+        index = client.get_schema_index(schema)
+        assert client.requests == ["roots", "Query"]
+        assert index.operations("query")[0]["return_type"] == "Vendor"
+        assert not index.is_resolved("Vendor")
+        assert index.type_counts == {"OBJECT": 2, "SCALAR": 1}
+
+    asyncio.run(check())
+
+def test_types_resolve_once_on_demand():
+    async def check():
+        client = LazyClient()
+        first, second = await asyncio.gather(client.resolve_type("Vendor"), client.resolve_type("Vendor"))
+        assert first is second and first["description"] == "A supplier"
+        assert await client.resolve_type("Vendor") is first
+        assert client.requests.count("Vendor") == 1
+        assert client.schema_index.type_sdl("Vendor") == '"""A supplier"""\ntype Vendor {\n  name: String\n}'
+
+        missing = await client.resolve_type("Missing")
+        assert "not found" in missing["error"]
+
+    asyncio.run(check())
+
+if __name__ == "__main__":
+    test_only_root_types_are_fetched_up_front()
+    test_types_resolve_once_on_demand()
+    print("✅ FIN lazy schema tests passed")
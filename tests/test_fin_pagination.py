@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""Test script for automatic pagination of FIN GraphQL list and connection fields"""
+
+import asyncio
+import os
+import sys
+
+# Add the MCP servers directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "mcp-servers"))
+
+os.environ.setdefault("OG_FIN_BEARER_TOKEN", "test-token")
+
+from graphql import build_schema, get_introspection_query, graphql_sync
+import opengov_fin_mcp_server as fin
+
+SCHEMA = build_schema("""
+type Query {
+  transactions(fund: String, first: Int, after: String): TransactionConnection
+  vendors(status: String, offset: Int, limit: Int): [Vendor]
+  fund(code: String!): Fund
+}
+type TransactionConnection { edges: [TransactionEdge] pageInfo: PageInfo! }
+type TransactionEdge { cursor: String node: Transaction }
+type PageInfo { hasNextPage: Boolean! endCursor: String }
+type Transaction { id: ID! amount: Float }
+type Vendor { id: ID! name: String }
+type Fund { code: String }
+""")
+
+TRANSACTIONS = [{"id": str(i), "amount": float(i)} for i in range(25)]
+VENDORS = [{"id": str(i), "name": f"Vendor {i}"} for i in range(23)]
+
+def _transactions(info, fund=None, first=10, after=None):
+    start = int(after) if after else 0
+    page = TRANSACTIONS[start:start + first]
+    end = start + len(page)
+    return {
+        "edges": [{"cursor": str(start + i + 1), "node": row} for i, row in enumerate(page)],
+        "pageInfo": {"hasNextPage": end < len(TRANSACTIONS), "endCursor": str(end)}
+    }
+
+ROOT = {
+    "transactions": _transactions,
+    "vendors": lambda info, status=None, offset=0, limit=10: VENDORS[offset:offset + limit],
+    "fund": lambda info, code: {"code": code}
+}
+
+class PagingClient(fin.OpenGovFINGraphQLClient):
+    """FIN client executing against a local graphql-core schema"""
+
+    def __init__(self):
+        super().__init__()
+        self.schema_mode = "full"
+        self.schema_cache = None
+        self.query_cache = None
+        self.sent = []
+
+    async def _fetch_schema(self):
+        return {"data": graphql_sync(SCHEMA, get_introspection_query()).data}
+
+    async def make_graphql_request(self, query, variables=None):
+        self.sent.append((query, variables))
+        result = graphql_sync(SCHEMA, query, root_value=ROOT, variable_values=variables)
+        response = {"data": result.data}
+        if result.errors:
+            response["errors"] = [error.formatted for error in result.errors]
+        return response
+
+def _run_with_client(client, check):
+    original = fin.client
+    fin.client = client
+    try:
+        asyncio.run(check())
+    finally:
+        fin.client = original
+
+def test_relay_connection_follows_cursors():
+    client = PagingClient()
+
+    async def check():
+        query = "query($fund: String, $after: String) { transactions(fund: $fund, first: 3, after: $after) { edges { node { id amount } } } }"
+        result = await fin.query_graphql_all(query, {"fund": "100", "after": "20"}, page_size=10)
+        assert result["data"]["transactions"] == TRANSACTIONS
+        assert result["query_info"]["pagination"] == "cursor"
+        assert result["query_info"]["pages_fetched"] == 3
+        assert result["query_info"]["complete"] is True
+        # The caller's paging arguments are replaced, other variables are kept
+        assert all(variables["fund"] == "100" and "after" not in variables for _, variables in client.sent)
+
+        result = await fin.query_graphql_all(query, max_items=12, page_size=5)
+        assert len(result["data"]["transactions"]) == 12
+        assert result["query_info"]["stopped_reason"] == "item_budget"
+
+    _run_with_client(client, check)
+
+def test_offset_pages_are_fetched_concurrently():
+    client = PagingClient()
+    client.paginate_concurrency = 3
+
+    async def check():
+        result = await fin.query_graphql_all("{ active: vendors(status: \"A\") { id name } }", page_size=5)
+        assert result["data"]["active"] == VENDORS
+        assert result["query_info"]["pagination"] == "offset"
+        assert result["query_info"]["complete"] is True
+        # Two waves of three pages; the pages of each wave share one batched request
+        assert len(client.sent) == 2 and all("BatchedQuery" in query for query, _ in client.sent)
+
+    _run_with_client(client, check)
+
+def test_offset_paging_follows_a_server_page_cap():
+    client = PagingClient()
+    client.paginate_concurrency = 3
+    vendors = ROOT["vendors"]
+    # The server returns at most four rows whatever limit is asked for
+    ROOT["vendors"] = lambda info, status=None, offset=0, limit=10: VENDORS[offset:offset + min(limit, 4)]
+
+    async def check():
+        result = await fin.query_graphql_all("{ vendors { id } }", page_size=10)
+        assert [row["id"] for row in result["data"]["vendors"]] == [row["id"] for row in VENDORS]
+        assert result["query_info"]["complete"] is True
+
+        # No more pages are requested than the item budget needs
+        result = await fin.query_graphql_all("{ vendors { id } }", max_items=6, page_size=4)
+        assert len(result["data"]["vendors"]) == 6
+        assert result["query_info"]["pages_fetched"] == 2
+        assert result["query_info"]["stopped_reason"] == "item_budget"
+
+    try:
+        _run_with_client(client, check)
+    finally:
+        ROOT["vendors"] = vendors
+
+def test_truncated_last_page_is_not_complete():
+    client = PagingClient()
+
+    async def check():
+        # The third and last page is cut to fit the budget, so the result is incomplete
+        query = "{ transactions { edges { node { id } } } }"
+        result = await fin.query_graphql_all(query, max_items=22, page_size=10)
+        assert len(result["data"]["transactions"]) == 22
+        assert result["query_info"]["complete"] is False
+        assert result["query_info"]["stopped_reason"] == "item_budget"
+
+        result = await fin.query_graphql_all("{ vendors { id } }", max_items=21, page_size=10)
+        assert len(result["data"]["vendors"]) == 21
+        assert result["query_info"]["stopped_reason"] == "item_budget"
+
+        # A budget that exactly fits the data is still complete
+        result = await fin.query_graphql_all(query, max_items=25, page_size=10)
+        assert result["query_info"]["complete"] is True
+
+    _run_with_client(client, check)
+
+def test_unpaginated_queries_are_rejected():
+    client = PagingClient()
+
+    async def check():
+        result = await fin.query_graphql_all("{ fund(code: \"100\") { code } }")
+        assert "neither a Relay connection" in result["error"]
+        result = await fin.query_graphql_all("{ vendors { id } fund(code: \"1\") { code } }")
+        assert "exactly one root field" in result["error"]
+        result = await fin.query_graphql_all("{ vendors { missing } }")
+        assert result["error"] == "GraphQL validation failed"
+        assert client.sent == []
+
+    _run_with_client(client, check)
+
+if __name__ == "__main__":
+    test_relay_connection_follows_cursors()
+    test_offset_pages_are_fetched_concurrently()
+    test_offset_paging_follows_a_server_page_cap()
+    test_truncated_last_page_is_not_complete()
+    test_unpaginated_queries_are_rejected()
+    print("✅ FIN pagination tests passed")
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Test script for batching concurrent FIN GraphQL queries into one aliased request"""
+
+import asyncio
+import os
+import sys
+
+# Add the MCP servers directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "mcp-servers"))
+
+os.environ.setdefault("OG_FIN_BEARER_TOKEN", "test-token")
+
+from graphql import build_schema, get_introspection_query, graphql_sync, parse
+import opengov_fin_mcp_server as fin
+from query_batcher import QueryBatcher, merge_queries, split_result
+
+SCHEMA = build_schema("""
+type Query { vendors(status: String): [Vendor] fund(code: String!): Fund }
+type Vendor { id: ID! name: String }
+type Fund { code: String budget: Float actual: Float }
+""")
+
+ROOT = {
+    "vendors": lambda info, status=None: [{"id": "1", "name": f"Acme {status or 'any'}"}],
+    "fund": lambda info, code: {"code": code, "budget": 100.0, "actual": 80.0}
+}
+
+def _execute(query, variables=None):
+    result = graphql_sync(SCHEMA, query, root_value=ROOT, variable_values=variables)
+    response = {"data": result.data}
+    if result.errors:
+        response["errors"] = [error.formatted for error in result.errors]
+    return response
+
+QUERIES = [
+    ("query($s: String) { vendors(status: $s) { ...V } }  fragment V on Vendor { id name }", {"s": "ACTIVE"}),
+    ("query($code: String!) { general: fund(code: $code) { budget actual } }", {"code": "100"}),
+    ("{ vendors { ...V } } fragment V on Vendor { id }", None)
+]
+
+def test_merged_document_splits_back_to_individual_results():
+    merged_query, merged_variables, prefixes = merge_queries([parse(q) for q, _ in QUERIES], [v for _, v in QUERIES])
+    results = split_result(_execute(merged_query, merged_variables), prefixes)
+    assert results == [_execute(q, v) for q, v in QUERIES]
+
+    # Errors without a path cannot be attributed to one query
+    assert split_result({"data": None, "errors": [{"message": "too complex"}]}, prefixes) is None
+
+class BatchingClient(fin.OpenGovFINGraphQLClient):
+    """FIN client executing against a local graphql-core schema"""
+
+    def __init__(self):
+        super().__init__()
+        self.schema_mode = "full"
+        self.schema_cache = None
+        self.query_cache = None
+        self.sent = []
+        self.query_batcher = QueryBatcher(self.make_graphql_request, window_seconds=0.02)
+
+    async def _fetch_schema(self):
+        return {"data": graphql_sync(SCHEMA, get_introspection_query()).data}
+
+    async def make_graphql_request(self, query, variables=None):
+        self.sent.append(query)
+        return _execute(query, variables)
+
+def test_concurrent_tool_calls_share_one_request():
+    original = fin.client
+    fin.client = BatchingClient()
+    try:
+        async def check():
+            await fin.client.introspect_schema()
+            results = await asyncio.gather(*[fin.query_graphql(q, v) for q, v in QUERIES])
+            assert results == [_execute(q, v) for q, v in QUERIES]
+            assert len(fin.client.sent) == 1 and "BatchedQuery" in fin.client.sent[0]
+            assert fin.client.query_batcher.stats()["requests_saved"] == 2
+
+        asyncio.run(check())
+    finally:
+        fin.client = original
+
+if __name__ == "__main__":
+    test_merged_document_splits_back_to_individual_results()
+    test_concurrent_tool_calls_share_one_request()
+    print("✅ FIN query batching tests passed")
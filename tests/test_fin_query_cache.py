@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Test script for the FIN read-only query result cache"""
+
+import asyncio
+import os
+import sys
+
+# Add the MCP servers directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "mcp-servers"))
+
+os.environ.setdefault("OG_FIN_BEARER_TOKEN", "test-token")
+
+from graphql import build_schema, get_introspection_query, graphql_sync
+import opengov_fin_mcp_server as fin
+from query_cache import QueryResultCache, parse_field_ttls
+
+SDL = """
+type Query { vendors(status: String): [Vendor] budgets(fund: String): [Budget] }
+type Mutation { renameVendor(id: ID!, name: String!): Vendor }
+type Vendor { id: ID! name: String }
+type Budget { fund: String amount: Float }
+"""
+
+SCHEMA = {"data": graphql_sync(build_schema(SDL), get_introspection_query()).data}
+
+class OfflineClient(fin.OpenGovFINGraphQLClient):
+    """FIN client with a local schema that counts the requests it would send"""
+
+    def __init__(self, field_ttls=None):
+        super().__init__()
+        self.schema_mode = "full"
+        self.schema_cache = None
+        self.allow_mutations = True
+        self.query_cache = QueryResultCache(default_ttl=60, field_ttls=field_ttls)
+        self.requests = 0
+
+    async def _fetch_schema(self):
+        return SCHEMA
+
+    async def make_graphql_request(self, query, variables=None):
+        self.requests += 1
+        await asyncio.sleep(0.01)
+        if variables and variables.get("status") == "broken":
+            return {"data": None, "errors": [{"message": "upstream failure"}]}
+        return {"data": {"vendors": [{"id": "1", "name": "Acme"}]}}
+
+def _run_with_client(client, check):
+    original = fin.client
+    fin.client = client
+    try:
+        asyncio.run(check())
+    finally:
+        fin.client = original
+
+def test_equivalent_queries_share_one_request():
+    client = OfflineClient()
+
+    async def check():
+        await fin.query_graphql("{ vendors { id name } }")
+        await fin.query_graphql("# same question\nquery {\n  vendors {\n    id\n    name\n  }\n}")
+        assert client.requests == 1
+        await fin.query_graphql("query($s: String) { vendors(status: $s) { id } }", {"s": "ACTIVE"})
+        await fin.query_graphql("query($s: String) { vendors(status: $s) { id } }", {"s": "INACTIVE"})
+        assert client.requests == 3
+        await fin.query_graphql("{ vendors { id name } }", use_cache=False)
+        assert client.requests == 4
+
+        # Identical concurrent queries are merged into one request
+        await asyncio.gather(*[fin.query_graphql("{ budgets { fund amount } }") for _ in range(5)])
+        assert client.requests == 5
+
+        stats = await fin.get_performance_stats()
+        assert stats["query_cache"]["hits"] >= 1
+        assert stats["query_cache"]["joined_in_flight"] == 4
+
+    _run_with_client(client, check)
+
+def test_field_ttls_errors_and_mutations():
+    client = OfflineClient(field_ttls=parse_field_ttls("budgets=0, vendors=600"))
+
+    async def check():
+        # A zero TTL on any selected root field disables caching for that query
+        await fin.query_graphql("{ budgets { fund } vendors { id } }")
+        await fin.query_graphql("{ budgets { fund } vendors { id } }")
+        assert client.requests == 2
+
+        # Error responses are not cached
+        broken = "query($status: String) { vendors(status: $status) { id } }"
+        await fin.query_graphql(broken, {"status": "broken"})
+        await fin.query_graphql(broken, {"status": "broken"})
+        assert client.requests == 4
+
+        await fin.query_graphql("{ vendors { id } }")
+        await fin.query_graphql("mutation { renameVendor(id: 1, name: \"Acme Co\") { id } }")
+        await fin.query_graphql("{ vendors { id } }")
+        assert client.requests == 7
+        assert client.query_cache.invalidations == 1
+
+    _run_with_client(client, check)
+
+def test_mutation_during_read_discards_the_stale_result():
+    async def check():
+        cache = QueryResultCache(default_ttl=60)
+        release = asyncio.Event()
+        reads = []
+
+        async def slow_read():
+            reads.append("read")
+            await release.wait()
+            return {"data": {"vendors": [{"name": "Acme"}]}}
+
+        in_flight = asyncio.ensure_future(cache.get_or_execute("{ vendors { name } }", None, ["vendors"], slow_read))
+        await asyncio.sleep(0)
+        cache.invalidate()
+
+        # A read issued after the mutation does not join the one sent before it
+        release.set()
+        await asyncio.gather(in_flight, cache.get_or_execute("{ vendors { name } }", None, ["vendors"], slow_read))
+        assert reads == ["read", "read"]
+        assert cache.stats()["stale_discarded"] == 1
+        assert cache.stats()["entries"] == 1
+
+    asyncio.run(check())
+
+if __name__ == "__main__":
+    test_equivalent_queries_share_one_request()
+    test_field_ttls_errors_and_mutations()
+    test_mutation_during_read_discards_the_stale_result()
+    print("✅ FIN query cache tests passed")
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Test script for static cost limits on FIN GraphQL queries"""
+
+import asyncio
+import os
+import sys
+
+# Add the MCP servers directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "mcp-servers"))
+
+os.environ.setdefault("OG_FIN_BEARER_TOKEN", "test-token")
+
+from graphql import build_schema, get_introspection_query, graphql_sync, parse
+import opengov_fin_mcp_server as fin
+from query_cost import QueryCostAnalyzer
+
+SCHEMA = build_schema("""
+type Query {
+  funds(limit: Int): [Fund]
+  vendors: [Vendor]
+  transactions(first: Int, after: String): TransactionConnection
+}
+type Fund { code: String accounts(limit: Int): [Account] }
+type Account { number: String transactions(first: Int): TransactionConnection }
+type TransactionConnection { edges: [TransactionEdge] }
+type TransactionEdge { node: Transaction }
+type Transaction { id: ID amount: Float vendor: Vendor }
+type Vendor { id: ID name: String contacts: [String] }
+""")
+
+def test_cost_follows_list_limits():
+    analyzer = QueryCostAnalyzer()
+    cost = analyzer.analyze(parse("""
+        query($n: Int) { funds(limit: 10) { code accounts(limit: $n) { ...A } } }
+        fragment A on Account { number transactions(first: 5) { edges { node { id } } } }
+    """), SCHEMA, {"n": 20})
+    # funds 10, accounts 200, transactions 200, edges and nodes 1000 each, ids 1000
+    assert cost["estimated_nodes"] == 10 + 10 + 200 + 200 + 200 + 1000 + 1000 + 1000
+    assert cost["depth"] == 6 and cost["unbounded_lists"] == []
+
+    cost = analyzer.analyze(parse("{ vendors { id contacts } }"), SCHEMA)
+    assert [entry["path"] for entry in cost["unbounded_lists"]] == ["vendors", "vendors.contacts"]
+
+def test_expensive_queries_are_rewritten_or_rejected():
+    analyzer = QueryCostAnalyzer(max_cost=50000, max_depth=5, default_page_limit=25)
+    nested = parse("{ funds { accounts { number transactions { edges { node { amount } } } } } }")
+    decision = analyzer.check(nested, SCHEMA)
+    assert decision["action"] == "reject" and "depth 6" in decision["reasons"][0]
+
+    analyzer.max_depth = 10
+    decision = analyzer.check(nested, SCHEMA)
+    assert decision["action"] == "rewrite"
+    assert "funds(limit: 25)" in decision["query"] and "accounts(limit: 25)" in decision["query"]
+    assert "transactions(first: 25)" in decision["query"]
+    assert decision["cost"]["estimated_nodes"] <= 50000
+
+    # Lists with no limit argument cannot be rewritten
+    decision = QueryCostAnalyzer(max_cost=500).check(parse("{ vendors { contacts } }"), SCHEMA)
+    assert decision["action"] == "reject"
+    assert QueryCostAnalyzer(mode="reject", max_cost=100).check(parse("{ funds { code } }"), SCHEMA)["action"] == "reject"
+    assert QueryCostAnalyzer().check(parse("{ funds { code } }"), SCHEMA)["action"] == "allow"
+
+class OfflineClient(fin.OpenGovFINGraphQLClient):
+    """FIN client with a local schema that records the queries it would send"""
+
+    def __init__(self):
+        super().__init__()
+        self.schema_mode = "full"
+        self.schema_cache = None
+        self.query_cache = None
+        self.query_batcher = None
+        self.sent = []
+
+    async def _fetch_schema(self):
+        return {"data": graphql_sync(SCHEMA, get_introspection_query()).data}
+
+    async def make_graphql_request(self, query, variables=None):
+        self.sent.append(query)
+        return {"data": {"funds": []}}
+
+def test_query_graphql_applies_cost_limits():
+    original = fin.client
+    fin.client = client = OfflineClient()
+    try:
+        async def check():
+            result = await fin.query_graphql("{ funds { accounts { number transactions { edges { node { vendor { contacts } } } } } } }")
+            assert result["error"] == "Query rejected as too expensive" and client.sent == []
+
+            result = await fin.query_graphql("{ funds { accounts { number } } }")
+            assert result["query_cost"]["rewritten"] is True
+            assert "funds(limit: 100)" in client.sent[0]
+
+            await fin.query_graphql("{ funds(limit: 5) { code } }")
+            assert client.sent[1] == "{ funds(limit: 5) { code } }"
+
+        asyncio.run(check())
+    finally:
+        fin.client = original
+
+if __name__ == "__main__":
+    test_cost_follows_list_limits()
+    test_expensive_queries_are_rewritten_or_rejected()
+    test_query_graphql_applies_cost_limits()
+    print("✅ FIN query cost tests passed")
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""Test script for the FIN finance query templates"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+
+# Add the MCP servers directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "mcp-servers"))
+
+os.environ.setdefault("OG_FIN_BEARER_TOKEN", "test-token")
+
+from graphql import build_schema, get_introspection_query, graphql_sync
+import opengov_fin_mcp_server as fin
+from query_templates import TemplateLibrary, load_templates
+
+# Templates a deployment might configure, replacing the built-in ones of the same name;
+# only budgetActuals exists in the schema below
+TEMPLATES = [
+    {
+        "name": "budget_vs_actuals",
+        "description": "Budgeted and actual amounts per account for a fiscal year, optionally for one fund.",
+        "query": """
+query BudgetVsActuals($fiscalYear: Int!, $fund: String, $limit: Int = 100) {
+  budgetActuals(fiscalYear: $fiscalYear, fund: $fund, limit: $limit) {
+    account fund department budgetAmount actualAmount variance
+  }
+}""",
+        "parameters": {"fiscalYear": "Fiscal year, e.g. 2024", "fund": "Fund code to restrict to"}
+    },
+    {
+        "name": "vendor_spend",
+        "description": "Amounts paid to vendors in a date range.",
+        "query": """
+query VendorSpend($startDate: String!, $endDate: String!, $vendor: String) {
+  vendorPayments(startDate: $startDate, endDate: $endDate, vendor: $vendor) { vendorName amount }
+}"""
+    }
+]
+
+SCHEMA = build_schema("""
+type Query { budgetActuals(fiscalYear: Int!, fund: String, limit: Int): [BudgetActual] }
+type BudgetActual {
+  account: String fund: String department: String
+  budgetAmount: Float actualAmount: Float variance: Float
+}
+""")
+
+def _budget_actuals(info, fiscalYear, fund=None, limit=None):
+    return [{"account": "4000", "fund": fund or "100", "department": "Parks",
+             "budgetAmount": 10.0, "actualAmount": 8.0, "variance": 2.0}][:limit]
+
+def _load(items):
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+        json.dump(items, f)
+    try:
+        return TemplateLibrary(load_templates(f.name))
+    finally:
+        os.unlink(f.name)
+
+class OfflineClient(fin.OpenGovFINGraphQLClient):
+    """FIN client executing against a local graphql-core schema"""
+
+    def __init__(self):
+        super().__init__()
+        self.schema_mode = "full"
+        self.schema_cache = None
+        self.sent = []
+
+    async def _fetch_schema(self):
+        return {"data": graphql_sync(SCHEMA, get_introspection_query()).data}
+
+    async def make_graphql_request(self, query, variables=None):
+        self.sent.append(variables)
+        result = graphql_sync(SCHEMA, query, root_value={"budgetActuals": _budget_actuals}, variable_values=variables)
+        return {"data": result.data}
+
+def _with_templates(library, check):
+    """Run ``check`` with ``library`` as the server's templates and an offline client"""
+    original_client, original_library = fin.client, fin.template_library
+    fin.client, fin.template_library = OfflineClient(), library
+    try:
+        asyncio.run(check(fin.client))
+    finally:
+        for name in library.registered:
+            fin.mcp.remove_tool(name)
+        fin.client, fin.template_library = original_client, original_library
+
+def test_builtin_templates():
+    names = ["budget_vs_actuals", "vendor_spend", "fund_balances", "revenue_by_period"]
+    assert [template.name for template in load_templates()] == names
+    assert [template.name for template in load_templates("/nonexistent/templates.json")] == names
+    assert list(TemplateLibrary(load_templates()).templates) == names
+
+def test_templates_become_typed_tools():
+    library = _load(TEMPLATES)
+    parameters = {p["name"]: p for p in library.parameters("budget_vs_actuals")}
+    assert parameters["fiscalYear"]["required"] and parameters["fiscalYear"]["type"] == "Int!"
+    assert parameters["limit"]["default"] == 100 and not parameters["limit"]["required"]
+    assert list(library.signature("vendor_spend").parameters)[:2] == ["startDate", "endDate"]
+
+    async def check(client):
+        await fin.register_query_templates()
+        tools = {tool.name: tool for tool in fin.mcp._tool_manager.list_tools()}
+        assert tools["budget_vs_actuals"].parameters["required"] == ["fiscalYear"]
+
+    _with_templates(library, check)
+
+def test_template_file_overrides_and_skips_invalid():
+    library = _load(TEMPLATES + [
+        {"name": "budget_vs_actuals", "description": "Override", "query": "query($fund: String) { budgetActuals(fiscalYear: 2024, fund: $fund) { fund } }"},
+        {"name": "broken", "query": "query { "}
+    ])
+    assert library.templates["budget_vs_actuals"].description == "Override"
+    assert "broken" not in library.templates and "vendor_spend" in library.templates
+
+def test_templates_failing_validation_are_not_registered():
+    library = _load(TEMPLATES)
+
+    async def check(client):
+        summary = await fin.register_query_templates()
+        assert summary["registered"] == ["budget_vs_actuals"]
+        # Built-in templates whose fields this schema lacks are not offered either
+        assert set(summary["unavailable"]) == {"vendor_spend", "fund_balances", "revenue_by_period"}
+        tools = {tool.name for tool in fin.mcp._tool_manager.list_tools()}
+        assert "budget_vs_actuals" in tools and "vendor_spend" not in tools
+
+        # Registering again (e.g. a second warm-up) does not duplicate tools
+        await fin.register_query_templates()
+        assert library.registered == ["budget_vs_actuals"]
+
+        listing = await fin.list_query_templates()
+        status = {t["name"]: (t["available"], t["registered"]) for t in listing["templates"]}
+        assert status == {
+            "budget_vs_actuals": (True, True), "vendor_spend": (False, False),
+            "fund_balances": (False, False), "revenue_by_period": (False, False)
+        }
+
+        # Nothing is registered when the schema cannot be validated
+        lazy = OfflineClient()
+        lazy.schema_mode = "lazy"
+        fin.client = lazy
+        unchecked = _load(TEMPLATES)
+        fin.template_library = unchecked
+        assert (await fin.register_query_templates())["registered"] == []
+        fin.template_library = library
+
+    _with_templates(library, check)
+
+def test_templates_run_through_the_query_path():
+    library = _load(TEMPLATES)
+
+    async def check(client):
+        await fin.register_query_templates()
+        result = await fin.mcp.call_tool("budget_vs_actuals", {"fiscalYear": 2024, "fund": "200"})
+        assert client.sent == [{"fiscalYear": 2024, "fund": "200", "limit": 100}]
+        assert "200" in json.dumps(result, default=str)
+
+        result = await fin._run_template("vendor_spend", {"startDate": "2024-01-01", "endDate": "2024-12-31"})
+        assert "does not match this FIN schema" in result["error"] and len(client.sent) == 1
+
+    _with_templates(library, check)
+
+if __name__ == "__main__":
+    test_builtin_templates()
+    test_templates_become_typed_tools()
+    test_template_file_overrides_and_skips_invalid()
+    test_templates_failing_validation_are_not_registered()
+    test_templates_run_through_the_query_path()
+    print("✅ FIN query template tests passed")
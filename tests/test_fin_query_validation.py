@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Test script for local FIN GraphQL query validation"""
+
+import asyncio
+import os
+import sys
+
+# Add the MCP servers directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "mcp-servers"))
+
+os.environ.setdefault("OG_FIN_BEARER_TOKEN", "test-token")
+
+from graphql import build_schema, get_introspection_query, graphql_sync
+import opengov_fin_mcp_server as fin
+from query_validator import QueryValidator
+
+SDL = """
+type Query { vendor(id: ID!): Vendor vendors(first: Int): [Vendor] }
+type Mutation { createVendor(name: String!): Vendor }
+type Vendor { id: ID! name: String }
+"""
+
+SCHEMA = {"data": graphql_sync(build_schema(SDL), get_introspection_query()).data}
+
+class OfflineClient(fin.OpenGovFINGraphQLClient):
+    """FIN client with a local schema that records what would be sent"""
+
+    def __init__(self):
+        super().__init__()
+        self.schema_mode = "full"
+        self.schema_cache = None
+        self.sent = []
+
+    async def _fetch_schema(self):
+        return SCHEMA
+
+    async def make_graphql_request(self, query, variables=None):
+        self.sent.append(query)
+        return {"data": {"vendor": {"id": "1", "name": "Acme"}}}
+
+def test_validation_errors_and_document_cache():
+    validator = QueryValidator(max_documents=2)
+    query = "{ vendor(id: 1) { id nme } }"
+    result = validator.validate(query, SCHEMA)
+    assert not result["valid"] and result["schema_validated"]
+    assert "Cannot query field 'nme'" in result["errors"][0]["message"]
+    assert result["errors"][0]["locations"] == [{"line": 1, "column": 22}]
+
+    assert validator.validate(query, SCHEMA)["errors"] == result["errors"]
+    assert validator.stats()["document_cache_hits"] == 1
+
+    syntax = validator.validate("{ vendor(id: 1 { id }")
+    assert not syntax["valid"] and syntax["errors"][0]["message"].startswith("Syntax Error")
+
+    validator.validate("{ vendors { id } }")
+    assert validator.stats()["cached_documents"] == 2
+
+def test_invalid_queries_never_reach_the_endpoint():
+    original = fin.client
+    fin.client = OfflineClient()
+    try:
+        ok = asyncio.run(fin.query_graphql("query($id: ID!) { vendor(id: $id) { name } }", {"id": "1"}))
+        assert ok["data"]["vendor"]["name"] == "Acme"
+
+        bad = asyncio.run(fin.query_graphql("{ vendor { name } }"))
+        assert bad["error"] == "GraphQL validation failed"
+        message = bad["validation_errors"][0]["message"]
+        assert "'id'" in message or "(id:)" in message
+        assert "required" in message
+
+        # Mutations are detected from the parsed document, not the query prefix
+        blocked = asyncio.run(fin.query_graphql("# create\nmutation { createVendor(name: \"x\") { id } }"))
+        assert blocked == {"error": "Mutations are disabled"}
+
+        assert len(fin.client.sent) == 1
+    finally:
+        fin.client = original
+
+if __name__ == "__main__":
+    test_validation_errors_and_document_cache()
+    test_invalid_queries_never_reach_the_endpoint()
+    print("✅ FIN query validation tests passed")
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Test script for paging and filtering stored FIN query results"""
+
+import asyncio
+import os
+import sys
+
+# Add the MCP servers directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "mcp-servers"))
+
+os.environ.setdefault("OG_FIN_BEARER_TOKEN", "test-token")
+
+from graphql import build_schema, get_introspection_query, graphql_sync
+import opengov_fin_mcp_server as fin
+from result_store import ResultStore
+
+SCHEMA = build_schema("""
+type Query { expenses: [Expense] }
+type Expense { id: ID! amount: Float department: Department }
+type Department { name: String }
+""")
+
+EXPENSES = [
+    {"id": str(i), "amount": float(i * 10), "department": {"name": "Parks" if i % 4 == 0 else "Police"}}
+    for i in range(500)
+]
+
+class OfflineClient(fin.OpenGovFINGraphQLClient):
+    """FIN client with a local schema that counts the requests it would send"""
+
+    def __init__(self):
+        super().__init__()
+        self.schema_mode = "full"
+        self.schema_cache = None
+        self.query_cache = None
+        self.requests = 0
+
+    async def _fetch_schema(self):
+        return {"data": graphql_sync(SCHEMA, get_introspection_query()).data}
+
+    async def make_graphql_request(self, query, variables=None):
+        self.requests += 1
+        return {"data": {"expenses": EXPENSES}}
+
+def _run_with_client(client, check):
+    original = fin.client
+    fin.client = client
+    try:
+        asyncio.run(check())
+    finally:
+        fin.client = original
+
+def test_large_results_can_be_paged_and_filtered():
+    client = OfflineClient()
+
+    async def check():
+        result = await fin.query_graphql("{ expenses { id amount department { name } } }")
+        handle = result["result_handle"]
+        assert result["data_summary"]["row_count"] == 50
+
+        page = await fin.get_result_page(handle, offset=495, limit=10, fields=["id", "department.name"])
+        assert page["rows"] == [{"id": str(i), "department.name": "Police" if i % 4 else "Parks"} for i in range(495, 500)]
+        assert page["total_rows"] == 500 and page["has_more"] is False
+
+        parks = await fin.filter_result(handle, {"department.name": "Parks", "amount": {"gte": 1000}}, fields=["amount"], limit=5)
+        assert parks["total_matches"] == 100
+        assert parks["rows"][0] == {"amount": 1000.0} and parks["has_more"] is True
+
+        assert "Unknown column" in (await fin.filter_result(handle, {"dept": "Parks"}))["error"]
+        assert "Unknown filter operator" in (await fin.filter_result(handle, {"amount": {"between": 1}}))["error"]
+        assert "Unknown or expired" in (await fin.get_result_page("res_missing"))["error"]
+        assert client.requests == 1
+
+    _run_with_client(client, check)
+
+def test_store_evicts_least_recently_used():
+    store = ResultStore(max_entries=2, max_total_rows=10)
+    first = store.put([1, 2, 3])
+    second = store.put([4, 5])
+    store.get(first)
+    third = store.put([6])
+    assert store.get(second) is None and store.get(first) is not None and store.get(third) is not None
+
+    # Row budget evicts too, and a result larger than the whole store is not kept
+    store.put(list(range(9)))
+    assert store.get(first) is None and store.stats()["total_rows"] == 10
+    assert store.put(list(range(11))) is None
+
+if __name__ == "__main__":
+    test_large_results_can_be_paged_and_filtered()
+    test_store_evicts_least_recently_used()
+    print("✅ FIN result store tests passed")
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Test script for the persistent FIN GraphQL schema cache"""
+
+import asyncio
+import os
+import sys
+import tempfile
+
+# Add the MCP servers directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "mcp-servers"))
+
+os.environ.setdefault("OG_FIN_BEARER_TOKEN", "test-token")
+
+import opengov_fin_mcp_server as fin
+from schema_cache import SchemaDiskCache
+
+def _schema(type_name):
+    return {"data": {"__schema": {"queryType": {"name": "Query"}, "types": [{"kind": "OBJECT", "name": type_name, "fields": []}]}}}
+
+class CountingClient(fin.OpenGovFINGraphQLClient):
+    """FIN client whose introspection request returns a canned schema"""
+
+    def __init__(self, schema):
+        super().__init__()
+        self.schema = schema
+        self.fetches = 0
+
+    async def _fetch_schema(self):
+        self.fetches += 1
+        return self.schema
+
+def _with_cache_env(ttl, check):
+    with tempfile.TemporaryDirectory() as cache_dir:
+        os.environ["OG_FIN_SCHEMA_CACHE_DIR"] = cache_dir
+        os.environ["OG_FIN_SCHEMA_CACHE_TTL"] = str(ttl)
+        try:
+            asyncio.run(check())
+        finally:
+            del os.environ["OG_FIN_SCHEMA_CACHE_DIR"]
+            del os.environ["OG_FIN_SCHEMA_CACHE_TTL"]
+
+def test_cold_start_reads_schema_from_disk():
+    async def check():
+        first = CountingClient(_schema("Query"))
+        assert await first.introspect_schema() == _schema("Query")
+        assert first.fetches == 1 and first.schema_source == "network"
+        assert os.path.exists(first.schema_cache.path)
+
+        # A new process (client) answers from the file without introspecting
+        second = CountingClient(_schema("Other"))
+        assert await second.introspect_schema() == _schema("Query")
+        assert second.fetches == 0 and second.schema_source == "disk"
+        assert second.schema_hash == first.schema_hash
+
+    _with_cache_env(3600, check)
+
+def test_stale_schema_is_revalidated_in_background():
+    async def check():
+        await CountingClient(_schema("Query")).introspect_schema()
+
+        client = CountingClient(_schema("Changed"))
+        # The stale copy is returned immediately while the refetch runs
+        assert await client.introspect_schema() == _schema("Query")
+        await client._revalidation_task
+        assert client.fetches == 1
+        assert client.cached_schema == _schema("Changed")
+        assert SchemaDiskCache(client.endpoint, os.environ["OG_FIN_SCHEMA_CACHE_DIR"]).load()["schema"] == _schema("Changed")
+
+    _with_cache_env(0, check)
+
+def test_unreadable_cache_file_is_ignored():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = SchemaDiskCache("https://example.test/graphql", cache_dir)
+        with open(cache.path, "w") as f:
+            f.write("{not json")
+        assert cache.load() is None
+        cache.save(_schema("Query"))
+        assert cache.load()["schema"] == _schema("Query")
+
+if __name__ == "__main__":
+    test_cold_start_reads_schema_from_disk()
+    test_stale_schema_is_revalidated_in_background()
+    test_unreadable_cache_file_is_ignored()
+    print("✅ FIN schema cache tests passed")
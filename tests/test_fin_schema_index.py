@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Test script for the compiled FIN GraphQL schema index"""
+
+import os
+import sys
+
+# Add the MCP servers directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "mcp-servers"))
+
+from schema_index import SchemaIndex, format_type_ref
+
+def _named(kind, name):
+    return {"kind": kind, "name": name, "ofType": None}
+
+def _non_null(type_ref):
+    return {"kind": "NON_NULL", "name": None, "ofType": type_ref}
+
+SCHEMA = {"data": {"__schema": {
+    "queryType": {"name": "Query"},
+    "mutationType": None,
+    "subscriptionType": None,
+    "types": [
+        {"kind": "OBJECT", "name": "Query", "description": None, "fields": [
+            {"name": "vendor", "description": "One vendor", "type": _named("OBJECT", "Vendor"),
+             "args": [{"name": "id", "description": None, "type": _non_null(_named("SCALAR", "ID")), "defaultValue": None}]},
+            {"name": "vendors", "description": None, "type": {"kind": "LIST", "name": None, "ofType": _named("OBJECT", "Vendor")},
+             "args": [{"name": "first", "description": None, "type": _named("SCALAR", "Int"), "defaultValue": "10"}]}
+        ], "interfaces": []},
+        {"kind": "OBJECT", "name": "Vendor", "description": "A supplier", "fields": [
+            {"name": "id", "description": None, "type": _non_null(_named("SCALAR", "ID")), "args": []}
+        ], "interfaces": []},
+        {"kind": "ENUM", "name": "VendorStatus", "description": None, "fields": None,
+         "enumValues": [{"name": "ACTIVE", "description": None}, {"name": "INACTIVE", "description": None}]},
+        {"kind": "SCALAR", "name": "ID", "description": None, "fields": None},
+        {"kind": "SCALAR", "name": "Int", "description": None, "fields": None},
+        {"kind": "OBJECT", "name": "__Type", "description": None, "fields": []}
+    ]
+}}}
+
+def test_index_lookups():
+    index = SchemaIndex(SCHEMA)
+    assert "__Type" not in index.types
+    assert index.get_type("Vendor")["description"] == "A supplier"
+    assert index.names_by_kind["SCALAR"] == ["ID", "Int"]
+    assert index.type_counts == {"OBJECT": 2, "ENUM": 1, "SCALAR": 2}
+    assert [entry["name"] for entry in index.type_listing()] == ["VendorStatus", "Query", "Vendor", "ID", "Int"]
+    assert [entry["name"] for entry in index.type_listing("scalar")] == ["ID", "Int"]
+
+def test_operation_signatures_are_precomputed():
+    index = SchemaIndex(SCHEMA)
+    vendor, vendors = index.operations("query")
+    assert vendor["return_type"] == "Vendor"
+    assert vendor["arguments"][0] == {"name": "id", "type": "ID!", "description": None, "default_value": None}
+    assert vendors["return_type"] == "[Vendor]"
+    assert index.operations("mutation") is None
+    assert index.operations("query") is index.operations("query")
+
+def test_sdl_fragments_are_cached():
+    index = SchemaIndex(SCHEMA)
+    assert index.type_sdl("Query") == "type Query {\n  vendor(id: ID!): Vendor\n  vendors(first: Int = 10): [Vendor]\n}"
+    assert index.type_sdl("VendorStatus") == "enum VendorStatus {\n  ACTIVE\n  INACTIVE\n}"
+    assert index.type_sdl("Missing") is None
+    sdl = index.full_sdl()
+    assert sdl.startswith("schema {\n  query: Query\n}\n\ntype Query")
+    assert '"""A supplier"""\ntype Vendor {\n  id: ID!\n}' in sdl
+    assert index.full_sdl() is sdl
+    assert format_type_ref(_non_null({"kind": "LIST", "name": None, "ofType": _named("SCALAR", "ID")})) == "[ID]!"
+
+if __name__ == "__main__":
+    test_index_lookups()
+    test_operation_signatures_are_precomputed()
+    test_sdl_fragments_are_cached()
+    print("✅ FIN schema index tests passed")
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Test script for ranked search over the FIN GraphQL schema"""
+
+import os
+import sys
+
+# Add the MCP servers directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "mcp-servers"))
+
+from schema_index import SchemaIndex, tokenize
+
+def _named(kind, name):
+    return {"kind": kind, "name": name, "ofType": None}
+
+def _list(type_ref):
+    return {"kind": "LIST", "name": None, "ofType": type_ref}
+
+def _arg(name, type_ref, description=None):
+    return {"name": name, "description": description, "type": type_ref, "defaultValue": None}
+
+def _field(name, type_ref, description=None, args=()):
+    return {"name": name, "description": description, "type": type_ref, "args": list(args)}
+
+SCHEMA = {"data": {"__schema": {
+    "queryType": {"name": "Query"},
+    "mutationType": {"name": "Mutation"},
+    "subscriptionType": None,
+    "types": [
+        {"kind": "OBJECT", "name": "Query", "description": None, "fields": [
+            _field("vendorPayments", _list(_named("OBJECT", "VendorPayment")), "Payments made to suppliers",
+                   [_arg("fiscalYear", _named("SCALAR", "Int")), _arg("fund", _named("SCALAR", "String"))]),
+            _field("budgetActuals", _list(_named("OBJECT", "BudgetLine")), "Budget compared with actual spending",
+                   [_arg("fiscalYear", _named("SCALAR", "Int"))]),
+            _field("funds", _list(_named("OBJECT", "Fund")), "All funds")
+        ], "interfaces": []},
+        {"kind": "OBJECT", "name": "Mutation", "description": None, "fields": [
+            _field("approvePayment", _named("OBJECT", "VendorPayment"), None, [_arg("id", _named("SCALAR", "ID"))])
+        ], "interfaces": []},
+        {"kind": "OBJECT", "name": "VendorPayment", "description": "A payment to a vendor", "fields": [
+            _field("amount", _named("SCALAR", "Float")),
+            _field("paymentDate", _named("SCALAR", "String"), "Date the payment cleared")
+        ], "interfaces": []},
+        {"kind": "OBJECT", "name": "BudgetLine", "description": None, "fields": [
+            _field("budgetAmount", _named("SCALAR", "Float")),
+            _field("actualAmount", _named("SCALAR", "Float"))
+        ], "interfaces": []},
+        {"kind": "OBJECT", "name": "Fund", "description": "A self-balancing set of accounts", "fields": [
+            _field("code", _named("SCALAR", "String")),
+            _field("endingBalance", _named("SCALAR", "Float"), "Balance at the end of the period")
+        ], "interfaces": []},
+        {"kind": "ENUM", "name": "PaymentStatus", "description": None, "fields": None,
+         "enumValues": [{"name": "CLEARED", "description": None}, {"name": "VOIDED", "description": None}]},
+        {"kind": "SCALAR", "name": "Float", "description": None, "fields": None},
+        {"kind": "SCALAR", "name": "String", "description": None, "fields": None}
+    ]
+}}}
+
+def test_tokenize_splits_identifiers():
+    assert tokenize("vendorPayments") == ["vendor", "payment"]
+    assert tokenize("HTTPStatus fiscal_year2024") == ["http", "status", "fiscal", "year", "2024"]
+    assert tokenize("Policies") == ["policy"]
+    assert tokenize(None) == []
+
+def test_search_ranks_matching_operations_first():
+    index = SchemaIndex(SCHEMA)
+    matches = index.search("vendor payments")
+    assert matches[0]["kind"] == "query"
+    assert matches[0]["name"] == "vendorPayments"
+    assert matches[0]["signature"] == "vendorPayments(fiscalYear: Int, fund: String): [VendorPayment]"
+    assert matches[0]["score"] >= matches[1]["score"]
+
+    top = index.search("budget actual", limit=3)
+    assert top[0]["name"] == "budgetActuals"
+    assert len(top) == 3
+
+def test_search_covers_arguments_descriptions_and_enum_values():
+    index = SchemaIndex(SCHEMA)
+    assert index.search("fiscal year", limit=2)[0]["kind"] == "query"
+    assert index.search("balance period")[0]["name"] == "Fund.endingBalance"
+    match = index.search("voided")[0]
+    assert match["name"] == "PaymentStatus"
+    assert match["signature"] == "enum PaymentStatus"
+    assert match["type_kind"] == "ENUM"
+
+def test_search_kind_filter_and_prefixes():
+    index = SchemaIndex(SCHEMA)
+    assert [m["name"] for m in index.search("payment", kind="mutation")] == ["approvePayment"]
+    assert all(m["kind"] == "type" for m in index.search("payment", kind="type"))
+    assert index.search("budg")[0]["name"] == "budgetActuals"
+    assert index.search("zzz") == []
+    assert index.search("") == []
+
+def test_search_index_rebuilt_when_types_are_added():
+    index = SchemaIndex(SCHEMA)
+    assert index.search("encumbrance") == []
+    index.add_type({"kind": "OBJECT", "name": "Encumbrance", "description": "Committed funds", "fields": [],
+                    "interfaces": []})
+    assert index.search("encumbrance")[0]["name"] == "Encumbrance"
+
+if __name__ == "__main__":
+    test_tokenize_splits_identifiers()
+    test_search_ranks_matching_operations_first()
+    test_search_covers_arguments_descriptions_and_enum_values()
+    test_search_kind_filter_and_prefixes()
+    test_search_index_rebuilt_when_types_are_added()
+    print("✅ FIN schema search tests passed")
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""Test script for the FIN tool manifest cache key"""
+
+import os
+import sys
+import tempfile
+from types import SimpleNamespace
+
+# Add the project root and the MCP servers directory to the path
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, "src", "mcp-servers"))
+
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+from schema_cache import SchemaDiskCache
+from src.agents.finance_assistant.tools.mcp_client import _manifest_cache
+
+SERVER_PATH = os.path.join(ROOT_DIR, "src", "mcp-servers", "opengov_fin_mcp_server.py")
+ENDPOINT = "https://fin.example.test/graphql"
+
+def test_manifest_key_follows_the_template_schema():
+    keys = ["OG_FIN_GRAPHQL_ENDPOINT", "OG_FIN_SCHEMA_CACHE", "OG_FIN_SCHEMA_CACHE_DIR", "OG_FIN_QUERY_TEMPLATES"]
+    saved = {key: os.environ.get(key) for key in keys}
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ.update({"OG_FIN_GRAPHQL_ENDPOINT": ENDPOINT, "OG_FIN_SCHEMA_CACHE": "true",
+                           "OG_FIN_SCHEMA_CACHE_DIR": tmp, "OG_FIN_QUERY_TEMPLATES": "true"})
+        settings = SimpleNamespace(tool_manifest_cache=True, tool_manifest_dir=os.path.join(tmp, "manifests"),
+                                   mcp_server_path=SERVER_PATH)
+        try:
+            # Which templates are tools is unknown until the server has cached a schema
+            assert _manifest_cache(settings) is None
+
+            schema_cache = SchemaDiskCache(ENDPOINT, tmp)
+            schema_cache.save({"data": {"__schema": {"types": []}}})
+            assert _manifest_cache(settings).save([])
+            assert _manifest_cache(settings).load() == []
+
+            # A changed schema may register different templates, so the manifest is stale
+            schema_cache.save({"data": {"__schema": {"types": [{"name": "Fund"}]}}})
+            assert _manifest_cache(settings).load() is None
+
+            # Without templates the schema does not matter
+            os.environ["OG_FIN_QUERY_TEMPLATES"] = "false"
+            os.environ["OG_FIN_SCHEMA_CACHE"] = "false"
+            assert _manifest_cache(settings).save([])
+            assert _manifest_cache(settings).load() == []
+        finally:
+            for key, value in saved.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+
+if __name__ == "__main__":
+    test_manifest_key_follows_the_template_schema()
+    print("✅ FIN tool manifest tests passed")
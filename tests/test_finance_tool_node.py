@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Test script for concurrent tool execution in the finance assistant tool node"""
+
+import asyncio
+import os
+import sys
+import time
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+from langchain_core.messages import AIMessage
+from langchain_core.tools import StructuredTool
+from src.agents.finance_assistant.nodes import tools as tools_module
+from src.agents.finance_assistant.nodes.tools import index_tools, serialize_result, tool_node
+
+def _make_tools(state):
+    async def slow_query(query: str) -> dict:
+        """Pretend FIN query"""
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        await asyncio.sleep(float(query))
+        state["active"] -= 1
+        return {"data": {"query": query, "rows": [1, 2]}}
+
+    async def failing_query(query: str) -> dict:
+        """Always fails"""
+        raise RuntimeError("endpoint down")
+
+    return [
+        StructuredTool.from_function(coroutine=slow_query, name="slow_query", description="slow"),
+        StructuredTool.from_function(coroutine=failing_query, name="failing_query", description="fails")
+    ]
+
+def _state(calls):
+    message = AIMessage(content="", tool_calls=[
+        {"name": name, "args": {"query": query}, "id": f"call_{i}"} for i, (name, query) in enumerate(calls)
+    ])
+    return {"messages": [message]}
+
+def test_tool_calls_run_concurrently_in_call_order():
+    state = {"active": 0, "peak": 0}
+    tools_by_name = index_tools(_make_tools(state))
+    calls = [("slow_query", "0.2"), ("slow_query", "0.1"), ("failing_query", "x"), ("missing_tool", "x")]
+
+    started = time.monotonic()
+    result = asyncio.run(tool_node(_state(calls), tools_by_name))
+    elapsed = time.monotonic() - started
+
+    messages = result["messages"]
+    assert [m.tool_call_id for m in messages] == ["call_0", "call_1", "call_2", "call_3"]
+    assert messages[0].content == '{"data":{"query":"0.2","rows":[1,2]}}'
+    assert messages[2].content == "Error executing failing_query: endpoint down"
+    assert messages[3].content == "Tool missing_tool not found"
+    assert state["peak"] == 2
+    assert elapsed < 0.28
+
+def test_concurrency_limit_and_timeout():
+    state = {"active": 0, "peak": 0}
+    original = tools_module.settings
+    tools_module.settings = original._replace(tool_concurrency=2, tool_timeout=0.3)
+    try:
+        calls = [("slow_query", "0.05")] * 5 + [("slow_query", "5")]
+        result = asyncio.run(tool_node(_state(calls), _make_tools(state)))
+    finally:
+        tools_module.settings = original
+    assert state["peak"] == 2
+    assert result["messages"][-1].content == "Error executing slow_query: timed out after 0.3 seconds"
+    assert all(m.content.startswith('{"data"') for m in result["messages"][:5])
+
+def test_mcp_text_blocks_are_unwrapped_and_compacted():
+    from langchain_core.messages.content import create_text_block
+
+    async def fin_query(query: str):
+        """Pretend FIN query over MCP: indented JSON in text content blocks"""
+        payload = '{\n  "data": {\n    "vendors": [\n      {"name": "Acme"}\n    ]\n  }\n}'
+        return [create_text_block(payload[:20]), create_text_block(payload[20:])], {"structured_content": None}
+
+    tool = StructuredTool.from_function(coroutine=fin_query, name="fin_query", description="mcp",
+                                        response_format="content_and_artifact")
+    result = asyncio.run(tool_node(_state([("fin_query", "q")]), [tool]))
+    assert result["messages"][0].content == '{"data":{"vendors":[{"name":"Acme"}]}}'
+
+    assert serialize_result([{"type": "text", "text": "not json"}]) == "not json"
+    image = [{"type": "image", "url": "http://example/chart.png"}]
+    assert serialize_result(image) == '[{"type":"image","url":"http://example/chart.png"}]'
+
+def test_serialize_result_is_compact_json():
+    assert serialize_result({"a": [1, 2], "b": "é"}) == '{"a":[1,2],"b":"é"}'
+    assert serialize_result('{\n  "a": 1\n}') == '{"a":1}'
+    assert serialize_result("plain text") == "plain text"
+    assert serialize_result("[not json") == "[not json"
+
+if __name__ == "__main__":
+    test_tool_calls_run_concurrently_in_call_order()
+    test_concurrency_limit_and_timeout()
+    test_mcp_text_blocks_are_unwrapped_and_compacted()
+    test_serialize_result_is_compact_json()
+    print("✅ Finance tool node tests passed")
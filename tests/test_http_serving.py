@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""Test script for the production HTTP serving helpers"""
+
+import os
+import sys
+
+# Add the MCP servers directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "mcp-servers"))
+
+from mcp.server.fastmcp import FastMCP
+from starlette.testclient import TestClient
+from http_serving import build_http_app, get_http_config
+
+def test_worker_warms_up_before_serving():
+    mcp = FastMCP("http-serving-test")
+    warmed = []
+
+    async def warm_up():
+        warmed.append(os.getpid())
+
+    app = build_http_app(mcp, warmup=warm_up)
+    assert mcp.settings.stateless_http is True
+    with TestClient(app):
+        assert warmed == [os.getpid()]
+
+def test_failed_warmup_does_not_stop_the_worker():
+    async def warm_up():
+        raise RuntimeError("upstream unavailable")
+
+    with TestClient(build_http_app(FastMCP("http-serving-test"), warmup=warm_up), base_url="http://127.0.0.1:8000") as client:
+        # The MCP endpoint is mounted and answering (405/406 without an MCP handshake)
+        assert client.get("/mcp").status_code in (400, 405, 406)
+
+def test_config_from_environment():
+    overrides = {"MCP_HTTP_WORKERS": "3", "MCP_HTTP_LIMIT_CONCURRENCY": "200", "MCP_HTTP_LOOP": "UVLOOP"}
+    previous = {name: os.environ.get(name) for name in overrides}
+    os.environ.update(overrides)
+    try:
+        config = get_http_config()
+        assert config.workers == 3
+        assert config.limit_concurrency == 200
+        assert config.limit_max_requests is None
+        assert config.loop == "uvloop"
+    finally:
+        for name, value in previous.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+if __name__ == "__main__":
+    test_worker_warms_up_before_serving()
+    test_failed_warmup_does_not_stop_the_worker()
+    test_config_from_environment()
+    print("✅ HTTP serving tests passed")
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Test script for in-process MCP tool execution"""
+
+import asyncio
+import os
+import sys
+import tempfile
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.messages import ToolMessage
+from src.common.inprocess_tools import invoke_structured, load_inprocess_tools, structured_result
+
+# Minimal server module; tools are called directly, the server never runs
+SERVER_SOURCE = '''
+import os
+from mcp.server.fastmcp import FastMCP
+
+mcp = FastMCP("inprocess-test")
+
+@mcp.tool()
+async def get_record(record_id: str, include_owner: bool = False) -> dict:
+    """Return a JSON:API style record"""
+    return {"data": {"id": record_id, "type": "records", "pid": os.getpid(), "owner": include_owner}}
+
+@mcp.tool()
+def echo(text: str) -> str:
+    """Echo text back"""
+    return text
+
+if __name__ == "__main__":
+    mcp.run(transport="stdio")
+'''
+
+async def _tools_run_in_this_process(server_path):
+    tools = {tool.name: tool for tool in await load_inprocess_tools(server_path)}
+    assert set(tools) == {"get_record", "echo"}
+    assert tools["get_record"].metadata == {"execution": "in_process"}
+
+    result = await invoke_structured(tools["get_record"], {"record_id": "42", "include_owner": True})
+    assert result["data"] == {"id": "42", "type": "records", "pid": os.getpid(), "owner": True}
+
+    # Plain invocation returns the text content the model sees
+    assert await tools["echo"].ainvoke({"text": "hello"}) == "hello"
+
+def test_tools_run_in_this_process():
+    with tempfile.TemporaryDirectory() as tmp:
+        server_path = os.path.join(tmp, "inprocess_test_server.py")
+        with open(server_path, "w") as f:
+            f.write(SERVER_SOURCE)
+        asyncio.run(_tools_run_in_this_process(server_path))
+
+def test_structured_result_falls_back_to_text_content():
+    artifact_message = ToolMessage(content="ignored", tool_call_id="1", artifact={"structured_content": {"a": 1}})
+    assert structured_result(artifact_message) == {"a": 1}
+
+    # MCP adapter messages carry a list of text blocks
+    block_message = ToolMessage(content=[{"type": "text", "text": '{"b": '}, {"type": "text", "text": "2}"}], tool_call_id="2")
+    assert structured_result(block_message) == {"b": 2}
+
+    assert structured_result(ToolMessage(content="not json", tool_call_id="3")) == "not json"
+
+if __name__ == "__main__":
+    test_tools_run_in_this_process()
+    test_structured_result_falls_back_to_text_content()
+    print("✅ In-process tool tests passed")
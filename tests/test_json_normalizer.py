@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""Test script for the GraphQL response normalizer"""
+
+import json
+import os
+import sys
+
+# Add the MCP servers directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "mcp-servers"))
+
+import json_normalizer
+from json_normalizer import GraphQLResponseNormalizer, estimate_json_size, flatten_record, profile_columns
+
+def test_size_estimate_matches_json_and_stops_early():
+    value = {"a": [1, 2.5, True, None, "text", {"k": False}], "b": {}, "c": [], 7: "seven"}
+    assert estimate_json_size(value) == len(json.dumps(value))
+
+    huge = {"data": {"rows": [{"id": i} for i in range(100000)]}}
+    assert 1000 < estimate_json_size(huge, limit=1000) < 1100
+
+def test_flatten_record_follows_max_level():
+    record = {"id": 1, "vendor": {"name": "Acme", "address": {"city": "Austin", "geo": {"lat": 1}}}, "tags": ["a"]}
+    assert flatten_record(record, max_level=2) == {
+        "id": 1, "vendor.name": "Acme", "vendor.address.city": "Austin", "vendor.address.geo": {"lat": 1}, "tags": ["a"]
+    }
+    assert flatten_record(record)["vendor.address.geo.lat"] == 1
+
+def test_list_results_are_capped_and_typed():
+    normalizer = GraphQLResponseNormalizer(max_response_size=500, max_items=20)
+    rows = [{"id": i, "amount": i * 1.5, "fund": {"code": "100", "budget": None if i % 2 else i}} for i in range(5000)]
+    result = normalizer.normalize_response({"data": {"transactions": {"edges": [{"node": r} for r in rows]}}, "errors": []})
+
+    summary = result["data_summary"]
+    assert summary["columns"] == ["id", "amount", "fund.code", "fund.budget"]
+    assert summary["row_count"] == 20 and len(summary["sample_data"]) == 10
+    assert summary["data_types"] == {"id": "int64", "amount": "float64", "fund.code": "str", "fund.budget": "float64"}
+    assert result["truncation_note"] == "Showing first 20 items of 5000 total"
+    assert result["original_keys"] == ["transactions"] and result["errors"] == []
+
+    # Small responses are returned untouched
+    small = {"data": {"transactions": rows[:2]}}
+    assert normalizer.normalize_response(small) is small
+
+def test_profiles_cover_every_row():
+    normalizer = GraphQLResponseNormalizer(max_response_size=2000, max_items=20)
+    rows = [{"id": i, "amount": i * 1.5, "fund": {"code": "100" if i % 4 else "200", "budget": None if i % 2 else i}}
+            for i in range(5000)]
+    result = normalizer.normalize_response({"data": {"transactions": rows}})
+
+    summary = result["data_summary"]
+    assert summary["profiled_rows"] == 5000
+    profiles = summary["column_profiles"]
+    assert profiles["id"] == {"type": "number", "nulls": 0, "distinct": 5000, "min": 0, "max": 4999,
+                              "sum": 12497500, "mean": 2499.5}
+    assert profiles["amount"]["sum"] == 18746250
+    assert profiles["fund.code"] == {"type": "string", "nulls": 0, "distinct": 2, "top": [["100", 3750], ["200", 1250]]}
+    assert profiles["fund.budget"]["nulls"] == 2500 and profiles["fund.budget"]["max"] == 4998
+
+def test_profile_types_without_numpy():
+    rows = [{"year": 2023 + i % 2, "ok": i % 3 == 0, "tags": ["a"], "note": None} for i in range(6)]
+    with_numpy = profile_columns(rows)
+    original = json_normalizer._numpy
+    json_normalizer._numpy = lambda: None
+    try:
+        assert profile_columns(rows) == with_numpy
+    finally:
+        json_normalizer._numpy = original
+    assert with_numpy["year"] == {"type": "number", "nulls": 0, "distinct": 2, "min": 2023, "max": 2024,
+                                  "sum": 12141, "mean": 2023.5, "top": [[2023, 3], [2024, 3]]}
+    assert with_numpy["ok"] == {"type": "boolean", "nulls": 0, "distinct": 2, "top": [[False, 4], [True, 2]]}
+    assert with_numpy["tags"] == {"type": "object", "nulls": 0}
+    assert with_numpy["note"] == {"type": "null", "nulls": 6}
+    omitted = []
+    assert len(profile_columns([{f"c{i}": i for i in range(60)}], max_columns=5, omitted=omitted)) == 5
+    assert omitted == [f"c{i}" for i in range(5, 60)]
+
+def test_profiles_fit_the_response_size_limit():
+    rows = [{f"c{c}": f"v{i % (c + 2)}" if c % 2 else i * c for c in range(45)} for i in range(2000)]
+    response = {"data": {"records": rows}}
+
+    roomy = GraphQLResponseNormalizer(max_response_size=100000).normalize_response(response)["data_summary"]
+    assert len(roomy["column_profiles"]) == 40 and "profile_note" not in roomy
+    # Columns past the 40-column cap are listed rather than silently dropped
+    assert roomy["unprofiled_columns"] == [f"c{c}" for c in range(40, 45)]
+    full_size = len(json.dumps({"data_summary": roomy}))
+
+    # Just under the full size: the same columns without their top values
+    limit = full_size - 100
+    summary = GraphQLResponseNormalizer(max_response_size=limit).normalize_response(response)
+    assert len(json.dumps(summary)) <= limit
+    profiles = summary["data_summary"]["column_profiles"]
+    assert len(profiles) == 40 and not any("top" in p for p in profiles.values())
+    assert "shortened" in summary["data_summary"]["profile_note"]
+
+    # Tighter: fewer columns, the rest listed as unprofiled
+    bare = GraphQLResponseNormalizer(max_response_size=100).normalize_response(response)
+    assert "column_profiles" not in bare["data_summary"]
+    limit = len(json.dumps(bare)) + (full_size - len(json.dumps(bare))) // 3
+    summary = GraphQLResponseNormalizer(max_response_size=limit).normalize_response(response)
+    assert len(json.dumps(summary)) <= limit
+    data_summary = summary["data_summary"]
+    assert 0 < len(data_summary["column_profiles"]) < 40
+    assert len(data_summary["column_profiles"]) + len(data_summary["unprofiled_columns"]) == 45
+
+    # When the sample alone exceeds the limit, the profiles are left out
+    assert len(bare["data_summary"]["unprofiled_columns"]) == 45
+    assert "left out" in bare["data_summary"]["profile_note"]
+
+def test_types_response_counts_kinds():
+    normalizer = GraphQLResponseNormalizer(max_response_size=100)
+    types = [{"name": f"T{i}", "kind": "ENUM" if i % 3 == 0 else "OBJECT"} for i in range(30)]
+    result = normalizer.normalize_response({"types": types})
+    assert result["type_summary"]["types_by_kind"] == {"OBJECT": 20, "ENUM": 10}
+    assert len(result["type_summary"]["sample_types"]) == 20
+
+if __name__ == "__main__":
+    test_size_estimate_matches_json_and_stops_early()
+    test_flatten_record_follows_max_level()
+    test_list_results_are_capped_and_typed()
+    test_profiles_cover_every_row()
+    test_profile_types_without_numpy()
+    test_profiles_fit_the_response_size_limit()
+    test_types_response_counts_kinds()
+    print("✅ JSON normalizer tests passed")
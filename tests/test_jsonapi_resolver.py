@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""Test script for the shared JSON:API document resolver"""
+
+import os
+import sys
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.common.jsonapi import JsonApiDocument, as_document
+
+RESPONSE = {
+    "data": [
+        {
+            "id": "101",
+            "type": "records",
+            "attributes": {"number": "BP-101", "status": "ACTIVE"},
+            "relationships": {
+                "applicant": {"data": {"type": "users", "id": "7"}},
+                "primaryLocation": {"data": {"type": "locations", "id": 3}},
+                "guests": {"data": [{"type": "users", "id": "7"}, {"type": "users", "id": "8"}]},
+                "recordType": {"links": {"related": "/recordTypes/6413"}}
+            }
+        }
+    ],
+    "included": [
+        {"id": "7", "type": "users", "attributes": {"firstName": "Ada", "lastName": "Lovelace"}},
+        {"id": "3", "type": "locations", "attributes": {"streetNumber": 12, "streetName": "Main St", "city": "Springfield"}}
+    ]
+}
+
+def test_lookup_by_type_and_id():
+    document = JsonApiDocument.from_response(RESPONSE)
+    assert len(document) == 3
+    assert document.get("users", "7")["attributes"]["firstName"] == "Ada"
+    # Numeric and string ids resolve to the same resource
+    assert document.get("locations", 3) is document.get("locations", "3")
+    assert document.get("users", "999") is None
+    assert ("records", "101") in document
+
+def test_resolve_follows_relationship_linkage():
+    document = JsonApiDocument.from_response(RESPONSE)
+    relationships = document.records[0]["relationships"]
+    assert document.resolve(relationships["applicant"]["data"])["attributes"]["lastName"] == "Lovelace"
+    assert document.resolve({"id": "3"}, default_type="locations")["attributes"]["city"] == "Springfield"
+    # Link-only relationships cannot be resolved locally
+    assert document.resolve(relationships["recordType"].get("data")) is None
+
+def test_as_document_reuses_existing_index():
+    document = JsonApiDocument.from_response(RESPONSE)
+    assert as_document(document) is document
+    assert as_document(RESPONSE["included"]).get("users", "7") is not None
+    assert len(as_document(None)) == 0
+
+if __name__ == "__main__":
+    test_lookup_by_type_and_id()
+    test_resolve_follows_relationship_linkage()
+    test_as_document_reuses_existing_index()
+    print("✅ JSON:API resolver tests passed")
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Test script for the pooled MCP session transport"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_mcp_adapters.client import MultiServerMCPClient
+from src.common.mcp_pool import MCPSessionPool
+from src.common.tool_manifest import ToolManifestCache
+
+# Minimal stdio server that reports which process served each call
+SERVER_SOURCE = '''
+import os
+from mcp.server.fastmcp import FastMCP
+
+mcp = FastMCP("pool-test")
+
+@mcp.tool()
+async def whoami() -> dict:
+    """Return the server process id"""
+    return {"pid": os.getpid()}
+
+@mcp.tool()
+async def crash() -> dict:
+    """Terminate the server process"""
+    os._exit(1)
+
+if __name__ == "__main__":
+    mcp.run(transport="stdio")
+'''
+
+def _make_pool(server_path, size=2):
+    client = MultiServerMCPClient({
+        "pool_test": {
+            "command": sys.executable,
+            "args": [server_path],
+            "transport": "stdio",
+        }
+    })
+    return MCPSessionPool(client, "pool_test", size=size, health_check_interval=0.0, startup_timeout=30.0)
+
+async def _pid(tools):
+    result = await tools["whoami"].ainvoke({})
+    text = result if isinstance(result, str) else result[0]["text"]
+    return json.loads(text)["pid"]
+
+async def _calls_reuse_pooled_processes(server_path):
+    pool = _make_pool(server_path, size=2)
+    tools = {tool.name: tool for tool in await pool.get_tools()}
+    try:
+        pids = await asyncio.gather(*[_pid(tools) for _ in range(8)])
+        assert len(set(pids)) <= 2, f"expected at most 2 server processes, saw {set(pids)}"
+        assert pool.stats()["alive"] == 2
+        again = await _pid(tools)
+        assert again in pids
+    finally:
+        await pool.close()
+
+async def _crashed_sessions_are_restarted(server_path):
+    pool = _make_pool(server_path, size=1)
+    tools = {tool.name: tool for tool in await pool.get_tools()}
+    try:
+        first = await _pid(tools)
+        try:
+            await tools["crash"].ainvoke({})
+        except Exception:
+            pass
+        second = await _pid(tools)
+        assert second != first
+        assert pool.stats()["sessions"][0]["restarts"] >= 1
+    finally:
+        await pool.close()
+
+async def _tool_manifest_skips_listing(server_path):
+    cache_dir = os.path.join(os.path.dirname(server_path), "manifests")
+    listed = [tool.name for tool in await _make_pool(server_path).get_tools(ToolManifestCache(server_path, cache_dir))]
+    assert sorted(listed) == ["crash", "whoami"]
+
+    # A client that cannot start the server still gets the tools from the manifest
+    broken = MCPSessionPool(MultiServerMCPClient({
+        "pool_test": {"command": "/nonexistent/python", "args": [server_path], "transport": "stdio"}
+    }), "pool_test")
+    manifest = ToolManifestCache(server_path, cache_dir)
+    cached = {tool.name: tool for tool in await broken.get_tools(manifest)}
+    assert sorted(cached) == sorted(listed)
+    assert manifest.stats()["hits"] == 1
+
+    # Cached tools execute normally over a working pool
+    pool = _make_pool(server_path, size=1)
+    tools = {tool.name: tool for tool in await pool.get_tools(ToolManifestCache(server_path, cache_dir))}
+    try:
+        assert await _pid(tools) != os.getpid()
+    finally:
+        await pool.close()
+
+    # Changing the server code or the extra key invalidates the manifest
+    assert ToolManifestCache(server_path, cache_dir, extra=["templates"]).load() is None
+    with open(server_path, "a") as f:
+        f.write("\n# changed\n")
+    assert ToolManifestCache(server_path, cache_dir).load() is None
+
+def _with_server(check):
+    with tempfile.TemporaryDirectory() as tmp:
+        server_path = os.path.join(tmp, "pool_test_server.py")
+        with open(server_path, "w") as f:
+            f.write(SERVER_SOURCE)
+        asyncio.run(check(server_path))
+
+def test_calls_reuse_pooled_processes():
+    _with_server(_calls_reuse_pooled_processes)
+
+def test_crashed_sessions_are_restarted():
+    _with_server(_crashed_sessions_are_restarted)
+
+def test_tool_manifest_skips_listing():
+    _with_server(_tool_manifest_skips_listing)
+
+if __name__ == "__main__":
+    test_calls_reuse_pooled_processes()
+    test_crashed_sessions_are_restarted()
+    test_tool_manifest_skips_listing()
+    print("✅ MCP session pool tests passed")
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Test script for request-scoped relationship memoization"""
+
+import asyncio
+import os
+import sys
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.common.memo import AsyncTTLCache, RequestMemo
+
+class CountingLoader:
+    """Loader that records how many times each key was actually fetched"""
+
+    def __init__(self):
+        self.calls = {}
+
+    def __call__(self, key):
+        async def load():
+            self.calls[key] = self.calls.get(key, 0) + 1
+            await asyncio.sleep(0.01)
+            return {"data": {"id": key}}
+        return load
+
+async def _concurrent_fetches_share_one_load():
+    loader = CountingLoader()
+    memo = RequestMemo(shared=AsyncTTLCache(ttl_seconds=60))
+    keys = ["recordType:6413"] * 5 + ["users:7"] * 3 + ["users:8"]
+    results = await asyncio.gather(*[memo.get_or_load(key, loader(key)) for key in keys])
+    assert [r["data"]["id"] for r in results] == keys
+    assert loader.calls == {"recordType:6413": 1, "users:7": 1, "users:8": 1}
+    stats = memo.stats()
+    assert stats["requested"] == 9
+    assert stats["distinct"] == 3
+    assert stats["deduplicated"] == 6
+    assert stats["fetched"] == 3
+
+async def _shared_cache_reused_across_requests():
+    loader = CountingLoader()
+    shared = AsyncTTLCache(ttl_seconds=60)
+    await RequestMemo(shared=shared).get_or_load("users:7", loader("users:7"))
+    second = RequestMemo(shared=shared)
+    await second.get_or_load("users:7", loader("users:7"))
+    assert loader.calls == {"users:7": 1}
+    assert second.stats()["shared_cache_hits"] == 1
+    assert second.stats()["fetched"] == 0
+
+async def _failures_and_expired_entries_are_not_reused():
+    shared = AsyncTTLCache(ttl_seconds=60)
+
+    async def failing():
+        raise RuntimeError("boom")
+
+    try:
+        await shared.get_or_load("k", failing)
+        assert False, "expected the loader error to propagate"
+    except RuntimeError:
+        pass
+    assert shared.get("k") == (False, None)
+
+    expiring = AsyncTTLCache(ttl_seconds=0.01)
+    expiring.set("k", 1)
+    await asyncio.sleep(0.02)
+    assert expiring.get("k") == (False, None)
+
+def test_concurrent_fetches_share_one_load():
+    asyncio.run(_concurrent_fetches_share_one_load())
+
+def test_shared_cache_reused_across_requests():
+    asyncio.run(_shared_cache_reused_across_requests())
+
+def test_failures_and_expired_entries_are_not_reused():
+    asyncio.run(_failures_and_expired_entries_are_not_reused())
+
+if __name__ == "__main__":
+    test_concurrent_fetches_share_one_load()
+    test_shared_cache_reused_across_requests()
+    test_failures_and_expired_entries_are_not_reused()
+    print("✅ Relationship memo tests passed")